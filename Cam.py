@@ -49,8 +49,8 @@ class cam:
             self.pos = (self.focus[0]-state.screensize[0]/2, self.focus[1]-state.screensize[1]/2)
         #do not pan the camera if doing so would expose void.
         if state.gamemode != "edit":
-            for item in state.objects:
-                if type(item).__name__ == "drawlayer" and item.parallax == self.depth + 1:
+            for item in state.objects.oftype("drawlayer"):
+                if item.parallax == self.depth + 1:
                     parallaxmod = item.parallax-self.depth
                     if item.loop[0] == False:
                         if self.pos[0]*parallaxmod < 0:
@@ -19,6 +19,8 @@ import menufuncs
 import json
 import objects
 import maker
+import scene
+import behaviours
 
 #create variables
 toolvar = 0
@@ -36,7 +38,8 @@ state.display = pygame.Surface(state.screensize)
 state.objectsource = json.load(open("objects.json"))
 state.infosource = json.load(open("entityinfo.json"))
 state.aisource = json.load(open("behaviours.json"))
-state.objects = []
+behaviours.compileall()
+state.objects = scene.scene()
 state.extras = {}
 state.deltatime = 1
 state.maker = maker.maker()
@@ -79,8 +82,9 @@ def main():
             if type(item) == level.drawlayer:
                 if item.layernum == state.renderlayer:
                     if state.levelchanged:
-                        item.render()
+                        item.redraw()
                     item.update()
+                    item.render()
                     state.parallaxmod = item.parallax-state.cam.depth
             else:
                 if item.layer == state.renderlayer:
@@ -315,7 +319,7 @@ def load():
     state.Layerswitch.delete(0,"end")
     state.Layerswitch.insert(0,0)
     try:
-        state.objects = []
+        state.objects = scene.scene()
         state.editobjs = []
         state.level = level.level(levelname)
         state.editloops = state.level.loops
@@ -346,7 +350,7 @@ def new():
     """
     Creates a new blank level.
     """
-    state.objects = []
+    state.objects = scene.scene()
     state.editobjs = []
     state.level = level.level("blank")
     state.editloops = state.level.loops
@@ -436,6 +440,8 @@ def draw(canvasarray,tile,value):
         The value to draw.
     """
     canvasarray[state.renderlayer][tile[1]][tile[0]] = value
+    #keep the layer's collision up to date with the edit
+    state.level.layers[state.renderlayer].collisionupdate(tile[1],tile[0])
 
 def addExtra():
     name = state.extrasnameget.get('1.0','end-1c')
@@ -891,6 +897,9 @@ def removeheight(target,rowstocut):
     del state.level.pallatemap[state.renderlayer][target[1]:target[1]+rowstocut]
     del state.level.spinmap[state.renderlayer][target[1]:target[1]+rowstocut]
     del state.level.flipmap[state.renderlayer][target[1]:target[1]+rowstocut]
+    for object in state.objects:
+        if type(object)==level.drawlayer and object.layernum == state.renderlayer:
+            object.calcsize()
 
 def addwidth(target, colstoadd):
     """
@@ -932,6 +941,9 @@ def removewidth(target,colstocut):
         del state.level.pallatemap[state.renderlayer][row][target[0]:target[0]+colstocut]
         del state.level.spinmap[state.renderlayer][row][target[0]:target[0]+colstocut]
         del state.level.flipmap[state.renderlayer][row][target[0]:target[0]+colstocut]
+    for object in state.objects:
+        if type(object)==level.drawlayer and object.layernum == state.renderlayer:
+            object.calcsize()
     
 def addLayer():
     """
@@ -0,0 +1,53 @@
+"""
+Filename: audio.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Sound and music playback for "MathWiz!"
+"""
+import pygame
+import GameData as state
+
+#sound can be switched off altogether, for running the game without a window or speakers
+enabled = True
+
+def play(name):
+    """
+    Plays one of the sounds loaded at startup.
+
+    Parameters:
+    name : str
+        The name the sound is kept under in GameData, such as "jump_sound".
+    """
+    if enabled:
+        getattr(state,name).play()
+
+def playfile(name):
+    """
+    Loads and plays a sound effect.
+
+    Parameters:
+    name : str
+        Name of the sound effect, without the extension.
+    """
+    if enabled:
+        pygame.mixer.Sound(f"Assets\\sounds\\sfx\\{name}.wav").play()
+
+def music(name):
+    """
+    Starts a music track, looping forever.
+
+    Parameters:
+    name : str
+        Name of the track, without the extension.
+    """
+    if enabled:
+        pygame.mixer.music.load(f"Assets\\sounds\\music\\{name}.wav")
+        pygame.mixer.music.play(-1)
+
+def stopmusic():
+    """
+    Stops whatever music is playing.
+    """
+    if enabled:
+        pygame.mixer.music.stop()
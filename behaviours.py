@@ -0,0 +1,194 @@
+"""
+Filename: behaviours.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Compiled enemy behaviours for "MathWiz!"
+"""
+from types import MappingProxyType
+import GameData as state
+import moves
+
+#the ways an action can be popped from a behaviour, worked out from the pop condition's source
+POPNOW = 0
+POPSELF = 1
+POPSTATE = 2
+POPKEYS = 3
+POPTIME = 4
+popkinds = {"self":POPSELF,"state":POPSTATE,"keys":POPKEYS,"time":POPTIME}
+
+#behaviours that have already been compiled, keyed by name
+programs = {}
+
+def freeze(value):
+    """
+    Makes a read-only copy of a value loaded from JSON, so that one copy can be shared by every enemy.
+    """
+    if isinstance(value,list):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value,dict):
+        return MappingProxyType({key:freeze(item) for key,item in value.items()})
+    return value
+
+def thaw(value):
+    """
+    Makes a fresh, editable copy of a frozen value.
+    """
+    if isinstance(value,tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value,MappingProxyType):
+        return {key:thaw(item) for key,item in value.items()}
+    return value
+
+def hasspawner(value):
+    """
+    Checks whether a value has a "spawner" placeholder anywhere in it, to be filled in by the object running the action.
+    """
+    if isinstance(value,(list,tuple)):
+        return any(hasspawner(item) for item in value)
+    if isinstance(value,(dict,MappingProxyType)):
+        return any(hasspawner(item) for item in value.values())
+    return value == "spawner"
+
+#This class holds a behaviour that has been worked out ahead of time, so that enemies running it only need to keep track of their timers
+class program:
+    """
+    A class to hold one compiled behaviour. Programs are shared between every enemy using them, and are never changed.
+
+    Attributes:
+    name : str
+        The name of the behaviour.
+    steps : tuple
+        One entry per action: the start delay, the function to call, its argument, whether the argument needs a fresh copy
+        for the "spawner" placeholders to be filled in, the kind of pop condition, and the pop condition's key and value.
+    timers : tuple
+        The start delay and pop timer of every action, laid out one after the other, to copy into an enemy starting the program.
+    """
+    __slots__ = ("name","steps","timers")
+
+    def __init__(self,name,source):
+        """
+        Compiles a behaviour.
+
+        Parameters:
+        name : str
+            The name of the behaviour.
+        source : list
+            The behaviour's actions, as found in behaviours.json.
+        """
+        steps = []
+        timers = []
+        for delay,(funcname,arg),(popsource,popkey,popval) in source:
+            if not hasattr(moves,funcname):
+                raise ValueError(f"behaviour {name} uses unknown action {funcname}")
+            popkind = popkinds.get(popsource,POPNOW)
+            steps.append((delay,getattr(moves,funcname),freeze(arg),hasspawner(arg),popkind,popkey,popval))
+            timers.append(delay)
+            timers.append(popkey if popkind == POPTIME else 0)
+        object.__setattr__(self,"name",name)
+        object.__setattr__(self,"steps",tuple(steps))
+        object.__setattr__(self,"timers",tuple(timers))
+
+    def __setattr__(self,name,value):
+        raise AttributeError("programs can't be changed")
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __repr__(self):
+        return f"program({self.name!r})"
+
+    def start(self,caller):
+        """
+        Starts an object running the program from the top, dropping whatever program it was running before.
+
+        Parameters:
+        caller : character
+            The object to run the program.
+        """
+        caller.running = self
+        caller.timers = list(self.timers)
+        caller.live = list(range(len(self.steps)))
+
+    def run(self,caller):
+        """
+        Runs one frame of the program for an object, in the same way as the action queue would run the behaviour's actions.
+
+        Parameters:
+        caller : character
+            The object running the program.
+        """
+        timers = caller.timers
+        live = caller.live
+        spot = 0
+        while spot < len(live):
+            index = live[spot]
+            spot += 1
+            #if the action has a start timer above zero, iterate that down a peg.
+            if timers[index*2] > 0:
+                timers[index*2] -= state.deltatime
+                continue
+            delay,func,arg,bind,popkind,popkey,popval = self.steps[index]
+            func(caller,thaw(arg) if bind else arg)
+            #the action may have swapped out the object's actions entirely
+            if caller.running is not self or caller.live is not live:
+                return
+            #if the action's pop condition is met, pull it from the program and skip.
+            if popkind == POPSELF:
+                popped = getattr(caller,popkey) == popval
+            elif popkind == POPSTATE:
+                popped = getattr(state,popkey) == popval
+            elif popkind == POPKEYS:
+                popped = state.keys[popkey] == popval
+            elif popkind == POPTIME:
+                popped = timers[index*2+1] <= 0
+                if not popped:
+                    timers[index*2+1] -= state.deltatime
+            else:
+                popped = True
+            if popped:
+                spot -= 1
+                del live[spot]
+        if not live:
+            caller.running = None
+
+def compilebehaviour(name,source):
+    """
+    Compiles a behaviour and keeps it for later.
+
+    Parameters:
+    name : str
+        The name of the behaviour.
+    source : list
+        The behaviour's actions, as found in behaviours.json.
+
+    Returns:
+    program
+        The compiled behaviour.
+    """
+    programs[name] = program(name,source)
+    return programs[name]
+
+def compileall():
+    """
+    Compiles every behaviour in state.aisource, so none have to be worked out mid-game.
+    """
+    programs.clear()
+    for name,source in state.aisource.items():
+        compilebehaviour(name,source)
+
+def getprogram(name):
+    """
+    Gets a compiled behaviour by name, compiling it from state.aisource if it hasn't been already.
+
+    Parameters:
+    name : str
+        The name of the behaviour.
+
+    Returns:
+    program
+        The compiled behaviour.
+    """
+    if name not in programs:
+        compilebehaviour(name,state.aisource[name])
+    return programs[name]
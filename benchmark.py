@@ -0,0 +1,207 @@
+"""
+Filename: benchmark.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Runs every "MathWiz!" level headlessly and reports how fast each one goes, so that runs can be compared for regressions
+"""
+import headless
+import argparse
+import json
+import os
+import sys
+import GameData as state
+import level
+import objects
+import replay
+
+#what a level is played with when no script is given: run right, jump, double back, then carry on right
+defaultscript = [[0,["d"]],[120,["d","space"]],[135,["d"]],[240,["a"]],[300,["d"]],[420,["d","space"]],[435,["d"]]]
+#the measurements that count as a regression when they go up
+watched = ("load","avg","p99","peakmemory")
+
+def surfacememory():
+    """
+    Adds up the memory taken by the graphics the game keeps around: rendered level chunks, tile graphics and character sprites.
+
+    Returns:
+    int
+        The memory, in bytes.
+    """
+    total = state.chunkcache.used
+    for brushes in level.tilebrushes.values():
+        for brush in brushes.values():
+            total += brush.get_width()*brush.get_height()*brush.get_bytesize()
+    for sprites in objects.spritecache.values():
+        for sprite in sprites.values():
+            total += sprite.get_width()*sprite.get_height()*sprite.get_bytesize()
+    return total
+
+def percentile(ordered,fraction):
+    """
+    Picks a percentile out of a sorted list.
+
+    Parameters:
+    ordered : list
+        The values, sorted from smallest to largest.
+    fraction : float
+        The percentile, from 0 to 1.
+    """
+    return ordered[min(len(ordered)-1,int(len(ordered)*fraction))]
+
+def runlevel(levelname,frames,script=defaultscript,render=True):
+    """
+    Runs one level from a cold start, with nothing drawn or cached from the levels before it.
+
+    Parameters:
+    levelname : str
+        The level to run. Recordings run the level they were made on instead.
+    frames : int
+        How many frames to run. Recordings run to the end if this is None.
+    script : list or replay.playback
+        The input to play, as [frame, key names] entries, or a recording.
+    render : bool
+        Whether each frame is drawn as well.
+
+    Returns:
+    dict
+        The load time in seconds, the frame times in milliseconds with their min, average, percentiles and max,
+        the peak memory taken by graphics in bytes, the peak number of objects, and how many of each type there were at the end.
+    """
+    level.tilebrushes.clear()
+    level.templates.clear()
+    objects.spritecache.clear()
+    state.chunkcache = level.chunkcache(state.chunkcache.budget)
+    peak = {"memory":0,"objects":0,"cached":None}
+    def sample():
+        #the caches only change size when something new is drawn, so most frames can skip adding them up
+        cached = (len(state.chunkcache.chunks),state.chunkcache.used,sum(map(len,level.tilebrushes.values())),sum(map(len,objects.spritecache.values())))
+        if cached != peak["cached"]:
+            peak["cached"] = cached
+            peak["memory"] = max(peak["memory"],surfacememory())
+        peak["objects"] = max(peak["objects"],len(state.objects))
+    results = headless.run(levelname,frames,script,render,onframe = sample)
+    ordered = sorted(results["frametimes"]) or [0]
+    counts = {}
+    for item in state.objects:
+        counts[type(item).__name__] = counts.get(type(item).__name__,0)+1
+    return {"level":results["level"],
+            "frames":results["frames"],
+            "load":results["load"],
+            "fps":results["fps"],
+            "min":ordered[0],
+            "avg":sum(ordered)/len(ordered),
+            "p50":percentile(ordered,0.5),
+            "p95":percentile(ordered,0.95),
+            "p99":percentile(ordered,0.99),
+            "max":ordered[-1],
+            "peakmemory":peak["memory"],
+            "peakobjects":peak["objects"],
+            "objects":dict(sorted(counts.items())),
+            "timings":results["timings"],
+            "frametimes":[round(time,3) for time in results["frametimes"]]}
+
+def suite(levels=None,frames=600,script=defaultscript,replays=(),render=True,log=None):
+    """
+    Runs a set of levels, and any recordings, one after another.
+    A level that fails to load or crashes is reported with its error, and the rest carry on.
+
+    Parameters:
+    levels : list
+        The levels to run. Every level in Leveldata if not given.
+    frames : int
+        How many frames to run each level for.
+    script : list
+        The input to play on each level, as [frame, key names] entries.
+    replays : list
+        Recordings to play back as well, each to the end.
+    render : bool
+        Whether each frame is drawn as well.
+    log : function
+        If given, this is called with each scenario's name and results as it finishes.
+
+    Returns:
+    dict
+        The settings the suite was run with, and the results of each scenario, keyed by name.
+    """
+    if levels == None:
+        levels = sorted(name[:-5] for name in os.listdir("Leveldata") if name.endswith(".json") and not name.startswith("."))
+    scenarios = [(name,name,script) for name in levels]
+    for path in replays:
+        recording = replay.playback(path)
+        scenarios.append((f"{recording.level} ({os.path.basename(path)})",None,recording))
+    report = {"frames":frames,"render":render,"scenarios":{}}
+    for name,levelname,source in scenarios:
+        try:
+            results = runlevel(levelname,frames if levelname != None else None,source,render)
+        except Exception as error:
+            results = {"error":f"{type(error).__name__}: {error}"}
+        report["scenarios"][name] = results
+        if log:
+            log(name,results)
+    return report
+
+def compare(old,new,threshold=0.1):
+    """
+    Finds the measurements that got worse from one report to another.
+
+    Parameters:
+    old : dict
+        The report to compare against.
+    new : dict
+        The report to check.
+    threshold : float
+        How much worse a measurement has to get to count, as a fraction of what it was.
+
+    Returns:
+    list
+        The regressions, as (scenario, measurement, old value, new value). Scenarios that ran before but now fail have None for the values.
+    """
+    regressions = []
+    for name,before in old["scenarios"].items():
+        after = new["scenarios"].get(name)
+        if after == None or "error" in before:
+            continue
+        if "error" in after:
+            regressions.append((name,"error",None,None))
+            continue
+        for measurement in watched:
+            if after[measurement] > before[measurement]*(1+threshold):
+                regressions.append((name,measurement,before[measurement],after[measurement]))
+    return regressions
+
+def logline(name,results):
+    """
+    Prints a one line summary of a scenario.
+    """
+    if "error" in results:
+        print(f"{name:<28} failed: {results['error']}")
+    else:
+        print(f"{name:<28}{results['frames']:>6} frames  load {results['load']*1000:>8.1f} ms  avg {results['avg']:>7.2f} ms  p99 {results['p99']:>7.2f} ms"
+              f"  peak {results['peakmemory']/1024/1024:>7.1f} MB  {results['peakobjects']:>5} objects")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Run levels without a window or sound, and report how fast each one goes.")
+    parser.add_argument("levels",nargs = "*",help = "the levels to run (every level in Leveldata by default)")
+    parser.add_argument("--frames",type = int,default = 600,help = "how many frames to run each level for")
+    parser.add_argument("--script",help = "a JSON file of [frame, key names] entries to play as input on each level")
+    parser.add_argument("--replay",action = "append",default = [],help = "a recording to play back as well (can be given more than once)")
+    parser.add_argument("--norender",action = "store_true",help = "only run the game logic, without drawing anything")
+    parser.add_argument("--out",help = "a file to write the report to, as JSON")
+    parser.add_argument("--compare",nargs = 2,metavar = ("OLD","NEW"),help = "compare two reports instead of running anything")
+    parser.add_argument("--threshold",type = float,default = 0.1,help = "how much worse a measurement has to get to count as a regression (0.1 is 10%%)")
+    args = parser.parse_args()
+    if args.compare:
+        regressions = compare(json.load(open(args.compare[0])),json.load(open(args.compare[1])),args.threshold)
+        for name,measurement,before,after in regressions:
+            if measurement == "error":
+                print(f"{name}: now fails")
+            else:
+                print(f"{name}: {measurement} went from {before:.3f} to {after:.3f} ({100*(after/before-1) if before else float('inf'):+.1f}%)")
+        print(f"{len(regressions)} regressions")
+        sys.exit(1 if regressions else 0)
+    headless.setup(not args.norender)
+    script = json.load(open(args.script)) if args.script else defaultscript
+    report = suite(args.levels or None,args.frames,script,args.replay,not args.norender,logline)
+    if args.out:
+        json.dump(report,open(args.out,"w"),indent = 4)
@@ -65,10 +65,14 @@ class cutscenePlayer:
         if returnval == True and (True not in state.keys):
             #convert to a pygame image
             self.frame.blit(pygame.transform.scale(pygame.image.frombuffer(rawimage.tostring(),rawimage.shape[1::-1],"BGR"),[state.screensize[0]*state.scaleamt,state.screensize[1]*state.scaleamt]),(0,0))
-            #draw to screen
-            state.display.blit(self.frame,(0,0))
         else:
             #leave
             getattr(menufuncs,self.func)(self.funcargs[0])
             pygame.mixer.music.stop()
             pygame.mixer.music.unload()
+
+    def render(self):
+        """
+        Draws the current frame of the cutscene to the screen.
+        """
+        state.display.blit(self.frame,(0,0))
@@ -0,0 +1,77 @@
+"""
+Filename: effects.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Timed visual effects for "MathWiz!"
+"""
+import json
+import GameData as state
+
+#timelines that have already been worked out, keyed by name
+timelines = {}
+
+#This class holds an effect from effects.json, such as a hit flash, worked out so that it can be looked up by how long it has been playing
+class timeline:
+    """
+    A class to hold one effect. Timelines are shared between every object playing them.
+
+    Attributes:
+    name : str
+        The name of the effect.
+    blinks : tuple
+        Each blink in the effect, as (pallate, start time, time between toggles, time it lasts for).
+    length : float
+        How long the effect plays for.
+    """
+    __slots__ = ("name","blinks","length")
+
+    def __init__(self,name,source):
+        """
+        Works out an effect.
+
+        Parameters:
+        name : str
+            The name of the effect.
+        source : list
+            The effect's entries, as found in effects.json.
+        """
+        self.name = name
+        self.blinks = tuple((entry["Blink"],entry.get("Start",0),entry["Every"],entry["For"]) for entry in source)
+        self.length = max([start+length for pallate,start,every,length in self.blinks],default = 0)
+
+    def pallate(self,elapsed):
+        """
+        Finds the pallate the effect shows at a point in time.
+
+        Parameters:
+        elapsed : float
+            How long the effect has been playing.
+
+        Returns:
+        str
+            The name of the pallate, or None if the effect doesn't change the pallate right now.
+        """
+        for pallate,start,every,length in self.blinks:
+            #blinks start on, and toggle every so often
+            if start <= elapsed < start+length and ((elapsed-start)//every)%2 == 0:
+                return pallate
+        return None
+
+def gettimeline(name):
+    """
+    Gets an effect by name, working it out from state.effectsource if it hasn't been already.
+
+    Parameters:
+    name : str
+        The name of the effect.
+
+    Returns:
+    timeline
+        The effect.
+    """
+    if name not in timelines:
+        if not hasattr(state,"effectsource"):
+            state.effectsource = json.load(open("effects.json"))
+        timelines[name] = timeline(name,state.effectsource[name])
+    return timelines[name]
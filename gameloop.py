@@ -0,0 +1,173 @@
+"""
+Filename: gameloop.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Fixed-step updating and drawing of the world for "MathWiz!"
+"""
+from time import perf_counter
+import GameData as state
+
+def tally(timings,name,since):
+    """
+    Adds the time since a point to a running total.
+
+    Parameters:
+    timings : dict
+        The running totals, in seconds, keyed by name.
+    name : str
+        What the time was spent on.
+    since : float
+        When it started, from perf_counter.
+
+    Returns:
+    float
+        The time now, to measure the next thing from.
+    """
+    now = perf_counter()
+    timings[name] = timings.get(name,0)+now-since
+    return now
+
+def step(timings=None,pertype=True):
+    """
+    Runs one step of game logic: the camera, then every object in play, then the particles on each layer as its drawlayer comes up.
+    Nothing is drawn.
+
+    Parameters:
+    timings : dict
+        If given, the time spent on the camera, on objects, and on particles is added to it, in seconds.
+    pertype : bool
+        Whether the time spent on objects is split up by their type, or all put under "Objects".
+
+    Returns:
+    int
+        How many objects were updated.
+    """
+    timed = timings != None
+    updated = 0
+    if timed:
+        since = perf_counter()
+    state.cam.update()
+    if timed:
+        since = tally(timings,"Camera",since)
+    #update from a snapshot of the object list. Anything created along the way is held back until the end of the step,
+    #and anything removed along the way is skipped
+    objectlist = state.objects
+    objectlist.staging = True
+    for item in objectlist.snapshot():
+        #loading something new starts a new object list, and the rest of the step is dropped. That includes anything the new list
+        #shares with the old one, such as the layers of a restarted level, which would otherwise be updated again once the new list runs
+        if state.objects is not objectlist:
+            break
+        if item not in state.objects:
+            continue
+        #remember where things were before this step, to draw them partway between steps
+        if hasattr(item,"pos"):
+            item.steppos = list(item.pos)
+        if hasattr(item, "checkupdatedist"):
+            if item.checkupdatedist():
+                item.update()
+                updated += 1
+        else:
+            item.update()
+            updated += 1
+        if timed:
+            since = tally(timings,type(item).__name__ if pertype else "Objects",since)
+        if type(item).__name__ =="drawlayer":
+            state.particleManager.updateLayer(item.layernum)
+            if timed:
+                since = tally(timings,"Particles",since)
+    objectlist.staging = False
+    objectlist.flush()
+    if timed:
+        tally(timings,"Scene",since)
+    return updated
+
+def lerp(start,end,amount):
+    """
+    Finds the point a fraction of the way from one point to another.
+    """
+    return [start[0]+(end[0]-start[0])*amount,start[1]+(end[1]-start[1])*amount]
+
+def render(alpha=1):
+    """
+    Draws every object in play to the display, in order, with the particles on each layer drawn just after the layer.
+
+    Parameters:
+    alpha : float
+        How far between the last two steps to draw things, from 0 (where they were before the last step) to 1 (where they are now).
+    """
+    state.display.fill((42,168,228))
+    campos = state.cam.pos
+    if alpha < 1:
+        state.cam.pos = tuple(lerp(state.cam.lastpos,campos,alpha))
+    for item in state.objects:
+        if hasattr(item, "checkupdatedist") and not item.checkupdatedist():
+            continue
+        #objects are drawn partway between steps by moving them there just for drawing
+        if alpha < 1 and hasattr(item,"steppos"):
+            pos = item.pos
+            item.pos = lerp(item.steppos,pos,alpha)
+            item.render()
+            item.pos = pos
+        else:
+            item.render()
+        if type(item).__name__ =="drawlayer":
+            state.particleManager.drawLayer(item.layernum,alpha)
+    state.cam.pos = campos
+
+#This class keeps the game logic running at a steady rate, however fast frames are drawn
+class fixedstep:
+    """
+    A class to work out how many logic steps to run each frame, carrying over time that doesn't add up to a whole step.
+
+    Attributes:
+    steplength : float
+        How long a step is, in milliseconds.
+    maxsteps : int
+        The most steps to run in one frame. Time beyond that is dropped, so a slow frame doesn't lead to a slower one.
+    accumulator : float
+        The time that hasn't been stepped through yet.
+    dropped : float
+        The time dropped so far for going over maxsteps.
+    """
+    def __init__(self,rate=60,maxsteps=5):
+        """
+        Initializes the stepper.
+
+        Parameters:
+        rate : float
+            How many steps to run per second.
+        maxsteps : int
+            The most steps to run in one frame.
+        """
+        self.steplength = 1000/rate
+        self.maxsteps = maxsteps
+        self.accumulator = 0
+        self.dropped = 0
+
+    def advance(self,time):
+        """
+        Adds the time a frame took, and works out how many steps to run for it.
+
+        Parameters:
+        time : float
+            How long the frame took, in milliseconds.
+
+        Returns:
+        int
+            The number of steps to run.
+        """
+        self.accumulator += time
+        steps = min(int(self.accumulator//self.steplength),self.maxsteps)
+        self.accumulator -= steps*self.steplength
+        if self.accumulator >= self.steplength:
+            self.dropped += self.accumulator-self.accumulator%self.steplength
+            self.accumulator %= self.steplength
+        return steps
+
+    def alpha(self):
+        """
+        Gets how far the leftover time is through the next step, for drawing between steps.
+        """
+        return self.accumulator/self.steplength
@@ -0,0 +1,263 @@
+"""
+Filename: headless.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Runs "MathWiz!" levels without a window or sound, as fast as they will go, for load testing
+"""
+import os
+#no window and no sound. This has to be set before pygame starts up
+os.environ.setdefault("SDL_VIDEODRIVER","dummy")
+os.environ.setdefault("SDL_AUDIODRIVER","dummy")
+import argparse
+import json
+import random
+from time import perf_counter
+import pygame
+
+import GameData as state
+import Cam
+import level
+import menufuncs
+import particles
+import maker
+import scene
+import behaviours
+import audio
+import gameloop
+import replay
+
+def setup(render=False):
+    """
+    Sets up the game the same way main.py does, but without opening a window or starting the mixer.
+
+    Parameters:
+    render : bool
+        Whether frames will be drawn. If not, nothing is ever drawn, and no font is loaded.
+    """
+    pygame.init()
+    audio.enabled = False
+    state.savedata = json.load(open("Save.json"))
+    state.savefile = 1
+    settings = state.savedata[str(state.savefile)]
+    #headless runs always use fixed steps
+    state.adjustdeltatime = True
+    state.movetickamount = settings["movetickamount"]
+    state.steprate = settings["steprate"]
+    state.maxsteps = settings["maxsteps"]
+    state.displaysize = settings["displaysize"]
+    state.tilesize = 120
+    state.screensize = (state.tilesize*30,state.tilesize*30)
+    state.scaleamt = state.displaysize[0]/state.screensize[0]
+    if render:
+        #drawing the level needs a video mode to convert its chunks to, but with no window it is never seen
+        pygame.display.set_mode((1,1))
+    #the display is never shown, but things on it are still worked out against its size
+    state.display = pygame.Surface([state.screensize[0]*state.scaleamt,state.screensize[1]*state.scaleamt])
+    state.HUD = pygame.Surface([state.screensize[0]*state.scaleamt,state.screensize[1]*state.scaleamt])
+    if render:
+        state.font = pygame.font.SysFont("Lucida Console",int(75*state.scaleamt))
+    state.clock = pygame.time.Clock()
+
+    #with no video mode, images can't be converted to the display's format, so they are used as they load
+    def loadsheet(path):
+        image = pygame.image.load(path)
+        if render:
+            image = image.convert()
+        return pygame.transform.scale_by(image,state.scaleamt)
+    state.tilesheet = loadsheet("Assets/images/tiles.png")
+    state.spritesheet = loadsheet("Assets/images/CharSprites.png")
+    state.spritesheet.set_colorkey((255,0,255))
+    state.menusheet = loadsheet("Assets/images/menuassets.png")
+
+    state.objectsource = json.load(open("objects.json"))
+    state.aisource = json.load(open("behaviours.json"))
+    behaviours.compileall()
+    state.infosource = json.load(open("entityinfo.json"))
+    state.menudata = json.load(open("menus.json"))
+    state.tilesource = json.load(open("tiles.json"))
+    state.particlesource = json.load(open("particles.json"))
+    state.effectsource = json.load(open("effects.json"))
+    state.cutscenesource = json.load(open("cutscenes.json"))
+
+    state.gamemode = "play"
+    state.maker = maker.maker()
+    state.invis = (255,0,255)
+    state.pause = False
+    state.particleManager = particles.ParticleManager(settings["particlebudget"],settings["particleeviction"],settings["offscreenparticlerate"])
+    state.chunkcache = level.chunkcache(settings["chunkbudget"]*1024*1024)
+    #levels kept from before were drawn for the old settings
+    level.templates.clear()
+    state.HUD.set_colorkey(state.invis)
+    state.fpsTarget = 60
+    state.deltatime = state.fpsTarget/state.steprate
+    state.timeslow = 1
+    state.objects = scene.scene()
+    state.menu_button_focus = None
+    state.cam = Cam.cam()
+
+#This class plays back a script of keys being held down, one frame at a time
+class inputscript:
+    """
+    A class to feed scripted input to the game in place of the keyboard and mouse.
+    A script is a list of [frame, key names] entries. From that frame on, the named keys (as pygame names them, such as "d" or "space")
+    are held down, until the next entry. A key counts as newly pressed on the frame it goes down.
+
+    Attributes:
+    changes : list
+        The frame each entry starts on, and the key codes it holds down, in order.
+    seed : int
+        The seed the random module is given when the script starts. It's the same every time, so scripted runs can be repeated.
+    frame : int
+        The next frame to play.
+    spot : int
+        The next entry to start.
+    held : frozenset
+        The keys held down on the last frame played.
+    """
+    def __init__(self,script=()):
+        """
+        Works out a script.
+
+        Parameters:
+        script : list
+            The script's entries, as [frame, key names].
+        """
+        self.changes = sorted((frame,frozenset(pygame.key.key_code(name) for name in names)) for frame,names in script)
+        self.seed = 0
+        self.start()
+
+    def start(self):
+        """
+        Starts the script from the top, and seeds the random module.
+        """
+        random.seed(self.seed)
+        self.frame = 0
+        self.spot = 0
+        self.held = frozenset()
+
+    def apply(self):
+        """
+        Sets the input for the next frame.
+
+        Returns:
+        bool
+            Always True. The last keys in a script stay held down for as long as the run goes on.
+        """
+        held = self.held
+        while self.spot < len(self.changes) and self.changes[self.spot][0] <= self.frame:
+            held = self.changes[self.spot][1]
+            self.spot += 1
+        self.frame += 1
+        state.keys = replay.keystate(held)
+        state.newkeys = list(held-self.held)
+        self.held = held
+        state.events = []
+        state.event_types = []
+        state.mouse = (0,0)
+        state.click = (False,False,False)
+        return True
+
+def run(levelname,frames=None,script=(),render=False,record=None,onframe=None):
+    """
+    Loads a level and runs it for a number of frames, one fixed step per frame, as fast as possible.
+
+    Parameters:
+    levelname : str
+        The level to load. Recordings load the level they were made on instead.
+    frames : int
+        How many frames to run. Recordings run to the end if this isn't given.
+    script : list or replay.playback
+        The input to play, as [frame, key names] entries, or a recording.
+    render : bool
+        Whether to draw each frame as well. Nothing is shown either way.
+    record : str
+        A file to record the input to, so the run can be played back later.
+    onframe : function
+        If given, this is called after each frame, outside of the time being measured.
+
+    Returns:
+    dict
+        How long the level took to load, how long the frames took altogether and the frames per second that makes,
+        the time spent on each part of the game, in seconds, and how long each frame took, in milliseconds.
+    """
+    if isinstance(script,replay.playback):
+        source = script
+        levelname = source.level
+        if frames == None:
+            frames = len(source)
+    else:
+        source = inputscript(script)
+    source.start()
+    recorder = None
+    if record:
+        recorder = replay.recorder(record,levelname,source.seed)
+    start = perf_counter()
+    menufuncs.loadlevel(levelname)
+    loaded = perf_counter()
+    timings = {}
+    frametimes = []
+    played = 0
+    for frame in range(frames if frames != None else 600):
+        since = framestart = perf_counter()
+        if not source.apply():
+            break
+        if recorder:
+            recorder.capture()
+        since = gameloop.tally(timings,"Input",since)
+        gameloop.step(timings)
+        played += 1
+        if render:
+            since = perf_counter()
+            state.HUD.fill(state.invis)
+            gameloop.render()
+            state.display.blit(state.HUD,(0,0))
+            gameloop.tally(timings,"Render",since)
+        frametimes.append((perf_counter()-framestart)*1000)
+        if onframe:
+            onframe()
+    if recorder:
+        recorder.close()
+    seconds = sum(frametimes)/1000
+    return {"level":levelname,
+            "frames":played,
+            "load":loaded-start,
+            "seconds":seconds,
+            "fps":played/seconds if seconds > 0 else 0,
+            "timings":dict(sorted(timings.items(),key = lambda item: item[1],reverse = True)),
+            "frametimes":frametimes}
+
+def report(results):
+    """
+    Prints the results of a run.
+
+    Parameters:
+    results : dict
+        The results, as returned by run.
+    """
+    print(f"{results['level']}: {results['frames']} frames in {results['seconds']:.3f}s ({results['fps']:.1f} fps), loaded in {results['load']:.3f}s")
+    for name,seconds in results["timings"].items():
+        print(f"  {name:<20}{seconds*1000:>10.1f} ms {seconds*1000/max(results['frames'],1):>8.3f} ms/frame {100*seconds/max(results['seconds'],1e-9):>6.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Run a level without a window or sound, and report how fast it goes.")
+    parser.add_argument("level",nargs = "?",help = "the level to load")
+    parser.add_argument("--frames",type = int,help = "how many frames to run (600 by default, or the whole of a recording)")
+    parser.add_argument("--script",help = "a JSON file of [frame, key names] entries to play as input")
+    parser.add_argument("--replay",help = "a recording to play back, in place of a level and script")
+    parser.add_argument("--record",help = "a file to record the run's input to")
+    parser.add_argument("--render",action = "store_true",help = "draw each frame too, off screen")
+    parser.add_argument("--json",action = "store_true",help = "print the results as JSON")
+    args = parser.parse_args()
+    if args.level == None and args.replay == None:
+        parser.error("give a level to run, or a recording to --replay")
+    setup(args.render)
+    if args.replay:
+        script = replay.playback(args.replay)
+    else:
+        script = json.load(open(args.script)) if args.script else ()
+    results = run(args.level,args.frames,script,args.render,args.record)
+    if args.json:
+        print(json.dumps(results,indent = 4))
+    else:
+        report(results)
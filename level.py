@@ -6,9 +6,15 @@ Date: 12/9/2024
 Purpose: Level class and functions for "MathWiz!"
 """
 import pygame
-import json
 import math
+import os
+import copy
+import numpy
+from collections import OrderedDict
 import menufuncs
+import levelfile
+import pallates
+import tilecollisions
 #import objects
 import GameData as state
 
@@ -36,12 +42,18 @@ class level:
         The rotation map of the level.
     pallatemap : list
         The palette map of the level.
+    rowlengths : list
+        The length of each row of each layer, for levels loaded from the binary form, whose maps are 2D numpy arrays padded out to the longest row.
     bgm : string
         Name of accompanying music track
     objs : list
         The objects in the level.
     animationlist : list
         The animations in the level.
+    layers : list
+        The drawlayers of the level, in layer order.
+    source : tuple
+        The size and modification time of the level's files when it was loaded, so a cached level can tell when they've changed.
     """
     def __init__(self,name):
         """
@@ -52,7 +64,10 @@ class level:
             The name of the level.
         """
         self.name = name
-        self.datafile = json.load(open(f"Leveldata/{name}.json"))
+        self.source = sourcestamp(name)
+        #the editor changes the size of layers, so it always gets maps as lists of rows
+        self.datafile = levelfile.load(name,state.gamemode != "edit")
+        self.rowlengths = self.datafile.get("rowlengths")
         self.depths = self.datafile["layerdepths"]
         self.parallaxes = self.datafile["layerparallaxes"]
         self.loops = self.datafile["layerloops"]
@@ -73,22 +88,212 @@ class level:
         self.pallatemap = self.datafile["pallates"]
         self.objs = self.datafile["objects"]
         self.animationlist = self.datafile["animations"]
+        self.layers = []
         for layer in range(len(self.tilemap)):
             drawlayer(self,layer)
-        #spawn objects that are assigned to the level
+        self.spawn()
+        #state.player = objects.Player([50,50],(0), "MathWiz")
+        if "bgm" in self.datafile.keys():
+            self.bgm = self.datafile["bgm"]
+        state.level = self
+
+    def spawn(self):
+        """
+        Spawns the objects that are assigned to the level.
+        """
         for item in self.objs:
+            if state.gamemode == "edit":
+                state.editobjs.append(item)
+            else:
+                #objects change what they're made from, such as their position, so they get a copy to keep the level as it was loaded
+                item = copy.deepcopy(item)
             #getattr(objects,item[0])(item[2],item[3],item[4],item[1],item[5])
             if len(item) > 5:
                 state.maker.make_obj(item[0],(item[2],item[3],item[4],item[1],item[5],item[6]))
             else:
                 state.maker.make_obj(item[0],(item[2],item[3],item[4],item[1],item[5]))
-            if state.gamemode == "edit":
-                state.editobjs.append(item)
-        #state.player = objects.Player([50,50],(0), "MathWiz")
-        if "bgm" in self.datafile.keys():
-            self.bgm = self.datafile["bgm"]
+
+    def restart(self):
+        """
+        Puts the level back the way it was loaded, without reading or drawing anything again.
+        Tiles changed by animations are changed back, the layers are added to the current scene with their chunks still rendered, and the objects are spawned anew.
+        """
+        for layer in self.layers:
+            layer.reset()
+            state.objects.append(layer)
+        self.spawn()
         state.level = self
+
+#levels that have been played are kept ready to restart, from least to most recently played, so retrying after a death doesn't load the level again
+templates = OrderedDict()
+#how many levels are kept
+templatelimit = 4
+
+def sourcestamp(name):
+    """
+    Returns the size and modification time of each of a level's files, so a cached level can tell when they've changed since it was loaded.
+    """
+    stamp = []
+    for path in (f"Leveldata/{name}.json",f"Leveldata/{name}.mwl"):
+        if os.path.exists(path):
+            info = os.stat(path)
+            stamp.append((info.st_size,info.st_mtime_ns))
+        else:
+            stamp.append(None)
+    return tuple(stamp)
+
+def load(name):
+    """
+    Loads a level for play. A level that was played recently is restarted instead of being loaded again, unless its files have changed.
+    The editor always loads levels fresh.
+
+    Parameters:
+    name : str
+        The name of the level.
+
+    Returns:
+    level
+        The level.
+    """
+    if state.gamemode == "edit":
+        return level(name)
+    template = templates.get(name)
+    if template != None and template.source == sourcestamp(name):
+        templates.move_to_end(name)
+        template.restart()
+        return template
+    if template != None:
+        forget(name)
+    templates[name] = level(name)
+    while len(templates) > templatelimit:
+        forget(next(iter(templates)))
+    return templates[name]
+
+def forget(name):
+    """
+    Drops a level from the cache, and throws out the chunks its layers had rendered.
+    """
+    for layer in templates.pop(name).layers:
+        state.chunkcache.discard(layer)
+
+#this class holds the rendered chunks of every drawlayer, so that only the parts of a level that have been seen take up memory
+class chunkcache:
+    """
+    A class to hold the rendered chunks of every drawlayer. Once the chunks take up more memory than the budget allows, the least recently used ones are thrown out.
+
+    Attributes:
+    budget : int
+        The most memory the chunks may take up, in bytes.
+    used : int
+        The memory the chunks currently take up, in bytes.
+    chunks : OrderedDict
+        The rendered chunks, keyed by (layer, chunk column, chunk row), from least to most recently used.
+    """
+    def __init__(self,budget=256*1024*1024):
+        """
+        Initializes the chunk cache with the given budget.
+
+        Parameters:
+        budget : int
+            The most memory the chunks may take up, in bytes.
+        """
+        self.budget = budget
+        self.used = 0
+        self.chunks = OrderedDict()
+
+    def get(self,key):
+        """
+        Fetches a rendered chunk and marks it as recently used.
+
+        Parameters:
+        key : tuple
+            The (layer, chunk column, chunk row) of the chunk.
+
+        Returns:
+        pygame.Surface
+            The chunk, or None if it is not currently rendered.
+        """
+        chunk = self.chunks.get(key)
+        if chunk != None:
+            self.chunks.move_to_end(key)
+        return chunk
+
+    def add(self,key,chunk):
+        """
+        Stores a newly rendered chunk, throwing out old chunks if the budget is exceeded.
+
+        Parameters:
+        key : tuple
+            The (layer, chunk column, chunk row) of the chunk.
+        chunk : pygame.Surface
+            The rendered chunk.
+        """
+        if key in self.chunks:
+            self.used -= self.chunksize(self.chunks.pop(key))
+        self.chunks[key] = chunk
+        self.used += self.chunksize(chunk)
+        #always keep the newest chunk, even if it alone is over budget
+        while self.used > self.budget and len(self.chunks) > 1:
+            self.used -= self.chunksize(self.chunks.popitem(last=False)[1])
+
+    def discard(self,layer):
+        """
+        Throws out every chunk belonging to a layer.
+
+        Parameters:
+        layer : drawlayer
+            The layer whose chunks should be thrown out.
+        """
+        for key in [key for key in self.chunks if key[0] is layer]:
+            self.used -= self.chunksize(self.chunks.pop(key))
+
+    def chunksize(self,chunk):
+        """
+        Returns the memory a chunk takes up, in bytes.
+        """
+        return chunk.get_width()*chunk.get_height()*chunk.get_bytesize()
         
+#every distinct tile graphic (tile, pallate, flip and rotation) is only ever drawn once, then shared by every layer of every level.
+#graphics are kept separately for each scale and game mode, since both change how tiles are drawn.
+tilebrushes = {}
+def tilebrush(tilenum,pallatenum,flipval,rotateval):
+    """
+    Fetches the graphic for a tile with the given pallate, flip and rotation, drawing it first if it hasn't been drawn yet.
+
+    Parameters:
+    tilenum : int
+        The number of the tile.
+    pallatenum : int
+        The palette number of the tile.
+    flipval : int
+        The flip value of the tile (0 for none, 1 for horizontal, 2 for both, 3 for vertical).
+    rotateval : int
+        The number of quarter turns to rotate the tile by.
+
+    Returns:
+    pygame.Surface
+        The finished tile graphic.
+    """
+    brushes = tilebrushes.setdefault((state.scaleamt,state.gamemode),{})
+    key = (tilenum,pallatenum,flipval,rotateval)
+    if key not in brushes:
+        tileinfo = state.tilesource["tiles"][str(tilenum)]
+        brush = pygame.Surface((math.ceil(state.tilesize*state.scaleamt),math.ceil(state.tilesize*state.scaleamt))).convert_alpha()
+        brush.fill(state.invis)
+        brush.blit(state.tilesheet, (tileinfo[3][0]*state.scaleamt,tileinfo[3][1]*state.scaleamt), (tileinfo[1][0]*state.scaleamt,tileinfo[1][1]*state.scaleamt,math.ceil(tileinfo[2][0]*state.scaleamt),math.ceil(tileinfo[2][1]*state.scaleamt)))
+        #apply pallate change if required
+        if pallatenum != tileinfo[4]:
+            pallatename = state.tilesource["pallatecodes"][str(tileinfo[4])]
+            targetname = state.tilesource["pallatecodes"][str(pallatenum)]
+            pallates.recolor(brush,state.tilesource["pallates"][pallatename],state.tilesource["pallates"][targetname])
+        if state.gamemode == "edit":
+            brush.set_colorkey(state.invis)
+        else:
+            brush.set_colorkey(None)
+        #apply flips and rotation
+        brushes[key] = pygame.transform.flip(pygame.transform.rotate(brush,rotateval*90),flipval in (1,2),flipval in (2,3))
+    return brushes[key]
+
 #This class is used for the rendering of levels. Each one represents a depth layer of a level that will be rendered in the appropriate order
 class drawlayer:
     """
@@ -107,22 +312,14 @@ class drawlayer:
         The width of the layer in pixels.
     height : int
         The height of the layer in pixels.
-    workcanvas : pygame.Surface
-        The surface to draw the layer on.
-    brush : pygame.Surface
-        The surface to draw individual tiles on.
-    colorbrush : pygame.Surface
-        The surface to apply color changes to tiles.
-    brushval : int
-        The current tile value of the brush.
-    brushpal : int
-        The current palette value of the brush.
-    flipx : bool
-        Whether the brush is flipped horizontally.
-    flipy : bool
-        Whether the brush is flipped vertically.
-    rotate : int
-        The rotation of the brush in degrees.
+    canvassize : tuple
+        The size of the whole layer in display pixels.
+    chunkcols : int
+        The number of chunk columns in the layer.
+    chunkrows : int
+        The number of chunk rows in the layer.
+    collisionmap : list
+        The collision code of each tile, as a bytearray per row.
     loop : bool
         Whether the layer loops.
     depth : int
@@ -135,7 +332,17 @@ class drawlayer:
         The timers for each animation.
     animframes : list
         The current frame of each animation.
+    animstarts : list
+        The tile each animation started on when the level was loaded.
+    animcells : list
+        The values of the tile each animation changes in every map, as plain ints.
+    packed : bool
+        Whether the layer's maps are 2D numpy arrays, as loaded from the binary form, rather than lists of rows.
     """
+    #the layer is rendered in square chunks of this many tiles, and only the chunks that come into view are ever drawn
+    chunksize = 16
+    #the maps of the level that each hold a value for every tile
+    mapnames = ("tilemap","flipmap","spinmap","pallatemap")
     def __init__(self,level,layernum):
         """
         Initializes the drawlayer with the given level and layer number.
@@ -148,24 +355,13 @@ class drawlayer:
         """
         self.level = level
         self.layernum = layernum
+        self.level.layers.insert(layernum,self)
+        if not hasattr(state,"chunkcache"):
+            state.chunkcache = chunkcache()
         self.calcsize()
 
         self.animlistrecalc()
             
-        self.brush = pygame.Surface((math.ceil(state.tilesize*state.scaleamt),math.ceil(state.tilesize*state.scaleamt))).convert_alpha()
-        self.brush.fill(state.invis)
-        if state.gamemode == "edit":
-            self.brush.set_colorkey(state.invis)
-        
-        self.colorbrush = pygame.Surface((math.ceil(state.tilesize*state.scaleamt),math.ceil(state.tilesize*state.scaleamt))).convert_alpha()
-        self.colorbrush.fill(state.invis)
-        self.colorbrush.set_colorkey(state.invis)
-        
-        self.brushval = 0
-        self.brushpal = 0
-        self.flipx = False
-        self.flipy = False
-        self.rotate = 0
         if state.gamemode == "edit":
             self.loop = [False,False]
         else:
@@ -173,47 +369,204 @@ class drawlayer:
         #the depth will be useful to add parallax scrolling
         self.depth = self.level.depths[layernum]
         self.parallax = self.level.parallaxes[layernum]
-        #whenever a new thing is added to the object list, the list has to be sorted so that things are in the correct order
+        #the object list puts new things in the correct order as they are added
         state.objects.append(self)
-        state.objects.sort(key = lambda item: item.depth, reverse = True)
-        self.render()
+        self.redraw()
         
-    def render(self):
+    def redraw(self):
         """
-        Renders the layer by drawing each tile to the workcanvas.
+        Renders the layer from scratch. Chunks are thrown out, and are drawn again the next time they come into view.
+        If the maps have changed size since the layer's size was worked out, it is worked out again first, as chunks are drawn from it.
         """
-        self.workcanvas.fill((0,0,0))
-        #iterate through every row of tiles, and every tile.
-        for row in range(len(self.level.tilemap[self.layernum])):
-            for tile in range(len(self.level.tilemap[self.layernum][row])):
-                #get the number of the tile in that slot, and information about its collision data
-                tilenum = self.level.tilemap[self.layernum][row][tile]
-                pallatenum = self.level.pallatemap[self.layernum][row][tile]
-                tileinfo = state.tilesource["tiles"][str(tilenum)]
-                self.tileupdate(row,tile,tileinfo,tilenum,pallatenum)
+        #packed maps can't change size
+        if not self.packed and [len(row) for row in self.level.tilemap[self.layernum]] != self.rowlengths:
+            self.calcsize()
+        state.chunkcache.discard(self)
 
     def calcsize(self):
         """
         Calculates the size of the layer in pixels.
         """
-        #find the longest row in the layer
-        self.longest = 0
-        for row in self.level.tilemap[self.layernum]:
-            if len(row)>self.longest:
-                self.longest = len(row)
+        #find the longest row in the layer. Packed layers are padded out to a rectangle, so the length of each row is kept alongside
+        tilemap = self.level.tilemap[self.layernum]
+        self.packed = isinstance(tilemap,numpy.ndarray)
+        if self.packed:
+            self.rowlengths = self.level.rowlengths[self.layernum]
+        else:
+            self.rowlengths = [len(row) for row in tilemap]
+        self.longest = max(self.rowlengths,default=0)
         #get longest column
-        self.tallest = len(self.level.tilemap[self.layernum])
+        self.tallest = len(tilemap)
         #width and height in pixels
         self.width = self.longest*state.tilesize
         self.height = self.tallest*state.tilesize
-        #canvas on which the level is to be drawn
-        self.workcanvas = pygame.Surface((self.width*state.scaleamt,self.height*state.scaleamt)).convert_alpha()
-        if state.gamemode == "play":
-            self.workcanvas.set_colorkey(state.invis)
-            
-    def tileupdate(self,row,tile,tileinfo,tilenum,pallatenum):
+        #the layer is no longer drawn as one big canvas, but in chunks which are only drawn once they are seen
+        self.canvassize = (int(self.width*state.scaleamt),int(self.height*state.scaleamt))
+        self.chunkcols = math.ceil(self.longest/self.chunksize)
+        self.chunkrows = math.ceil(self.tallest/self.chunksize)
+        state.chunkcache.discard(self)
+        self.bakecollision()
+
+    def bakecollision(self):
+        """
+        Works out the collision code of every tile in the layer, so collision checks don't have to look up tile info.
+        Rows shorter than the longest one are padded out as solid, the same as anything out of bounds.
         """
-        Updates the tile at the given position with the given information.
+        tilemap = self.level.tilemap[self.layernum]
+        if self.packed:
+            #packed layers are done all at once, looking up the code of each different tile, flip and rotation only one time
+            combos = (tilemap.astype(numpy.uint32)<<16)|(self.level.flipmap[self.layernum].astype(numpy.uint32)<<8)|self.level.spinmap[self.layernum]
+            kinds,spots = numpy.unique(combos,return_inverse=True)
+            table = numpy.array([tilecollisions.tilecode(int(kind)>>16,(int(kind)>>8)&255,int(kind)&255) for kind in kinds],dtype=numpy.uint8)
+            codes = table[spots].reshape(tilemap.shape)
+            for row,length in enumerate(self.rowlengths):
+                codes[row,length:] = 1
+            self.collisionmap = [bytearray(row) for row in codes]
+            return
+        self.collisionmap = []
+        for row in range(self.tallest):
+            codes = bytearray([1])*self.longest
+            for tile in range(self.rowlengths[row]):
+                codes[tile] = tilecollisions.tilecode(self.level.tilemap[self.layernum][row][tile],self.level.flipmap[self.layernum][row][tile],self.level.spinmap[self.layernum][row][tile])
+            self.collisionmap.append(codes)
+
+    def collisionupdate(self,row,tile):
+        """
+        Works out the collision code of a single tile again after it has been changed.
+
+        Parameters:
+        row : int
+            The row of the tile.
+        tile : int
+            The column of the tile.
+        """
+        self.collisionmap[row][tile] = tilecollisions.tilecode(self.cell("tilemap",row,tile),self.cell("flipmap",row,tile),self.cell("spinmap",row,tile))
+
+    def cell(self,mapname,row,tile):
+        """
+        Reads the value of one tile from one of the layer's maps, as a plain int.
+
+        Parameters:
+        mapname : str
+            The map to read, such as "tilemap".
+        row : int
+            The row of the tile.
+        tile : int
+            The column of the tile.
+
+        Returns:
+        int
+            The value.
+        """
+        if self.packed:
+            return getattr(self.level,mapname)[self.layernum].item(row,tile)
+        return getattr(self.level,mapname)[self.layernum][row][tile]
+
+    def setcell(self,mapname,row,tile,value):
+        """
+        Changes the value of one tile in one of the layer's maps.
+
+        Parameters:
+        mapname : str
+            The map to change, such as "tilemap".
+        row : int
+            The row of the tile.
+        tile : int
+            The column of the tile.
+        value : int
+            The new value.
+        """
+        if self.packed:
+            getattr(self.level,mapname)[self.layernum][row,tile] = value
+        else:
+            getattr(self.level,mapname)[self.layernum][row][tile] = value
+
+    def area(self,mapname,top,bottom,left,right):
+        """
+        Reads a rectangle of one of the layer's maps out as lists of rows of plain ints, which are much quicker to go through tile by tile than a packed map.
+        Rows of list maps may come out shorter than the rectangle, if they end inside it.
+
+        Parameters:
+        mapname : str
+            The map to read, such as "tilemap".
+        top : int
+            The first row.
+        bottom : int
+            The row after the last.
+        left : int
+            The first column.
+        right : int
+            The column after the last.
+
+        Returns:
+        list
+            The rows of values.
+        """
+        grid = getattr(self.level,mapname)[self.layernum]
+        if self.packed:
+            return grid[top:bottom,left:right].tolist()
+        return [row[left:right] for row in grid[top:bottom]]
+
+    def chunkrect(self,chunkcol,chunkrow):
+        """
+        Calculates the area of the layer, in display pixels, covered by a chunk.
+
+        Parameters:
+        chunkcol : int
+            The column of the chunk.
+        chunkrow : int
+            The row of the chunk.
+
+        Returns:
+        list
+            The left, top, width and height of the chunk.
+        """
+        chunkpx = self.chunksize*state.tilesize*state.scaleamt
+        left = math.floor(chunkcol*chunkpx)
+        top = math.floor(chunkrow*chunkpx)
+        right = min(math.floor((chunkcol+1)*chunkpx),self.canvassize[0])
+        bottom = min(math.floor((chunkrow+1)*chunkpx),self.canvassize[1])
+        return [left,top,right-left,bottom-top]
+
+    def getchunk(self,chunkcol,chunkrow):
+        """
+        Fetches a chunk of the layer, drawing it first if it is not already rendered.
+
+        Parameters:
+        chunkcol : int
+            The column of the chunk.
+        chunkrow : int
+            The row of the chunk.
+
+        Returns:
+        pygame.Surface
+            The rendered chunk.
+        """
+        chunk = state.chunkcache.get((self,chunkcol,chunkrow))
+        if chunk == None:
+            rect = self.chunkrect(chunkcol,chunkrow)
+            chunk = pygame.Surface((max(rect[2],1),max(rect[3],1))).convert_alpha()
+            if state.gamemode == "play":
+                chunk.set_colorkey(state.invis)
+            chunk.fill((0,0,0))
+            top = chunkrow*self.chunksize
+            bottom = min(top+self.chunksize,self.tallest)
+            left = chunkcol*self.chunksize
+            right = min(left+self.chunksize,self.longest)
+            tiles,flips,spins,pallates = [self.area(mapname,top,bottom,left,right) for mapname in self.mapnames]
+            #iterate through every row of tiles in the chunk, and every tile.
+            for row in range(top,bottom):
+                for tile in range(left,min(right,self.rowlengths[row])):
+                    #get the number of the tile in that slot, and information about its collision data
+                    tilenum = tiles[row-top][tile-left]
+                    tileinfo = state.tilesource["tiles"][str(tilenum)]
+                    self.painttile(chunk,rect,row,tile,tileinfo,tilenum,pallates[row-top][tile-left],flips[row-top][tile-left],spins[row-top][tile-left])
+            state.chunkcache.add((self,chunkcol,chunkrow),chunk)
+        return chunk
+
+    def tileupdate(self,row,tile,tileinfo,tilenum,pallatenum,flipval=None,rotateval=None):
+        """
+        Updates the tile at the given position with the given information. If the chunk holding the tile isn't rendered, there is nothing to do; it will be drawn correctly once it is.
 
         Parameters:
         row : int
@@ -226,62 +579,49 @@ class drawlayer:
             The number of the tile.
         pallatenum : int
             The palette number of the tile.
+        flipval : int
+            The flip value of the tile. Read from the flip map if not given.
+        rotateval : int
+            The number of quarter turns the tile is rotated by. Read from the rotation map if not given.
         """
-        if tilenum != self.brushval or pallatenum != self.brushpal:
-            self.brush.fill(state.invis)
-            #print(row,tile,tileinfo,tilenum,pallatenum)
-            self.brush.blit(state.tilesheet, (tileinfo[3][0]*state.scaleamt,tileinfo[3][1]*state.scaleamt), (tileinfo[1][0]*state.scaleamt,tileinfo[1][1]*state.scaleamt,math.ceil(tileinfo[2][0]*state.scaleamt),math.ceil(tileinfo[2][1]*state.scaleamt)))
-            
-            """#this is a temporary rendering system. It should ultimately be replaced with graphics pulled from files based on tilenum.
-            #also, only changes the brush when the tilenum is different. This hopefully saves on execution time.
-            #FOR DEBUGGING PURPOSES
-            if tilenum == 1:
-                self.brush.fill((0,0,255))
-            elif tilenum == 2:
-                pygame.draw.polygon(self.brush, (0,255,255), ([0,state.tilesize],[state.tilesize,0],[state.tilesize,state.tilesize]))
-            elif tilenum == 3:
-                pygame.draw.polygon(self.brush, (255,255,0), ([0,state.tilesize],[state.tilesize,state.tilesize/2],[state.tilesize,state.tilesize]))
-            elif tilenum == 4:
-                pygame.draw.polygon(self.brush, (255,255,0), ([0,state.tilesize],[0,state.tilesize/2],[state.tilesize,0],[state.tilesize,state.tilesize]))
-            elif tilenum == 5:
-                pygame.draw.polygon(self.brush, (255,0,0), ([0,state.tilesize],[0,state.tilesize/2],[state.tilesize,state.tilesize/2],[state.tilesize,state.tilesize]))"""
-                
-            self.brushval = tilenum
-            #set pallate value to tile's default value
-            self.brushpal = tileinfo[4]
-
-            #apply pallate change if required
-            if pallatenum != self.brushpal:
-                pallatename = state.tilesource["pallatecodes"][str(self.brushpal)]
-                targetname = state.tilesource["pallatecodes"][str(pallatenum)]
-                for color in range(len(state.tilesource["pallates"][pallatename])):
-                    self.colorbrush.fill(state.tilesource["pallates"][targetname][color])
-                    self.brush.set_colorkey(state.tilesource["pallates"][pallatename][color])
-                    self.colorbrush.blit(self.brush,(0,0))
-                    self.brush.blit(self.colorbrush,(0,0))
-                self.brushpal = pallatenum
-            if state.gamemode == "edit":
-                self.brush.set_colorkey(state.invis)
-            else:
-                self.brush.set_colorkey(None)
-
-        #apply flips and rotation based on the level data
-        self.rotate = (self.level.spinmap[self.layernum][row][tile])*90
-        flipval = self.level.flipmap[self.layernum][row][tile]
-        if flipval == 1:
-            self.flipx = True
-            self.flipy = False
-        elif flipval == 2:
-            self.flipx = True
-            self.flipy = True
-        elif flipval == 3:
-            self.flipy = True
-            self.flipx = False
-        else:
-            self.flipx = False
-            self.flipy = False
-        #render layer
-        self.workcanvas.blit(pygame.transform.flip(pygame.transform.rotate(self.brush,self.rotate),self.flipx,self.flipy),(math.floor(tile*state.tilesize*state.scaleamt),math.floor(row*state.tilesize*state.scaleamt)))
+        chunkcol = tile//self.chunksize
+        chunkrow = row//self.chunksize
+        chunk = state.chunkcache.get((self,chunkcol,chunkrow))
+        if chunk != None:
+            if flipval == None:
+                flipval = self.cell("flipmap",row,tile)
+            if rotateval == None:
+                rotateval = self.cell("spinmap",row,tile)
+            self.painttile(chunk,self.chunkrect(chunkcol,chunkrow),row,tile,tileinfo,tilenum,pallatenum,flipval,rotateval)
+
+    def painttile(self,chunk,rect,row,tile,tileinfo,tilenum,pallatenum,flipval,rotateval):
+        """
+        Draws the tile at the given position onto the chunk that holds it.
+
+        Parameters:
+        chunk : pygame.Surface
+            The chunk to draw to.
+        rect : list
+            The area of the layer covered by the chunk.
+        row : int
+            The row of the tile.
+        tile : int
+            The column of the tile.
+        tileinfo : dict
+            The information of the tile.
+        tilenum : int
+            The number of the tile.
+        pallatenum : int
+            The palette number of the tile.
+        flipval : int
+            The flip value of the tile.
+        rotateval : int
+            The number of quarter turns the tile is rotated by.
+        """
+        #fetch the tile graphic with flips, rotation and pallate already applied
+        brush = tilebrush(tilenum,pallatenum,flipval,rotateval)
+        #render tile to the chunk
+        chunk.blit(brush,(math.floor(tile*state.tilesize*state.scaleamt)-rect[0],math.floor(row*state.tilesize*state.scaleamt)-rect[1]))
 
     def animlistrecalc(self):
         """
@@ -290,13 +630,55 @@ class drawlayer:
         self.animationlist = self.level.animationlist[self.layernum]
         self.animtimers = []
         self.animframes = []
+        #the tile each animation starts on, so the layer can be put back how it was. Animations don't change tiles in the editor
+        self.animstarts = []
+        #animated tiles are kept as plain ints, so animating them never reads the maps. Animations of the same tile share them
+        self.animcells = []
+        cells = {}
         for sequence in self.animationlist:
             self.animtimers.append(0)
             self.animframes.append(0)
+            if state.gamemode != "edit":
+                spot = (sequence[2],sequence[1])
+                if spot not in cells:
+                    cells[spot] = {mapname:self.cell(mapname,spot[0],spot[1]) for mapname in self.mapnames}
+                self.animcells.append(cells[spot])
+                self.animstarts.append(cells[spot][sequence[0]])
+
+    def reset(self):
+        """
+        Changes tiles changed by animations back to how they started, and starts the animations over.
+        Chunks that are still rendered are drawn over where tiles change, rather than being thrown out.
+        """
+        for sequencenum,sequence in enumerate(self.animationlist):
+            cell = self.animcells[sequencenum]
+            if cell[sequence[0]] != self.animstarts[sequencenum]:
+                cell[sequence[0]] = self.animstarts[sequencenum]
+                self.animatecell(sequence[2],sequence[1],sequence[0],cell)
+        self.animtimers = [0]*len(self.animationlist)
+        self.animframes = [0]*len(self.animationlist)
+
+    def animatecell(self,row,tile,mapname,cell):
+        """
+        Writes an animated tile's new value to its map, then draws the tile again and works out its collision again, all from the layer's own copy of the tile's values.
+
+        Parameters:
+        row : int
+            The row of the tile.
+        tile : int
+            The column of the tile.
+        mapname : str
+            The map the animation changes, such as "tilemap".
+        cell : dict
+            The tile's values in every map, with the new value already in place.
+        """
+        self.setcell(mapname,row,tile,cell[mapname])
+        self.tileupdate(row,tile,state.tilesource["tiles"][str(cell["tilemap"])],cell["tilemap"],cell["pallatemap"],cell["flipmap"],cell["spinmap"])
+        self.collisionmap[row][tile] = tilecollisions.tilecode(cell["tilemap"],cell["flipmap"],cell["spinmap"])
             
     def update(self):
         """
-        Updates the layer, including tile animations and parallax scrolling.
+        Updates the layer's tile animations.
         """
         #update tile animations
         #print(self.animationlist)
@@ -310,18 +692,22 @@ class drawlayer:
                 else:
                     self.animframes[sequencenum] += 1
                 if state.gamemode != "edit":
-                    getattr(self.level,self.animationlist[sequencenum][0])[self.layernum][self.animationlist[sequencenum][2]][self.animationlist[sequencenum][1]] = self.animationlist[sequencenum][3][self.animframes[sequencenum]][0]
-                    row = self.animationlist[sequencenum][2]
-                    tile = self.animationlist[sequencenum][1]
-                    tilenum = self.level.tilemap[self.layernum][row][tile]
-                    pallatenum = self.level.pallatemap[self.layernum][row][tile]
-                    tileinfo = state.tilesource["tiles"][str(tilenum)]
-                    self.tileupdate(row,tile,tileinfo,tilenum,pallatenum)
+                    cell = self.animcells[sequencenum]
+                    cell[self.animationlist[sequencenum][0]] = self.animationlist[sequencenum][3][self.animframes[sequencenum]][0]
+                    self.animatecell(self.animationlist[sequencenum][2],self.animationlist[sequencenum][1],self.animationlist[sequencenum][0],cell)
             if state.gamemode == "edit":
                 col = int(255*self.animtimers[sequencenum]/self.animationlist[sequencenum][3][self.animframes[sequencenum]][1])
                 row = self.animationlist[sequencenum][2]
                 tile = self.animationlist[sequencenum][1]
-                pygame.draw.rect(self.workcanvas, (0,col,col,50), (tile*state.tilesize*state.scaleamt,row*state.tilesize*state.scaleamt,state.tilesize*state.scaleamt,state.tilesize*state.scaleamt))
+                chunk = state.chunkcache.get((self,tile//self.chunksize,row//self.chunksize))
+                if chunk != None:
+                    rect = self.chunkrect(tile//self.chunksize,row//self.chunksize)
+                    pygame.draw.rect(chunk, (0,col,col,50), (tile*state.tilesize*state.scaleamt-rect[0],row*state.tilesize*state.scaleamt-rect[1],state.tilesize*state.scaleamt,state.tilesize*state.scaleamt))
+
+    def render(self):
+        """
+        Draws the layer to the display, with parallax scrolling and looping.
+        """
         #this modifier determines how much the offset of an object should be affected by it's distance from the camera in z space...sort of.
         parallaxmod = self.parallax-state.cam.depth
         
@@ -333,15 +719,34 @@ class drawlayer:
             
         drawspot = (screenplacemod[0]-state.cam.pos[0]*parallaxmod,
                     screenplacemod[1]-state.cam.pos[1]*parallaxmod)
-        state.display.blit(self.workcanvas,(drawspot[0]*state.scaleamt,drawspot[1]*state.scaleamt))
+        #looping layers repeat every width/height, so work out which copies overlap the screen and draw only those.
+        #drawspot is never right of or below the screen's corner, so this is one or two copies each way unless the layer is smaller than the screen.
+        xspots = [drawspot[0]]
+        yspots = [drawspot[1]]
+        if self.loop[0] == True and self.width > 0:
+            xspots = [drawspot[0]+self.width*rep for rep in range(math.ceil((state.screensize[0]-drawspot[0])/self.width))]
+        if self.loop[1] == True and self.height > 0:
+            yspots = [drawspot[1]+self.height*rep for rep in range(math.ceil((state.screensize[1]-drawspot[1])/self.height))]
+        for yspot in yspots:
+            for xspot in xspots:
+                self.blitchunks((xspot,yspot))
 
-        if self.loop[0] == True:
-            if abs(state.cam.pos[0])+state.screensize[0] > (drawspot[0]+self.longest*state.tilesize):
-                state.display.blit(self.workcanvas,((drawspot[0]+self.width)*state.scaleamt,drawspot[1]*state.scaleamt))
-                
-        if self.loop[1] == True:
-            if abs(state.cam.pos[1])+state.screensize[1] > len(self.level.tilemap[self.layernum])*state.tilesize:
-                state.display.blit(self.workcanvas,((drawspot[0])*state.scaleamt,(drawspot[1]+self.height)*state.scaleamt))
+    def blitchunks(self,drawspot):
+        """
+        Draws the chunks of the layer that fall within the display, rendering any that haven't been drawn yet.
 
-        if self.loop[0] and self.loop[1] and abs(state.cam.pos[0]) > (drawspot[0]+self.longest*state.tilesize) and abs(state.cam.pos[1])+state.screensize[1] > len(self.level.tilemap[self.layernum])*state.tilesize:
-            state.display.blit(self.workcanvas,((drawspot[0]+self.width)*state.scaleamt,(drawspot[1]+self.height)*state.scaleamt))
+        Parameters:
+        drawspot : tuple
+            The position on screen of the top left corner of the layer.
+        """
+        corner = (int(drawspot[0]*state.scaleamt),int(drawspot[1]*state.scaleamt))
+        chunkpx = self.chunksize*state.tilesize*state.scaleamt
+        #find the range of chunks that overlap the display
+        firstcol = max(0,math.floor(-corner[0]/chunkpx))
+        lastcol = min(self.chunkcols-1,math.floor((state.display.get_width()-corner[0])/chunkpx))
+        firstrow = max(0,math.floor(-corner[1]/chunkpx))
+        lastrow = min(self.chunkrows-1,math.floor((state.display.get_height()-corner[1])/chunkpx))
+        for chunkrow in range(firstrow,lastrow+1):
+            for chunkcol in range(firstcol,lastcol+1):
+                rect = self.chunkrect(chunkcol,chunkrow)
+                state.display.blit(self.getchunk(chunkcol,chunkrow),(corner[0]+rect[0],corner[1]+rect[1]))
@@ -0,0 +1,205 @@
+"""
+Filename: levelfile.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: A compact binary form of "MathWiz!" levels, read straight from disk with numpy, and conversion to and from the JSON form
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import numpy
+
+#binary levels start with this, then the version of the format
+MAGIC = b"MWLV"
+VERSION = 1
+#the tile maps, as they're named in the JSON form, and the type each is packed as
+maps = (("tiles",numpy.uint16),("flips",numpy.uint8),("rotates",numpy.uint8),("pallates",numpy.uint8))
+
+def align(length):
+    """
+    Rounds a length up to a multiple of 8, so every array starts on a boundary numpy can read it from directly.
+    """
+    return (length+7)//8*8
+
+def pack(data,source=b"",stamp=None):
+    """
+    Packs a level into the binary form.
+    The file is a short header, then everything but the tile maps as JSON, then each layer's rows lengths and maps as flat arrays.
+    Layers with rows of different lengths are padded out to the longest row.
+
+    Parameters:
+    data : dict
+        The level, in the JSON form.
+    source : bytes
+        The JSON file the level came from, so a stale binary can be spotted.
+    stamp : list
+        The size and modification time of the JSON file, so it only has to be hashed again if they change.
+
+    Returns:
+    bytes
+        The packed level.
+    """
+    meta = {key:value for key,value in data.items() if key not in dict(maps)}
+    meta["source"] = hashlib.sha1(source).hexdigest()
+    meta["sourcestamp"] = stamp
+    meta["layers"] = []
+    body = b""
+    for layer in range(len(data["tiles"])):
+        lengths = [len(row) for row in data["tiles"][layer]]
+        shape = (len(lengths),max(lengths,default=0))
+        arrays = {"rowlengths":numpy.array(lengths,dtype=numpy.uint16)}
+        for key,kind in maps:
+            array = numpy.zeros(shape,dtype=kind)
+            for row,values in enumerate(data[key][layer]):
+                if values and (min(values) < 0 or max(values) > numpy.iinfo(kind).max):
+                    raise ValueError(f"{key} on layer {layer}, row {row} doesn't fit in {numpy.dtype(kind).name}")
+                array[row,:len(values)] = values
+            arrays[key] = array
+        offsets = {}
+        for key,array in arrays.items():
+            offsets[key] = len(body)
+            body += array.tobytes()
+            body += bytes(align(len(body))-len(body))
+        meta["layers"].append({"shape":shape,"offsets":offsets})
+    meta = json.dumps(meta).encode()
+    header = MAGIC+struct.pack("<BxxxI",VERSION,len(meta))+meta
+    return header+bytes(align(len(header))-len(header))+body
+
+def read(path):
+    """
+    Reads a binary level. The tile maps aren't loaded, but mapped from the file, and only copied a page at a time as they're changed.
+
+    Parameters:
+    path : str
+        The file to read.
+
+    Returns:
+    dict
+        The level, the same as the JSON form but with each layer's maps as 2D numpy arrays, and the length of each row under "rowlengths".
+    """
+    #the file is used through a plain array, since indexing numpy's memmap type is many times slower. It still reads from the mapped file
+    raw = numpy.memmap(path,dtype=numpy.uint8,mode="c").view(numpy.ndarray)
+    if bytes(raw[:4]) != MAGIC:
+        raise ValueError(f"{path} is not a binary level")
+    version,metalength = struct.unpack_from("<BxxxI",raw,4)
+    if version != VERSION:
+        raise ValueError(f"{path} is in version {version} of the format, not {VERSION}")
+    data = json.loads(bytes(raw[12:12+metalength]))
+    start = align(12+metalength)
+    data["rowlengths"] = []
+    for key,kind in maps:
+        data[key] = []
+    for layer in data.pop("layers"):
+        rows,cols = layer["shape"]
+        offset = start+layer["offsets"]["rowlengths"]
+        data["rowlengths"].append(raw[offset:offset+rows*2].view(numpy.uint16).tolist())
+        for key,kind in maps:
+            offset = start+layer["offsets"][key]
+            size = rows*cols*numpy.dtype(kind).itemsize
+            data[key].append(raw[offset:offset+size].view(kind).reshape(rows,cols))
+    return data
+
+def unpack(data):
+    """
+    Turns a level read from the binary form back into the JSON form, with each map as lists of rows.
+
+    Parameters:
+    data : dict
+        The level, as returned by read.
+
+    Returns:
+    dict
+        The level, in the JSON form.
+    """
+    unpacked = {key:value for key,value in data.items() if key not in ("rowlengths","source","sourcestamp")}
+    for key,kind in maps:
+        unpacked[key] = [[array[row,:length].tolist() for row,length in enumerate(lengths)] for array,lengths in zip(data[key],data["rowlengths"])]
+    return unpacked
+
+def stamp(path):
+    """
+    Returns the size and modification time of a file.
+    """
+    info = os.stat(path)
+    return [info.st_size,info.st_mtime_ns]
+
+def fresh(data,jsonpath):
+    """
+    Checks whether a binary level was made from a JSON file as it is now.
+    The file is only hashed if its size or modification time have changed since, as copying it or checking it out again changes its time but not what's in it.
+
+    Parameters:
+    data : dict
+        The level, as returned by read.
+    jsonpath : str
+        The JSON file.
+
+    Returns:
+    bool
+        Whether the binary level is up to date.
+    """
+    if data.get("sourcestamp") == stamp(jsonpath):
+        return True
+    with open(jsonpath,"rb") as file:
+        return hashlib.sha1(file.read()).hexdigest() == data["source"]
+
+def load(name,packed=True):
+    """
+    Loads a level from Leveldata. If there's a binary version made from the JSON file as it is now, that's read instead.
+    A binary level with no JSON file beside it is read as well.
+
+    Parameters:
+    name : str
+        The name of the level.
+    packed : bool
+        Whether maps can be left as numpy arrays. If not, they're always lists of rows, as the editor needs.
+
+    Returns:
+    dict
+        The level.
+    """
+    jsonpath = f"Leveldata/{name}.json"
+    binarypath = f"Leveldata/{name}.mwl"
+    if os.path.exists(binarypath):
+        data = read(binarypath)
+        if os.path.exists(jsonpath) and not fresh(data,jsonpath):
+            data = None
+        if data != None:
+            return data if packed else unpack(data)
+    return json.load(open(jsonpath))
+
+def tobinary(name):
+    """
+    Converts a level in Leveldata from JSON to binary, writing it beside the JSON file.
+    """
+    #the stamp is taken first, so a change made while the file is being read shows up as a change next time
+    sourcestamp = stamp(f"Leveldata/{name}.json")
+    source = open(f"Leveldata/{name}.json","rb").read()
+    open(f"Leveldata/{name}.mwl","wb").write(pack(json.loads(source),source,sourcestamp))
+
+def tojson(name):
+    """
+    Converts a level in Leveldata from binary back to JSON, writing it beside the binary file.
+    The binary is written again afterward, so it matches the new JSON file.
+    """
+    data = unpack(read(f"Leveldata/{name}.mwl"))
+    json.dump(data,open(f"Leveldata/{name}.json","w"))
+    tobinary(name)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Convert levels in Leveldata between JSON and the binary form.")
+    parser.add_argument("direction",choices = ("tobinary","tojson"),help = "which way to convert")
+    parser.add_argument("levels",nargs = "*",help = "the levels to convert (every JSON level in Leveldata by default, when converting to binary)")
+    args = parser.parse_args()
+    levels = args.levels
+    if not levels and args.direction == "tobinary":
+        levels = sorted(name[:-5] for name in os.listdir("Leveldata") if name.endswith(".json") and not name.startswith("."))
+    for name in levels:
+        try:
+            globals()[args.direction](name)
+            print(f"converted {name}")
+        except (ValueError,KeyError,IndexError) as error:
+            print(f"couldn't convert {name}: {type(error).__name__}: {error}")
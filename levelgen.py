@@ -0,0 +1,242 @@
+"""
+Filename: levelgen.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Generates large, valid "MathWiz!" levels of any size, for stress testing
+"""
+import argparse
+import json
+import random
+
+def objectnames(objectsource,classname):
+    """
+    Finds the objects in objects.json that are made as a given class.
+
+    Parameters:
+    objectsource : dict
+        The contents of objects.json.
+    classname : str
+        The class, such as "Enemy".
+
+    Returns:
+    list
+        The names of the objects.
+    """
+    return [name for name,data in objectsource.items() if data.get("Type") == classname]
+
+def tileset(tilesource,rng):
+    """
+    Picks a set of tiles drawn in the same pallate, with a tile for every collision shape, so generated ground looks like it belongs together.
+
+    Parameters:
+    tilesource : dict
+        The contents of tiles.json.
+    rng : random.Random
+        Where random choices come from.
+
+    Returns:
+    dict
+        The tile numbers for each collision shape, and the air tile under 0.
+    """
+    sets = {}
+    for tilenum,info in tilesource["tiles"].items():
+        sets.setdefault(info[4],{}).setdefault(info[5],[]).append(int(tilenum))
+    complete = sorted(pallate for pallate,shapes in sets.items() if all(shape in shapes for shape in range(1,6)))
+    shapes = dict(sets[rng.choice(complete)]) if complete else {}
+    #any shapes the pallate doesn't have are borrowed from the whole tile list
+    for shape in range(1,6):
+        if shape not in shapes:
+            shapes[shape] = [int(tilenum) for tilenum,info in tilesource["tiles"].items() if info[5] == shape]
+    #the air tile is the empty one, with nothing to draw
+    shapes[0] = [min(int(tilenum) for tilenum,info in tilesource["tiles"].items() if info[5] == 0 and info[2] == [0,0])]
+    return shapes
+
+def terrain(width,height,slopes,shapes,rng):
+    """
+    Builds rolling ground: open air above, a surface that rises and falls a tile at a time, and solid ground below.
+    Rises and falls are made of a 45 degree slope or a pair of 22 degree slopes, and flat stretches get the odd half-height slab.
+
+    Parameters:
+    width : int
+        The width in tiles.
+    height : int
+        The height in tiles.
+    slopes : float
+        The chance of the ground rising or falling at each column.
+    shapes : dict
+        The tiles to build with, as returned by tileset.
+    rng : random.Random
+        Where random choices come from.
+
+    Returns:
+    tuple
+        The tiles and flips, as lists of rows, and the row the ground's surface is on in each column.
+    """
+    air = shapes[0][0]
+    tiles = [[air]*width for row in range(height)]
+    flips = [[0]*width for row in range(height)]
+    surface = []
+    row = height*2//3
+    column = 0
+    def fill(column,row):
+        for below in range(row,height):
+            tiles[below][column] = rng.choice(shapes[1])
+    while column < width:
+        change = 0
+        if rng.random() < slopes and column < width-2:
+            change = rng.choice((-1,1))
+            if not height//4 <= row+change <= height-3:
+                change = -change
+        if change == 0:
+            fill(column,row)
+            #the odd slab on flat ground
+            if rng.random() < slopes/4 and row > 0:
+                tiles[row-1][column] = rng.choice(shapes[5])
+            surface.append(row)
+            column += 1
+            continue
+        #a rise or fall is one 45 degree tile, or two 22 degree tiles, on the higher of the two rows. Falls are mirrored rises
+        steep = rng.random() < 0.5
+        pieces = [rng.choice(shapes[2])] if steep else [rng.choice(shapes[3]),rng.choice(shapes[4])]
+        top = min(row,row+change)
+        if change > 0:
+            pieces.reverse()
+        for piece in pieces:
+            fill(column,top+1)
+            tiles[top][column] = piece
+            flips[top][column] = 1 if change > 0 else 0
+            surface.append(top)
+            column += 1
+            if column >= width:
+                break
+        row += change
+    return tiles,flips,surface
+
+#the narrowest level that can be generated
+minwidth = 11
+
+def generate(width=400,height=60,layers=2,slopes=0.15,animations=50,enemies=20,spawners=5,platforms=20,recolor=0.0,seed=0):
+    """
+    Generates a level, in the same form as the files in Leveldata.
+    The last layer is the one played on, and any layers before it are looping backdrops, each further back than the last.
+    All tiles and objects come from tiles.json and objects.json.
+
+    Parameters:
+    width : int
+        The width of the played layer, in tiles.
+    height : int
+        The height of every layer, in tiles.
+    layers : int
+        How many layers there are, counting the played layer.
+    slopes : float
+        The chance of the ground rising or falling at each column.
+    animations : int
+        How many tile animations there are on the played layer.
+    enemies : int
+        How many enemies there are.
+    spawners : int
+        How many spawners there are.
+    platforms : int
+        How many moving and collapsing platforms there are.
+    recolor : float
+        The fraction of tiles drawn in a different pallate from their own.
+    seed : int
+        The seed for the random choices. The same settings and seed always make the same level.
+
+    Returns:
+    dict
+        The level.
+    """
+    #objects other than the player go between the 8th column and two short of the end, so there has to be room between them
+    if width < minwidth:
+        raise ValueError(f"levels must be at least {minwidth} tiles wide, not {width}")
+    rng = random.Random(seed)
+    tilesource = json.load(open("tiles.json"))
+    objectsource = json.load(open("objects.json"))
+    pallatecodes = [int(code) for code in tilesource["pallatecodes"]]
+    made = {"layerdepths":[],"layerparallaxes":[],"layerloops":[],"animations":[],"tiles":[],"flips":[],"rotates":[],"pallates":[],"objects":[]}
+    for layer in range(layers):
+        played = layer == layers-1
+        columns = width if played else max(30,width//4)
+        shapes = tileset(tilesource,rng)
+        tiles,flips,surface = terrain(columns,height,slopes if played else slopes*2,shapes,rng)
+        pallates = [[tilesource["tiles"][str(tilenum)][4] for tilenum in row] for row in tiles]
+        if recolor > 0:
+            for row in pallates:
+                for tile in range(len(row)):
+                    if rng.random() < recolor:
+                        row[tile] = rng.choice(pallatecodes)
+        made["layerdepths"].append(1 if played else layers+1-layer)
+        made["layerparallaxes"].append(1.0 if played else round(0.2+0.6*layer/max(layers-1,1),2))
+        made["layerloops"].append([False,False] if played else [True,False])
+        made["tiles"].append(tiles)
+        made["flips"].append(flips)
+        made["rotates"].append([[0]*columns for row in range(height)])
+        made["pallates"].append(pallates)
+        made["animations"].append([])
+    #tile animations go in the open air just above the ground, so they don't change what can be stood on.
+    #surface is still that of the played layer, as it was built last
+    played = layers-1
+    sequences = [sequence for sequence in tilesource["anims"].values() if sequence[0] == "tilemap"]
+    sequences = [sequence for sequence in sequences if all(tilesource["tiles"][str(frame[0])][5] == 0 for frame in sequence[1])] or sequences
+    spots = rng.sample([(column,row) for column,row in enumerate(surface) if row > 1],min(animations,sum(1 for row in surface if row > 1)))
+    for column,row in spots:
+        sequence = rng.choice(sequences)
+        made["animations"][played].append(["tilemap",column,row-1,sequence[1]])
+        made["tiles"][played][row-1][column] = sequence[1][0][0]
+        made["pallates"][played][row-1][column] = tilesource["tiles"][str(sequence[1][0][0])][4]
+    #objects stand a little above the ground at random spots, with the player at the far left
+    #the size of a tile in level pixels, as set in main.py
+    size = 120
+    def onground(column,above):
+        return [column*size,(surface[column]-above)*size]
+    made["objects"].append(["Player",objectnames(objectsource,"Player")[0],onground(2,2),0,1.0,played,{}])
+    for classnames,count,above in ((("Enemy",),enemies,2),(("spawner",),spawners,3),(("Platform","CollapsingPlatform"),platforms,4)):
+        names = [(classname,name) for classname in classnames for name in objectnames(objectsource,classname)]
+        for item in range(count if names else 0):
+            classname,name = rng.choice(names)
+            made["objects"].append([classname,name,onground(rng.randrange(8,width-2),above),0,1.0,played,{}])
+    return made
+
+def write(name,made):
+    """
+    Writes a generated level to Leveldata, where the game and the runners can load it by name.
+    """
+    json.dump(made,open(f"Leveldata/{name}.json","w"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Generate a large level for stress testing, and write it to Leveldata.")
+    parser.add_argument("name",help = "the name to save the level under")
+    parser.add_argument("--width",type = int,default = 400,help = "width of the played layer, in tiles")
+    parser.add_argument("--height",type = int,default = 60,help = "height of every layer, in tiles")
+    parser.add_argument("--layers",type = int,default = 2,help = "how many layers, counting the played layer")
+    parser.add_argument("--slopes",type = float,default = 0.15,help = "chance of the ground rising or falling at each column")
+    parser.add_argument("--animations",type = int,default = 50,help = "how many tile animations")
+    parser.add_argument("--enemies",type = int,default = 20,help = "how many enemies")
+    parser.add_argument("--spawners",type = int,default = 5,help = "how many spawners")
+    parser.add_argument("--platforms",type = int,default = 20,help = "how many platforms")
+    parser.add_argument("--recolor",type = float,default = 0.0,help = "fraction of tiles drawn in another pallate")
+    parser.add_argument("--seed",type = int,default = 0,help = "seed for the random choices")
+    parser.add_argument("--sweep",metavar = "SETTING=VALUES",help = "write a series of levels, one for each of a comma separated list of values of one setting, such as enemies=0,100,1000")
+    args = parser.parse_args()
+    settings = {key:value for key,value in vars(args).items() if key not in ("name","sweep")}
+    if args.sweep:
+        setting,values = args.sweep.split("=")
+        if setting not in settings:
+            parser.error(f"there's no setting called {setting}")
+        for value in values.split(","):
+            settings[setting] = type(settings[setting])(value)
+            try:
+                made = generate(**settings)
+            except ValueError as error:
+                parser.error(str(error))
+            write(f"{args.name}-{setting}-{value}",made)
+            print(f"wrote {args.name}-{setting}-{value}")
+    else:
+        try:
+            made = generate(**settings)
+        except ValueError as error:
+            parser.error(str(error))
+        write(args.name,made)
+        print(f"wrote {args.name}")
@@ -7,6 +7,7 @@ Purpose: Core file for "MathWiz!"
 """
 #premade library imports
 from sys import exit as exitfunc
+import argparse
 import pygame
 import json
 
@@ -18,6 +19,20 @@ import objects
 import menufuncs
 import particles
 import maker
+import scene
+import behaviours
+import gameloop
+import replay
+import profiler
+
+#input can be recorded from the start of a level, or a recording played back, so that a run can be repeated exactly
+parser = argparse.ArgumentParser(description = "MATHWIZ! The Test Run")
+parser.add_argument("--level",help = "start on this level instead of the intro")
+parser.add_argument("--record",help = "record input to this file, starting from --level")
+parser.add_argument("--replay",help = "play back a recording")
+args = parser.parse_args()
+if args.record and not args.level:
+    parser.error("--record needs a --level to start on")
 
 #initialize pygame stuffs
 pygame.init()
@@ -29,6 +44,9 @@ state.savefile = 1
 
 state.adjustdeltatime = state.savedata[str(state.savefile)]["adjustdeltatime"]
 state.movetickamount = state.savedata[str(state.savefile)]["movetickamount"]
+#with deltatime adjustment on, game logic runs this many steps per second, and no more than maxsteps are run to catch up in one frame
+state.steprate = state.savedata[str(state.savefile)]["steprate"]
+state.maxsteps = state.savedata[str(state.savefile)]["maxsteps"]
 #size to actually display stuff
 state.displaysize = state.savedata[str(state.savefile)]["displaysize"]
 #the tilesize is a lynchpin. All measures in the game save for the final render size are based on the tile (or, they will be in the final product. Not all of them are right now)
@@ -57,11 +75,13 @@ state.menusheet = pygame.transform.scale_by(pygame.image.load("Assets/images/men
 
 state.objectsource = json.load(open("objects.json"))
 state.aisource = json.load(open("behaviours.json"))
+behaviours.compileall()
 state.infosource = json.load(open("entityinfo.json"))
 state.menudata = json.load(open("menus.json"))
 
 state.tilesource = json.load(open("tiles.json"))
 state.particlesource = json.load(open("particles.json"))
+state.effectsource = json.load(open("effects.json"))
 state.cutscenesource = json.load(open("cutscenes.json"))
 
 state.jump_sound = pygame.mixer.Sound("Assets/sounds/sfx/Jump.mp3")
@@ -82,87 +102,134 @@ state.gamemode = "play"
 state.maker = maker.maker()
 state.invis = (255,0,255)
 state.pause = False
-state.particleManager = particles.ParticleManager()
+#each layer may hold this many particles before the oldest (or least important) are thrown out, and particles off screen only move every so many frames
+state.particleManager = particles.ParticleManager(state.savedata[str(state.savefile)]["particlebudget"],
+                                                  state.savedata[str(state.savefile)]["particleeviction"],
+                                                  state.savedata[str(state.savefile)]["offscreenparticlerate"])
+#rendered level chunks may use up to this many megabytes before the least recently seen ones are thrown out
+state.chunkcache = level.chunkcache(state.savedata[str(state.savefile)]["chunkbudget"]*1024*1024)
 state.HUD.set_colorkey(state.invis)
 state.deltatime = 1
 state.fpsTarget = 60
 state.event_types = []
+state.newkeys = []
 state.timeslow = 1
+state.stepper = gameloop.fixedstep(state.steprate,state.maxsteps)
+#the profiler times each part of the frame and shows it over the game. F3 turns it on and off
+state.profiler = profiler.profiler(pertype = state.savedata[str(state.savefile)]["profiletypes"])
+if state.savedata[str(state.savefile)]["profile"]:
+    state.profiler.enable()
 
-state.objects = []
+state.objects = scene.scene()
 state.menu_button_focus = None
 state.cam = Cam.cam()
 
 #to start with, load menu stuffs
 #menufuncs.loadmenu("test")
-menufuncs.loadcutscene("Intro")
+state.recorder = None
+state.playback = None
+if args.replay:
+    state.playback = replay.playback(args.replay)
+    state.playback.start()
+    menufuncs.loadlevel(state.playback.level)
+elif args.level:
+    if args.record:
+        state.recorder = replay.recorder(args.record,args.level)
+    menufuncs.loadlevel(args.level)
+else:
+    menufuncs.loadcutscene("Intro")
 
 while True:
     """
     Main game loop. Handles input, updates, and rendering.
     """
-    #calculate deltatime. This is used to augment certain values and keep the speed of things independent from the framerate
-    if state.adjustdeltatime:
-        state.deltatime = state.fpsTarget*state.clock.get_time()/(1000*state.timeslow)
-    #print(state.deltatime) 
+    if state.profiler.enabled:
+        state.profiler.begin()
     #input handling--maybe throw this into it's own file for the sake of organization?
-    #newkeys is a suprise tool that will help us later
-    state.newkeys = []
     #position of the mouse cursor relative to the window. Adjusted for the scaling.
     state.mouse = pygame.mouse.get_pos()
     state.mouse = (state.mouse[0]*state.screensize[0]/state.displaysize[0],state.mouse[1]*state.screensize[1]/state.displaysize[1])
     #current state of the mouse buttons
     state.click = pygame.mouse.get_pressed()
     state.events = pygame.event.get()
-    #some parts of the code only care about event type, so let's fetch it here
+    #some parts of the code only care about event type, so let's fetch it here.
+    #event types and newkeys build up until a step of game logic has seen them, so nothing is missed on frames that run no steps
     for e in state.events:
         state.event_types.append(e.type)
     for event in state.events:
         #quit logic
         if event.type == pygame.QUIT:
+            if state.recorder:
+                state.recorder.close()
             pygame.quit()
             exitfunc()
         if event.type == pygame.KEYDOWN:
             #if a key is newly down on this frame, it's important. Add it to newkeys
             state.newkeys.append(event.key)
+            if event.key == pygame.K_F3:
+                state.profiler.toggle()
     #current state of keyboard keys
     state.keys = pygame.key.get_pressed()
+    if state.profiler.enabled:
+        state.profiler.zone("Input")
     
     """FOR TESTING UNDER HEAVY LAG:"""
     #from time import sleep
     #sleep(0.25)
-    #reset display
-    state.display.fill((42,168,228))
-    state.HUD.fill((255,0,255))
-    #update world
-    state.cam.update()
-
     if state.pause == False:
-        state.objitr = 0
-        while state.objitr < len(state.objects):
-            item = state.objects[state.objitr]
-            if hasattr(item, "checkupdatedist"):
-                if item.checkupdatedist():
-                    item.update()
+        #work out how many steps of game logic to run. With deltatime adjustment on, the logic runs at a fixed rate with a fixed deltatime,
+        #and things are drawn partway between the last two steps to smooth out the difference from the framerate.
+        #Otherwise, one step is run per frame, as before
+        if state.adjustdeltatime:
+            steps = state.stepper.advance(state.clock.get_time()/state.timeslow)
+            state.deltatime = state.fpsTarget/state.steprate
+            alpha = state.stepper.alpha()
+        else:
+            steps = 1
+            alpha = 1
+        #the HUD is only cleared when there's logic to draw it again
+        if steps > 0:
+            state.HUD.fill((255,0,255))
+        #update world
+        for step in range(steps):
+            #a recording being played back stands in for the keyboard and mouse, and sets the deltatime it was made with
+            if state.playback and not state.playback.apply():
+                pygame.quit()
+                exitfunc()
+            if state.recorder:
+                state.recorder.capture()
+            if state.profiler.enabled:
+                state.profiler.count("Updated",gameloop.step(state.profiler.frame,state.profiler.pertype))
+                state.profiler.count("Steps")
             else:
-                item.update()
-            if type(item).__name__ =="drawlayer":
-                state.particleManager.updateLayer(item.layernum)
-            if item not in state.objects:
-                state.objitr -= 1
-            state.objitr += 1
+                gameloop.step()
+            state.newkeys = []
+            state.event_types = []
+        if state.profiler.enabled:
+            state.profiler.mark()
+        gameloop.render(alpha)
     else:
+        gameloop.render(state.stepper.alpha() if state.adjustdeltatime else 1)
         for object in state.objects:
-            object.render()
             if hasattr(object, "pausefunc"):
                 object.pausefunc()
+        state.newkeys = []
+        state.event_types = []
+    if state.profiler.enabled:
+        state.profiler.count("Particles drawn",state.particleManager.stats()["drawn"])
+        state.profiler.zone("Render")
+        state.profiler.draw()
     #draw HUD
     state.display.blit(state.HUD,(0,0))
     #display
     # state.window.blit(pygame.transform.scale(state.display,(state.displaysize,state.displaysize)),(0,0))
-    state.event_types = []
     if state.menu_button_focus:
         state.menu_button_focus.onHover()
+    if state.profiler.enabled:
+        state.profiler.zone("HUD")
     state.window.blit(state.display,(0,0))
     pygame.display.flip()
     state.clock.tick()
+    if state.profiler.enabled:
+        state.profiler.zone("Flip")
+        state.profiler.end()
@@ -53,14 +53,12 @@ class MenuObj:
         self.graphics = pygame.Surface([self.size[0]*state.scaleamt,self.size[1]*state.scaleamt])
         self.now = 0
         self.last = pygame.time.get_ticks()
-        #add self to list of objects to be rendered
+        #add self to list of objects to be rendered. Menus are loaded into a scene that puts shallower things first
         state.objects.append(self)
-        #re-sort list to ensure things are rendered in the right order
-        state.objects.sort(key = lambda item: item.depth)
 
     def update(self):
         """
-        Updates the menu object, handling hover and click events.
+        Updates the menu object, handling hover and click events and navigation.
         """
         # somewhere I removed the code that removes the main background menu art. this is another revolutionary bandaid fix
         if self.text == "":
@@ -80,8 +78,6 @@ class MenuObj:
                 self.canvas.blit(pygame.transform.scale(self.graphics,[self.size[0]*state.scaleamt,self.size[1]*state.scaleamt]),(0,0))
             else:
                 self.canvas.fill((0,255,0))
-        state.display.blit(self.canvas,((self.pos[0]-state.cam.pos[0])*state.scaleamt,(self.pos[1]-state.cam.pos[1])*state.scaleamt))
-        text = state.font.render(self.text,False,(0,0,90))
 
         # allow traversal through the menus with arrow keys
         if pygame.MOUSEMOTION not in state.event_types:
@@ -102,6 +98,12 @@ class MenuObj:
                     state.menu_button_focus = found_button
                     pygame.mouse.set_pos([(found_button.pos[0] + found_button.size[0]/2)/(state.screensize[0]/800), (found_button.pos[1] + found_button.size[1]/2)/(state.screensize[1]/800)])
 
+    def render(self):
+        """
+        Draws the menu object and its text to the screen.
+        """
+        state.display.blit(self.canvas,((self.pos[0]-state.cam.pos[0])*state.scaleamt,(self.pos[1]-state.cam.pos[1])*state.scaleamt))
+        text = state.font.render(self.text,False,(0,0,90))
         #draw to the canvas
         state.display.blit(text,(((self.pos[0]-state.cam.pos[0])*state.scaleamt+(self.size[0]*state.scaleamt/2)-(text.get_width()*state.scaleamt/2)),((self.pos[1]-state.cam.pos[1])*state.scaleamt+(self.size[1]*state.scaleamt/2)-(text.get_height()*state.scaleamt/2))))
     def onClick(self):
@@ -8,6 +8,9 @@ Purpose: functions for menus in "MathWiz!"
 import json
 import pygame
 import GameData as state
+import spatialhash
+import scene
+import audio
 
 #load a menu as prescribed by the json file
 def loadmenu(menuname):
@@ -18,8 +21,9 @@ def loadmenu(menuname):
     menuname : str
         The name of the menu to load.
     """
-    #clear all objects, resulting in their removal from memory after a while
-    state.objects = []
+    #clear all objects, resulting in their removal from memory after a while. Menus are drawn shallowest first
+    state.objects = scene.scene(descending=False)
+    state.objectgrid = spatialhash.spatialhash(state.tilesize*4)
     state.cam.focus = [state.screensize[0]/2,state.screensize[1]/2]
     state.cam.focusobj = None
     state.menu_button_focus = None
@@ -29,16 +33,15 @@ def loadmenu(menuname):
     for entity in state.menudata[menuname]:
         menu.MenuObj(entity[0],entity[1],entity[2],entity[3],entity[4],entity[5], entity[6])
     if menuname in state.menudata["bgm"].keys():
-        pygame.mixer.music.load(f"Assets\\sounds\\music\\{state.menudata['bgm'][menuname]}.wav")
-        pygame.mixer.music.play(-1)
+        audio.music(state.menudata['bgm'][menuname])
     else:
-        pygame.mixer.music.stop()
+        audio.stopmusic()
     state.clock.tick()
         
 #load a level as prescribed by the json file
 def loadlevel(levelname):
     """
-    Loads a level as prescribed by the JSON file.
+    Loads a level as prescribed by the JSON file. A level played recently is restarted from memory instead.
 
     Parameters:
     levelname : str
@@ -50,14 +53,15 @@ def loadlevel(levelname):
         state.objects = state.objects[1:]
         print(state.objects)
     print(state.objects)"""
-    state.objects = []
+    state.objects = scene.scene()
+    state.objectgrid = spatialhash.spatialhash(state.tilesize*4)
     state.cam.focus = [state.screensize[0]/2,state.screensize[1]/2]
     state.menu_button_focus = None
     state.cam.focusobj = None
     state.cam.locks = []
     #import statement down here to prevent import loop. Perhaps a better way to do this exists?
     import level
-    state.currentlevel = level.level(levelname)
+    state.currentlevel = level.load(levelname)
     state.particleManager.reset()
     #force every character to do a little wait
     for item in state.objects:
@@ -66,10 +70,9 @@ def loadlevel(levelname):
             item.stun = True
             item.actionqueue.append([90,["destun",None],[None,None,None]])
     if hasattr(state.currentlevel,"bgm"):
-        pygame.mixer.music.load(f"Assets\\sounds\\music\\{state.currentlevel.bgm}.wav")
-        pygame.mixer.music.play(-1)
+        audio.music(state.currentlevel.bgm)
     else:
-        pygame.mixer.music.stop()
+        audio.stopmusic()
     state.clock.tick()
 
 #load the cutscene player
@@ -82,11 +85,12 @@ def loadcutscene(scenename):
         The name of the cutscene to load.
     """
     #clear all objects, resulting in their removal from memory after a while
-    state.objects = []
+    state.objects = scene.scene()
+    state.objectgrid = spatialhash.spatialhash(state.tilesize*4)
     state.cam.focus = [state.screensize[0]/2,state.screensize[1]/2]
     state.cam.focusobj = None
     state.cam.locks = []
-    pygame.mixer.music.stop()
+    audio.stopmusic()
     import cutscene
     cutscene.cutscenePlayer(scenename)
     state.clock.tick()
@@ -102,8 +106,8 @@ def search(search_pos):
     # TODO: revamp the function to calculate search distance to buttons rather than cardinal linear searches
     # TODO: potentially move this to menu.py
     menu_buttons = []
-    for obj in state.objects:
-        if type(obj).__name__ == "MenuObj" and obj.text != "":
+    for obj in state.objects.oftype("MenuObj"):
+        if obj.text != "":
             menu_buttons.append(obj)
 
     pixel_step_count = 5
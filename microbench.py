@@ -0,0 +1,293 @@
+"""
+Filename: microbench.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Small, repeatable benchmarks of the inner loops of "MathWiz!", reporting how fast they run and how much memory they allocate
+"""
+import headless
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+import GameData as state
+import level
+import objects
+import particles
+import scene
+import spatialhash
+
+#the tile used for each kind of ground, by its number in tiles.json
+grounds = {"flat":1,"fortyfive":2,"lowtwentytwo":3,"hightwentytwo":4,"slab":5}
+
+#this class stands in for an object in collision checks, with only the points checkobjcollide looks at
+class box:
+    """
+    A class to hold the collision points of a rectangle.
+
+    Attributes:
+    left, right, top, bottom : list
+        The midpoints of each side.
+    """
+    def __init__(self,pos,size):
+        self.left = [pos[0],pos[1]+size[1]//2]
+        self.right = [pos[0]+size[0],pos[1]+size[1]//2]
+        self.top = [pos[0]+size[0]//2,pos[1]]
+        self.bottom = [pos[0]+size[0]//2,pos[1]+size[1]]
+
+def scratchlevel(tiles,animations=()):
+    """
+    Sets up a level with a single layer, built in memory instead of loaded from Leveldata, with nothing in it.
+
+    Parameters:
+    tiles : list
+        The tile numbers, as a list of rows.
+    animations : list
+        The layer's tile animations.
+
+    Returns:
+    level.drawlayer
+        The layer.
+    """
+    state.objects = scene.scene()
+    state.objectgrid = spatialhash.spatialhash(state.tilesize*4)
+    state.cam.focusobj = None
+    state.cam.locks = []
+    state.cam.pos = [0,0]
+    state.chunkcache = level.chunkcache(state.chunkcache.budget)
+    made = level.level.__new__(level.level)
+    made.name = "scratch"
+    made.depths = [0]
+    made.parallaxes = [1]
+    made.loops = [[False,False]]
+    made.tilemap = [tiles]
+    made.flipmap = [[[0]*len(row) for row in tiles]]
+    made.spinmap = [[[0]*len(row) for row in tiles]]
+    made.pallatemap = [[[0]*len(row) for row in tiles]]
+    made.objs = []
+    made.animationlist = [list(animations)]
+    made.layers = []
+    level.drawlayer(made,0)
+    state.level = state.currentlevel = made
+    state.particleManager = particles.ParticleManager()
+    state.particleManager.reset()
+    return made.layers[0]
+
+def ground(tilenum,width=64,height=16):
+    """
+    Sets up a level of open air over a row of one kind of tile, with solid ground beneath.
+
+    Returns:
+    int
+        The top of the row of tiles, in pixels.
+    """
+    tiles = [[0]*width for row in range(height-6)]+[[tilenum]*width]+[[1]*width for row in range(5)]
+    scratchlevel(tiles)
+    return (height-6)*state.tilesize
+
+def makecharacter(pos):
+    """
+    Makes a plain character on the first layer, drawn as MathWiz.
+    """
+    return objects.character(list(pos),0,1,"MathWiz",0,{})
+
+#benchmarks. Each one sets up what it needs, and returns a function doing the work along with how many operations each call does
+
+def pointcollide(kind):
+    top = ground(grounds[kind])
+    mover = makecharacter((0,0))
+    points = [(random.uniform(0,63*state.tilesize),random.uniform(top,top+state.tilesize)) for point in range(1000)]
+    def run():
+        for point in points:
+            mover.pointcollide(point)
+    return run,len(points)
+
+def collide(kind):
+    top = ground(grounds[kind])
+    mover = makecharacter((0,0))
+    spots = [[random.uniform(0,60*state.tilesize),top+random.uniform(0,state.tilesize/2)-mover.size[1]] for spot in range(100)]
+    def run():
+        for spot in spots:
+            mover.pos = list(spot)
+            mover.collide()
+    return run,len(spots)
+
+def checkobjcollide(count):
+    ground(1)
+    mover = makecharacter((2000,500))
+    others = [box((random.uniform(0,8000),random.uniform(0,2000)),(random.randint(60,240),random.randint(60,240))) for other in range(count)]
+    def run():
+        for other in others:
+            mover.checkobjcollide(mover,other)
+    return run,count
+
+def largelayer():
+    """
+    Sets up a 512 by 64 tile layer of mixed tiles, and scrolls the camera along it.
+    """
+    tilenums = [int(tilenum) for tilenum in state.tilesource["tiles"]][:40]
+    layer = scratchlevel([[random.choice(tilenums) for tile in range(512)] for row in range(64)])
+    spots = [[x,y] for y in range(0,layer.height-state.screensize[1],1800) for x in range(0,layer.width-state.screensize[0],900)]
+    return layer,spots
+
+def render(cold):
+    layer,spots = largelayer()
+    place = [0]
+    def run():
+        state.cam.pos = spots[place[0]%len(spots)]
+        place[0] += 1
+        if cold:
+            state.chunkcache.discard(layer)
+        layer.render()
+    #see every part of the layer once first, so warm runs only blit
+    for spot in spots:
+        run()
+    return run,1
+
+def tileupdate():
+    layer,spots = largelayer()
+    layer.render()
+    tilenums = [int(tilenum) for tilenum in state.tilesource["tiles"]][:40]
+    changes = [(random.randrange(16),random.randrange(32),random.choice(tilenums)) for change in range(100)]
+    def run():
+        for row,tile,tilenum in changes:
+            layer.tileupdate(row,tile,state.tilesource["tiles"][str(tilenum)],tilenum,0)
+    return run,len(changes)
+
+def animationupdate(pallate,cached=True):
+    ground(1)
+    mover = makecharacter((500,500))
+    mover.pallate = pallate
+    mover.animname = "Walk"
+    def run():
+        for call in range(100):
+            if not cached:
+                objects.spritecache.clear()
+            mover.animationupdate()
+    return run,100
+
+def updatelayer(count):
+    ground(1)
+    frames = particles.resolveframes([["DieCloud1",0,0,0,5],["DieCloud2",0,0,0,10]])
+    for particle in range(count):
+        state.particleManager.spawn(0,[random.uniform(0,7200),random.uniform(0,1800)],frames,[random.uniform(-5,5),random.uniform(-5,5)],[0,0.1],[20,20],10**9)
+    def run():
+        state.particleManager.updateLayer(0)
+    return run,1
+
+def actionupdate(length):
+    ground(1)
+    mover = makecharacter((500,500))
+    #actions that run every time, and whose pop condition never comes true
+    mover.actionqueue = [[0,["nothing",None],["self","name",None]] for action in range(length)]
+    def run():
+        mover.actionupdate()
+    return run,1
+
+#every benchmark, by name, with what to set it up with
+benchmarks = {}
+for kind in grounds:
+    benchmarks[f"pointcollide {kind}"] = (pointcollide,(kind,))
+for kind in grounds:
+    benchmarks[f"collide {kind}"] = (collide,(kind,))
+benchmarks["checkobjcollide 100"] = (checkobjcollide,(100,))
+benchmarks["checkobjcollide 1000"] = (checkobjcollide,(1000,))
+benchmarks["drawlayer.render warm"] = (render,(False,))
+benchmarks["drawlayer.render cold"] = (render,(True,))
+benchmarks["drawlayer.tileupdate"] = (tileupdate,())
+benchmarks["animationupdate default"] = (animationupdate,("Default",))
+benchmarks["animationupdate pallate"] = (animationupdate,("DivSlice",))
+benchmarks["animationupdate pallate uncached"] = (animationupdate,("DivSlice",False))
+benchmarks["updateLayer 1k particles"] = (updatelayer,(1000,))
+benchmarks["updateLayer 10k particles"] = (updatelayer,(10000,))
+benchmarks["actionupdate 100 actions"] = (actionupdate,(100,))
+benchmarks["actionupdate 1000 actions"] = (actionupdate,(1000,))
+
+def measure(name,seconds=0.2,repeats=5):
+    """
+    Runs a benchmark. It's set up from the same random seed every time, so each run does the same work.
+
+    Parameters:
+    name : str
+        The benchmark to run.
+    seconds : float
+        Roughly how long each timed repeat should take.
+    repeats : int
+        How many timed repeats to run. The fastest one is kept, as it was disturbed the least.
+
+    Returns:
+    dict
+        The operations per second, microseconds per operation, the most memory allocated at once during a call in bytes,
+        and the memory blocks still held afterward per operation.
+    """
+    setup,args = benchmarks[name]
+    random.seed(0)
+    run,size = setup(*args)
+    run()
+    #work out how many calls fill a repeat
+    calls = 1
+    while True:
+        start = perf_counter()
+        for call in range(calls):
+            run()
+        elapsed = perf_counter()-start
+        if elapsed >= seconds or calls >= 2**20:
+            break
+        calls = max(calls*2,int(calls*seconds/max(elapsed,1e-9)))
+    best = elapsed/calls
+    for repeat in range(repeats-1):
+        start = perf_counter()
+        for call in range(calls):
+            run()
+        best = min(best,(perf_counter()-start)/calls)
+    #allocations are measured on their own, as tracing them slows everything down
+    gc.collect()
+    gc.disable()
+    blocks = sys.getallocatedblocks()
+    for call in range(calls):
+        run()
+    retained = sys.getallocatedblocks()-blocks
+    gc.enable()
+    tracemalloc.start()
+    peak = 0
+    for call in range(min(calls,10)):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        run()
+        peak = max(peak,tracemalloc.get_traced_memory()[1]-current)
+    tracemalloc.stop()
+    return {"name":name,
+            "ops":size/best,
+            "us":best*1000000/size,
+            "peakbytes":peak,
+            "retained":retained/(calls*size)}
+
+def report(results):
+    """
+    Prints the results of some benchmarks as a table.
+    """
+    print(f"{'benchmark':<34}{'ops/sec':>14}{'us/op':>10}{'peak B/call':>13}{'blocks/op':>11}")
+    for result in results:
+        print(f"{result['name']:<34}{result['ops']:>14,.0f}{result['us']:>10.3f}{result['peakbytes']:>13,}{result['retained']:>11.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Run small benchmarks of the game's inner loops.")
+    parser.add_argument("names",nargs = "*",help = "only run benchmarks whose names contain one of these")
+    parser.add_argument("--seconds",type = float,default = 0.2,help = "roughly how long each timed repeat takes")
+    parser.add_argument("--repeats",type = int,default = 5,help = "how many timed repeats to take the best of")
+    parser.add_argument("--list",action = "store_true",help = "list the benchmarks and stop")
+    parser.add_argument("--json",action = "store_true",help = "print the results as JSON")
+    args = parser.parse_args()
+    if args.list:
+        print("\n".join(benchmarks))
+        sys.exit()
+    headless.setup(True)
+    names = [name for name in benchmarks if not args.names or any(part in name for part in args.names)]
+    results = [measure(name,args.seconds,args.repeats) for name in names]
+    if args.json:
+        print(json.dumps(results,indent = 4))
+    else:
+        report(results)
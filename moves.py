@@ -8,7 +8,9 @@ Purpose: moves to be used in "MathWiz!"
 import GameData as state
 import pygame
 import menufuncs
-from copy import deepcopy
+import behaviours
+import particles
+import audio
 #set vertical velocity to the jumpspeed
 def jump(caller, height):
     """
@@ -21,7 +23,7 @@ def jump(caller, height):
         The height of the jump.
     """
     caller.speed[1] = -height
-    state.jump_sound.play()
+    audio.play("jump_sound")
     caller.grounded = False
             
 def jumpstall(caller,height):
@@ -201,8 +203,7 @@ def setbgm(caller,name):
     name : string
         Name of the track to play.
     """
-    pygame.mixer.music.load(f"Assets\\sounds\\music\\{name}.wav")
-    pygame.mixer.music.play(-1)
+    audio.music(name)
 
 def playSound(caller,name):
     """
@@ -214,8 +215,7 @@ def playSound(caller,name):
     name : string
         Name of the track to play.
     """
-    sound = pygame.mixer.Sound(f"Assets\\sounds\\sfx\\{name}.wav")
-    sound.play()
+    audio.playfile(name)
 
 def loadnextstate(caller,data):
     """
@@ -287,7 +287,7 @@ def stun(caller,data):
     if not caller.stun:
         tempPallate(caller,"Stun")
         caller.stun = True
-        state.hit_sound.play()
+        audio.play("hit_sound")
 
 def split(caller,num):
     """
@@ -425,7 +425,7 @@ def nothing(caller, nothing):
 
 def levelStart(caller,Burner):
     if type(caller).__name__ == "Player":
-        state.HUD.blit(state.font.render(f"Get Ready",False,[255,255,255],[0,0,0]),(1800*state.scaleamt,1800*state.scaleamt))
+        caller.message = "Get Ready"
 
 def particleSpawn(caller,data):
     #when inserting particles using this function, format thusly:
@@ -439,16 +439,7 @@ def particleSpawn(caller,data):
         Max Speed,
         Lifespan
     ]"""
-    fullparticles = []
-    for frame in range(len(data[1])):
-        fullparticles.append([])
-        if data[1][frame][0] in state.particlesource["Graphics"].keys():
-            particleinfo = deepcopy(state.particlesource["Graphics"][data[1][frame][0]])
-        else:
-            particleinfo = [1203,620,120,101]
-        particleinfo.extend(data[1][frame][1:])
-        fullparticles[frame] = particleinfo
-    state.particleManager.particles[caller.layer].append(deepcopy([data[0],fullparticles,data[2],data[3],data[4],0,0,data[5]]))
+    state.particleManager.spawn(caller.layer,data[0],particles.resolveframes(data[1]),data[2],data[3],data[4],data[5])
 
 def timeslowset(caller,amt):
     state.timeslow = amt
@@ -479,7 +470,7 @@ def weapDefault(caller,Burner):
         Placeholder parameter.
     """
     caller.shoottimer = 30
-    state.basic_shot_sound.play()
+    audio.play("basic_shot_sound")
     caller.actionqueue.append([5,["firebullet",[[120*caller.direction,120],caller.depth,caller.parallax,"Bustershot",caller.layer,{"parent":caller}]],[None,None,True]])
 
 def weapDivSlice(caller,Burner):
@@ -507,7 +498,7 @@ def weapMMissile(caller,Burner):
     """
     #caller.actionqueue.append([0,["jump",10],["keys",pygame.K_f,False]])caller.shoottimer = 30
     caller.shoottimer = 30
-    state.flaming_shot_sound.play()
+    audio.play("flaming_shot_sound")
     caller.actionqueue.append([5,["firebullet",[[120,0],caller.depth,caller.parallax,"Missile",caller.layer,{"parent":caller}]],[None,None,True]])
 
 def weapdirtycheaterpower(caller,Burner):
@@ -539,7 +530,7 @@ def dieDefault(caller,Burner):
         child.delete()
     camunlock(caller,Burner)
     caller.delete()
-    state.enemy_defeat_sound.play()
+    audio.play("enemy_defeat_sound")
 
 def diePlayer(caller,Burner):
     """
@@ -551,7 +542,7 @@ def diePlayer(caller,Burner):
     Burner : any
         Placeholder parameter.
     """
-    pygame.mixer.music.stop()
+    audio.stopmusic()
     caller.actionqueue = [[120,["loadnextstate",["level",state.level.name]],[None,None,True]],
                           [30,["stun",None],[None,None,True]],
                           [0,["playSound","gameover"],[None,None,None]]]
@@ -570,12 +561,12 @@ def dieBoss(caller,Burner):
     Burner : any
         Placeholder parameter.
     """
-    pygame.mixer.music.stop()
+    audio.stopmusic()
     caller.actionqueue = [[0,["jump",50],[None,None,True]],
                           [0,["timeslowset",4],[None,None,True]],
                           [60,["timeslowset",1],[None,None,True]],
                           [30,["playSound","Win"],[None,None,None]]]
-    caller.behavior = state.aisource["BossWait"]
+    caller.behavior = behaviours.getprogram("BossWait")
 
     if caller.target != None:
         caller.target.stun = True
@@ -594,16 +585,7 @@ def dieEnemy(caller,Burner):
     Burner : any
         Placeholder parameter.
     """
-    particleSpawn(caller,[caller.pos,
-                      [["DieCloud1",0,0,0,5],
-                       ["DieCloud2",0,0,0,10],
-                       ["DieCloud3",0,0,0,15],
-                       ["DieCloud4",0,0,0,5],
-                       ["DieCloud5",0,0,0,5],
-                       ["DieCloud6",0,0,0,5],
-                       ["DieCloud7",0,0,0,10],
-                       ["DieCloud8",0,0,0,15]],
-                      [0,0],[0,0],[0,0],70])
+    state.particleManager.emit("DieCloud",caller)
     for child in caller.children:
         child.delete()
     camunlock(caller,Burner)
@@ -615,32 +597,9 @@ def diePlat(caller,particlename):
     Parameters:
     caller : object
         The object calling the function.
-    Burner : any
-        Placeholder parameter.
+    particlename : str
+        The particle emitter the platform breaks into.
     """
-    particleSpawn(caller,[[caller.left[0],caller.top[1]],
-                      [[particlename,0,0,0,10],
-                       [particlename,0,0,90,10],
-                       [particlename,0,0,180,10],
-                       [particlename,0,0,270,10]],
-                      [-10,-10],[0,20],[50,100],60])
-    particleSpawn(caller,[[caller.left[0],caller.bottom[1]],
-                      [[particlename,0,0,0,10],
-                       [particlename,0,0,90,10],
-                       [particlename,0,0,180,10],
-                       [particlename,0,0,270,10]],
-                      [-5,-10],[0,20],[50,100],60])
-    particleSpawn(caller,[[caller.right[0],caller.top[1]],
-                      [[particlename,0,0,0,10],
-                       [particlename,0,0,90,10],
-                       [particlename,0,0,180,10],
-                       [particlename,0,0,270,10]],
-                      [10,-10],[0,20],[50,100],60])
-    particleSpawn(caller,[[caller.right[0],caller.bottom[1]],
-                      [[particlename,0,0,0,10],
-                       [particlename,0,0,90,10],
-                       [particlename,0,0,180,10],
-                       [particlename,0,0,270,10]],
-                      [5,-10],[0,20],[50,100],60])
+    state.particleManager.emit(particlename,caller)
     camunlock(caller,None)
     caller.delete()
@@ -16,6 +16,55 @@ import GameData as state
 import tilecollisions
 import moves
 import animHandlers
+import pallates
+import spatialhash
+import behaviours
+import scheduler
+import effects
+
+#graphics for animation frames that have already been drawn, shared between every character
+spritecache = {}
+def getsprite(infoname,framename,flipx,flipy,rotation,pallate,mirror=False):
+    """
+    Fetches the graphic for an animation frame, drawing it first if it hasn't been drawn yet.
+
+    Parameters:
+    infoname : str
+        The name of the entity info the frame belongs to.
+    framename : str
+        The name of the frame.
+    flipx : bool
+        Whether the frame is flipped horizontally.
+    flipy : bool
+        Whether the frame is flipped vertically.
+    rotation : int
+        The number of degrees to rotate the frame by.
+    pallate : str
+        The name of the pallate to draw the frame in.
+    mirror : bool
+        Whether to mirror the finished frame, for characters that are facing the other way.
+
+    Returns:
+    pygame.Surface
+        The finished frame. It is shared between characters, so it should not be drawn on.
+    """
+    sprites = spritecache.setdefault(state.scaleamt,{})
+    key = (infoname,framename,flipx,flipy,rotation,pallate,mirror)
+    if key not in sprites:
+        if mirror:
+            sprites[key] = pygame.transform.flip(getsprite(infoname,framename,flipx,flipy,rotation,pallate),True,False)
+        else:
+            frame = state.infosource[infoname]["Frames"][framename]
+            sprite = pygame.Surface([frame[2]*state.scaleamt,frame[3]*state.scaleamt])
+            sprite.set_colorkey(state.invis)
+            sprite.fill(state.invis)
+            sprite.blit(state.spritesheet, [frame[4]*state.scaleamt,frame[5]*state.scaleamt],([frame[0]*state.scaleamt,frame[1]*state.scaleamt,frame[2]*state.scaleamt,frame[3]*state.scaleamt]))
+            sprite = pygame.transform.rotate(pygame.transform.flip(sprite,flipx,flipy),rotation)
+            #get the sprite drawn with the correct palatte
+            if pallate != "Default":
+                pallates.recolor(sprite,state.infosource[infoname]["Pallates"]["Default"],state.infosource[infoname]["Pallates"][pallate])
+            sprites[key] = sprite
+    return sprites[key]
 
 #basic class to build other objects onto
 class gameObject:
@@ -65,10 +114,33 @@ class gameObject:
         self.layer = layer
         self.speed = [0,0]
         self.nextspeedadj = [0,0]
-        #add to list of objects that are updated every frame
+        #add to list of objects that are updated every frame. It keeps itself in the correct order for rendering
         state.objects.append(self)
-        #resort list to ensure objects are rendered in the correct order
-        state.objects.sort(key = lambda item: item.depth, reverse = True)
+        #objects are also kept in a grid, so collisions only have to be checked against things nearby
+        if not hasattr(state,"objectgrid"):
+            state.objectgrid = spatialhash.spatialhash()
+        state.objectgrid.add(self)
+
+    #the object list indexes objects by layer and allegience, so it has to be told when they change
+    @property
+    def layer(self):
+        return self._layer
+
+    @layer.setter
+    def layer(self,value):
+        if hasattr(self,"_layer"):
+            state.objects.reindex(self,state.objects.layers,self._layer,value)
+        self._layer = value
+
+    @property
+    def allegience(self):
+        return self._allegience
+
+    @allegience.setter
+    def allegience(self,value):
+        #most objects are only given an allegience after they're added to the object list, so the first one set is indexed here too
+        state.objects.reindex(self,state.objects.allegiences,getattr(self,"_allegience",None),value)
+        self._allegience = value
 
     #check collisions between two game objects
     def checkobjcollide(self,obj1,obj2):
@@ -93,6 +165,7 @@ class gameObject:
         """
         Removes the game object from the object list.
         """
+        state.objectgrid.remove(self)
         try:
             state.objects.remove(self)
             if state.cam.focusobj == self:
@@ -111,6 +184,7 @@ class gameObject:
         self.right = [self.pos[0]+self.size[0],int(self.pos[1]+self.size[1]/2)]
         self.top = [int(self.pos[0]+self.size[0]/2),self.pos[1]]
         self.bottom = [int(self.pos[0]+self.size[0]/2),self.pos[1]+self.size[1]]
+        state.objectgrid.move(self)
 
 #slightly less basic class to build characters on--players, enemies, moving platforms, bosses, etc.
 class character(gameObject):
@@ -150,8 +224,20 @@ class character(gameObject):
         The size of the character.
     sprite : pygame.Surface
         The surface to display the character's sprite.
-    colorbrush : pygame.Surface
-        The surface to apply color changes to the character's sprite.
+    spritekey : tuple
+        The key of the shared frame graphic in use, or None if the sprite is the character's own.
+    running : behaviours.program
+        The compiled behaviour the character is running, or None.
+    timers : list
+        The start delay and pop timer of each action in the running behaviour.
+    live : list
+        The actions in the running behaviour that haven't been popped yet.
+    delayed : scheduler.scheduler
+        The actions in the queue that are waiting on a delay.
+    effects : dict
+        The effects playing on the character, as (timeline, time started) keyed by name.
+    effectpallate : str
+        The pallate the effects have put on the character, or None.
     """
     def __init__(self,locus,depth,parallax,name, layer, extras):
         """
@@ -184,10 +270,12 @@ class character(gameObject):
         self.size = self.info["Sizes"]["Default"]
         #sprite used to show player. Replace these calls with animation frame draws
         self.sprite = pygame.Surface([self.size[0]*state.scaleamt,self.size[1]*state.scaleamt])
-        self.colorbrush = pygame.Surface([self.size[0]*state.scaleamt,self.size[1]*state.scaleamt])
         self.sprite.set_colorkey(state.invis)
+        self.spritekey = None
         self.pallate = "Default"
         self.storepal = None
+        self.effects = {}
+        self.effectpallate = None
         #stuff for animation
         self.shoottimer = 0
         self.animname = "Idle"
@@ -217,6 +305,56 @@ class character(gameObject):
             self.shotLimits = {}
         self.bulletCounts = {weapon: 0 for weapon in self.shotLimits}
 
+    #setting the action queue throws out the running behaviour and any delayed actions along with the old actions, as it would if they were all in the queue
+    @property
+    def actionqueue(self):
+        return self._actionqueue
+
+    @actionqueue.setter
+    def actionqueue(self,value):
+        if hasattr(self,"delayed"):
+            self.delayed.clear()
+        else:
+            self.delayed = scheduler.scheduler()
+        self._actionqueue = scheduler.actionlist(value,self.delayed)
+        self.running = None
+        self.live = ()
+
+    def idle(self):
+        """
+        Checks whether the character has nothing left to do: no actions, delayed actions, or running behaviour.
+        """
+        return self.actionqueue == [] and len(self.delayed) == 0 and self.running == None
+
+    def playeffect(self,name):
+        """
+        Starts an effect from effects.json playing on the character, restarting it if it was already playing.
+        Effects run on the same clock as delayed actions.
+
+        Parameters:
+        name : str
+            The name of the effect.
+        """
+        self.effects[name] = (effects.gettimeline(name),self.delayed.time)
+
+    def effectupdate(self):
+        """
+        Works out what the playing effects show right now, and swaps the pallate only when that changes.
+        """
+        show = None
+        for name,(timeline,start) in list(self.effects.items()):
+            elapsed = self.delayed.time-start
+            if elapsed >= timeline.length:
+                del self.effects[name]
+            elif show == None:
+                show = timeline.pallate(elapsed)
+        if show != self.effectpallate:
+            if self.effectpallate != None:
+                moves.deTempPallate(self,None)
+            if show != None:
+                moves.tempPallate(self,show)
+            self.effectpallate = show
+
     #run every frame to update the character's logic    
     def update(self):
         """
@@ -243,7 +381,6 @@ class character(gameObject):
                 self.objcollide()
             self.objcollide()
             self.collide()
-            self.render()
         self.actionupdate()
         for item in self.children:
             item.pos[0] = item.pos[0]+(self.pos[0]-self.lastpos[0])
@@ -257,10 +394,17 @@ class character(gameObject):
         Updates the actions in the action queue.
 
         This method iterates through each action in the action queue and performs the following steps:
-        If the action's start timer is greater than zero, it decrements the timer by the state's delta time.
-        If the start timer is zero or less, it executes the action using the corresponding method from the `moves` module.
+        Delayed actions that have come due are added to the end of the queue first, and the scheduler's clock moves on at the end.
+        Each action is executed using the corresponding method from the `moves` module.
         Checks the action's pop condition and removes the action from the queue if the condition is met.
-        """
+        Any running behaviour is done first, as its actions were in the queue before anything added since it started.
+        """
+        for action in self.delayed.due():
+            self.actionqueue.append(action)
+        if self.effects or self.effectpallate != None:
+            self.effectupdate()
+        if self.running != None:
+            self.running.run(self)
         #iterate through every action in the queue.
         actionnum = 0
         while actionnum < len(self.actionqueue):
@@ -296,6 +440,7 @@ class character(gameObject):
                     case _:
                         self.actionqueue.remove(action)
                         actionnum -= 1
+        self.delayed.advance(state.deltatime)
 
     def kill(self):
         """
@@ -317,15 +462,13 @@ class character(gameObject):
         """
         Updates the animation state of the sprite.
         This method updates the current frame of the animation based on the elapsed time,
-        handles the looping of the animation, and applies transformations such as flipping
-        and rotating the sprite. It also updates the sprite's palette if a non-default palette
-        is needed.
+        handles the looping of the animation, and picks up the shared graphic for the frame
+        with the right flips, rotation and palette.
         """
         if self.shoottimer > 0:
             self.shoottimer -= state.deltatime
         else:
             self.shoottimer = 0
-        self.sprite.fill(state.invis)
         self.animtime += state.deltatime
         anim = self.info["Animations"][self.animname]
         if anim != []:
@@ -338,31 +481,17 @@ class character(gameObject):
             #draw the sprite
             frame = self.info["Frames"][anim[self.animframe][0]]
             center = frame[6:]
-            #adjust the size of the canvas if the sprite size is different.
+            #adjust the size of the character if the sprite size is different.
             if self.size != frame[2:4]:
                 self.size = frame[2:4]
-                self.sprite = pygame.Surface([self.size[0]*state.scaleamt,self.size[1]*state.scaleamt])
-                self.colorbrush = pygame.Surface([self.size[0]*state.scaleamt,self.size[1]*state.scaleamt])
-                self.sprite.set_colorkey(state.invis)
-                self.sprite.fill(state.invis)
                 #also, adjust position to match around a center point.
                 self.pos[0] += self.lastframe[6]-center[0]
                 if self.grounded:
                     self.pos[1] += self.lastframe[3]-self.size[1]
                 else:
                     self.pos[1] += self.lastframe[7]-center[1]
-            self.sprite.blit(state.spritesheet, [frame[4]*state.scaleamt,frame[5]*state.scaleamt],([frame[0]*state.scaleamt,frame[1]*state.scaleamt,frame[2]*state.scaleamt,frame[3]*state.scaleamt]))
-            self.sprite = pygame.transform.rotate(pygame.transform.flip(self.sprite,anim[self.animframe][1][0],anim[self.animframe][1][1]),anim[self.animframe][2])
-            #pygame.draw.rect(self.sprite,(255,255,255),(0,center[1],240,10))
-            #get the sprite drawn with the correct palatte
-            #optimize this later
-            if self.pallate != "Default":
-                for color in range(len(state.infosource[self.infoname]["Pallates"][self.pallate])):
-                    self.colorbrush.fill(state.infosource[self.infoname]["Pallates"][self.pallate][color])
-                    self.sprite.set_colorkey(state.infosource[self.infoname]["Pallates"]["Default"][color])
-                    self.colorbrush.blit(self.sprite,(0,0))
-                    self.sprite.blit(self.colorbrush,(0,0))
-                self.sprite.set_colorkey(state.invis)
+            self.spritekey = (self.infoname,anim[self.animframe][0],anim[self.animframe][1][0],anim[self.animframe][1][1],anim[self.animframe][2],self.pallate)
+            self.sprite = getsprite(*self.spritekey)
             self.lastframe = frame
             
     #calcualte the points to use in collision detection
@@ -380,6 +509,7 @@ class character(gameObject):
         self.right = [self.pos[0]+self.size[0],int(self.pos[1]+self.size[1]/2)]
         self.top = [int(self.pos[0]+self.size[0]/2),self.pos[1]]
         self.bottom = [int(self.pos[0]+self.size[0]/2),self.pos[1]+self.size[1]]
+        state.objectgrid.move(self)
 
     #check if a point is colliding with the ground. Add logic for moving platforms later
     def pointcollide(self, point):
@@ -392,62 +522,105 @@ class character(gameObject):
         Returns:
             bool: True if the point collides with a solid object, otherwise False.
         """
-        #find layers to do collision on:
-        for item in state.objects:
-            if type(item).__name__ == "drawlayer" and item.layernum == self.layer:
-                #get the tile that the point is positioned on
-                tile = [int(point[0]//state.tilesize),int(point[1]//state.tilesize)]
-                #get values from said tile
-                #UNLESS the layer is supposed to loop--THEN simply loop the information from the list
-                if item.loop[0] == True:
-                    tile[0] = tile[0]%(item.longest)
-                    tile[1] = tile[1]%(len(state.level.tilemap[item.layernum]))
-                #unless it doesn't exist. Then, treat it as if it were solid to prevent out-of-bounds errors
-                if (tile[0] < 0 or tile[1] < 0) or (tile[0] >= item.longest or tile[1] >= len(state.level.tilemap[item.layernum])):
-                    tiletype = 1
-                    tileflip = 0
-                    tilerotate = 0
-                else:
-                    tiletype = state.level.tilemap[item.layernum][tile[1]][tile[0]]
-                    tileflip = state.level.flipmap[item.layernum][tile[1]][tile[0]]
-                    tilerotate = state.level.spinmap[item.layernum][tile[1]][tile[0]]
-                #calculate the position of the point within the tile
-                x=point[0]%state.tilesize
-                y=point[1]%state.tilesize
-
-                #treat the coordinates differently if the tile is flipped and/or rotated
-                if tileflip == 1:
-                    x = state.tilesize - x
-                elif tileflip == 2:
-                    x = state.tilesize - x
-                    y = state.tilesize - y
-                elif tileflip == 3:
-                    y = state.tilesize - y
-
-                if tilerotate == 1:
-                    burner = y
-                    y = x
-                    x = state.tilesize - burner
-                elif tilerotate == 2:
-                    x = state.tilesize - x
-                    y = state.tilesize - y
-                elif tilerotate == 3:
-                    burner = x
-                    x = y
-                    y = state.tilesize - burner
-                #get the results of the appropriate block collision equation
-                if state.tilesource["tiles"][str(tiletype)][5] == 1:
-                    return tilecollisions.solid((x,y))
-                elif state.tilesource["tiles"][str(tiletype)][5] == 2:
-                    return tilecollisions.fortyfive((x,y))
-                elif state.tilesource["tiles"][str(tiletype)][5] == 3:
-                    return tilecollisions.lowtwentytwo((x,y))
-                elif state.tilesource["tiles"][str(tiletype)][5] == 4:
-                    return tilecollisions.hightwentytwo((x,y))
-                elif state.tilesource["tiles"][str(tiletype)][5] == 5:
-                    return tilecollisions.slab((x,y))
+        code = self.pointcode(point)
+        if code == None:
+            return None
+        #empty and solid tiles don't need the point's position within the tile
+        if code < 2:
+            return code == 1
+        #get the results of the appropriate block collision equation, using the position of the point within the tile
+        return tilecollisions.codecollide(code,point[0]%state.tilesize,point[1]%state.tilesize)
+
+    def pointcode(self, point):
+        """
+        Gets the collision code of the tile a point is on, handling looping layers and out-of-bounds tiles.
+
+        Parameters:
+        point : list
+            The (x, y) coordinates of the point.
+
+        Returns:
+        int
+            The collision code of the tile, or None if the character's layer doesn't exist.
+        """
+        #find the layer to do collision on
+        if not 0 <= self.layer < len(state.level.layers):
+            return None
+        item = state.level.layers[self.layer]
+        #get the tile that the point is positioned on
+        tile = [int(point[0]//state.tilesize),int(point[1]//state.tilesize)]
+        #get values from said tile
+        #UNLESS the layer is supposed to loop--THEN simply loop the information from the list
+        if item.loop[0] == True:
+            tile[0] = tile[0]%(item.longest)
+            tile[1] = tile[1]%(item.tallest)
+        #unless it doesn't exist. Then, treat it as if it were solid to prevent out-of-bounds errors
+        if (tile[0] < 0 or tile[1] < 0) or (tile[0] >= item.longest or tile[1] >= item.tallest):
+            return 1
+        return item.collisionmap[tile[1]][tile[0]]
+
+    def probe(self, point, axis, step, limit, collides):
+        """
+        Finds how far a point has to be moved, a pixel at a time, before pointcollide gives the wanted result.
+        Rather than testing every pixel, this goes a tile at a time. Empty and solid tiles are passed over whole, and since the solid
+        part of a sloped tile is always on one side of a straight edge, the result can only change once within it, so the edge is found by halving.
+
+        Parameters:
+        point : list
+            The point to start from.
+        axis : int
+            0 to move the point horizontally, 1 to move it vertically.
+        step : int
+            1 to move the point right/down, -1 to move it left/up.
+        limit : int
+            The furthest to move the point.
+        collides : bool
+            Whether to look for the first distance that collides, or the first that doesn't.
+
+        Returns:
+        int
+            The distance, from 1 up to the limit, or None if it wasn't found.
+        """
+        point = list(point)
+        start = point[axis]
+        limit = math.floor(limit)
+        dist = 1
+        while dist <= limit:
+            point[axis] = start+step*dist
+            #find how many more pixels the point can move before it leaves this tile
+            tilestart = (point[axis]//state.tilesize)*state.tilesize
+            if step > 0:
+                room = math.ceil(tilestart+state.tilesize-point[axis])-1
+            else:
+                room = math.floor(point[axis]-tilestart)
+            room = min(room,limit-dist)
+            code = self.pointcode(point)
+            #a missing layer never collides
+            if code == None:
+                code = 0
+            if code < 2:
+                if (code == 1) == collides:
+                    return dist
+                dist += room+1
+                continue
+            if self.pointcollide(point) == collides:
+                return dist
+            point[axis] = start+step*(dist+room)
+            if self.pointcollide(point) != collides:
+                dist += room+1
+                continue
+            #the edge is somewhere between the two ends. low never gives the wanted result, high always does
+            low = dist
+            high = dist+room
+            while high-low > 1:
+                middle = (low+high)//2
+                point[axis] = start+step*middle
+                if self.pointcollide(point) == collides:
+                    high = middle
                 else:
-                    return False
+                    low = middle
+            return high
+        return None
 
     #calculate physics for the object
     def physics(self):
@@ -546,15 +719,11 @@ class character(gameObject):
         """
         #this check is exclusive to the bottom point. If the distance to the ground is less than the current forwards momentum, snap player to the ground.
         if (not self.grounded) and type(self) == Player:
-            dist = 1
-            while dist <= abs(self.bottom[0] - self.lastbottom[0]):
-                if self.pointcollide([self.bottom[0],self.bottom[1]+dist]) != True:
-                    dist += 1
-                else:
-                    self.pos[1] += dist
-                    self.grounded = True
-                    self.getpoints()
-                    break
+            dist = self.probe(self.bottom,1,1,abs(self.bottom[0] - self.lastbottom[0]),True)
+            if dist != None:
+                self.pos[1] += dist
+                self.grounded = True
+                self.getpoints()
                 
     #check for collisions on all four points. if a collision is found, find how far the point is into the ground and move it so that it is only 1px of less deep.  
     def collide(self):
@@ -565,55 +734,42 @@ class character(gameObject):
         If the top point is blocked, the character is considered to be bumping into a ceiling. The character's position is adjusted downwards until it is no longer colliding with the ceiling.
         If the left point is blocked, the character is considered to be pressing against a wall on the left side. The character's position is adjusted to the right until it is no longer colliding with the wall.
         If the right point is blocked, the character is considered to be pressing against a wall on the right side. The character's position is adjusted to the left until it is no longer colliding with the wall.
-        The method uses a maximum distance of 600 units to adjust the character's position in each direction.
+        The method uses a maximum distance of 600 units to adjust the character's position in each direction. The distances are found with probe, a tile at a time.
         """
         self.getpoints()
         #if the left or right points are blocked, the character is pressing against a wall on that side
         #if the bottom point is blocked, the player is on the ground
         self.grounded = self.pointcollide([self.bottom[0],self.bottom[1]])
         if self.grounded:
-            dist = 1
-            while dist <= 600:
-                if self.pointcollide([self.bottom[0],self.bottom[1]-dist]) == True:
-                    dist += 1
-                else:
-                    self.pos[1] -= dist-1
-                    self.getpoints()
-                    break
+            dist = self.probe(self.bottom,1,-1,600,False)
+            if dist != None:
+                self.pos[1] -= dist-1
+                self.getpoints()
 
         #if the top point is blocked, the character is bumping into a ceiling
         self.getpoints()
         self.topblock =  self.pointcollide(self.top)
         if self.topblock:
-            dist = 1
-            while dist <= 600:
-                if not self.pointcollide([self.top[0],self.top[1]+dist]):
-                    self.pos[1]+=dist-1
-                    self.getpoints()
-                    break
-                dist += 1
+            dist = self.probe(self.top,1,1,600,False)
+            if dist != None:
+                self.pos[1]+=dist-1
+                self.getpoints()
         #if the left or right points are blocked, the character is pressing against a wall on that side
         self.getpoints()
         self.leftblock =  self.pointcollide(self.left)
         if self.leftblock:
-            dist = 1
-            while dist <= 600:
-                if not self.pointcollide([self.left[0]+dist,self.left[1]]):
-                    self.pos[0]+=dist-1
-                    self.getpoints()
-                    break
-                dist += 1
+            dist = self.probe(self.left,0,1,600,False)
+            if dist != None:
+                self.pos[0]+=dist-1
+                self.getpoints()
                 
         self.getpoints()
         self.rightblock =  self.pointcollide(self.right)
         if self.rightblock:
-            dist = 1
-            while dist <= 600:
-                if not self.pointcollide([self.right[0]-dist,self.right[1]]):
-                    self.pos[0]-=dist-1
-                    self.getpoints()
-                    break
-                dist += 1
+            dist = self.probe(self.right,0,-1,600,False)
+            if dist != None:
+                self.pos[0]-=dist-1
+                self.getpoints()
             
     def objcollide(self):
         """
@@ -621,9 +777,10 @@ class character(gameObject):
         Returns:
             None
         """
-        if self in state. objects:
-            for thing in state.objects:
-                if type(thing).__name__ != "drawlayer" and thing != self and thing.layer == self.layer:
+        if self in state.objectgrid:
+            for thing in state.objectgrid.nearby(self,self.layer):
+                #skip anything removed by an earlier collision
+                if thing != self and thing in state.objectgrid:
                     if self.checkobjcollide(self,thing):
                         thing.collidefunction(self)
     
@@ -646,9 +803,13 @@ class character(gameObject):
         """
         parallaxmod = self.parallax - state.cam.depth
         if self.direction == 1:
-            state.display.blit(self.sprite,[(self.pos[0]-state.cam.pos[0]*parallaxmod)*state.scaleamt,(self.pos[1]-state.cam.pos[1]*parallaxmod)*state.scaleamt])
+            sprite = self.sprite
+        #shared frames keep their mirrored version around, so it only gets made once
+        elif self.spritekey != None:
+            sprite = getsprite(*self.spritekey,True)
         else:
-            state.display.blit(pygame.transform.flip(self.sprite,True,False),[(self.pos[0]-state.cam.pos[0]*parallaxmod)*state.scaleamt,(self.pos[1]-state.cam.pos[1]*parallaxmod)*state.scaleamt])
+            sprite = pygame.transform.flip(self.sprite,True,False)
+        state.display.blit(sprite,[(self.pos[0]-state.cam.pos[0]*parallaxmod)*state.scaleamt,(self.pos[1]-state.cam.pos[1]*parallaxmod)*state.scaleamt])
 
 class spawner(gameObject):
     """
@@ -689,19 +850,19 @@ class spawner(gameObject):
 
     def render(self):
         """
-        Renders the spawner on the screen.
+        Renders the spawner on the screen. Spawners are only shown in the editor.
         """
-        parallaxmod = self.parallax - state.cam.depth
-        pygame.draw.rect(state.display,(255,255,0),((self.pos[0]-state.cam.pos[0]*parallaxmod)*state.scaleamt,(self.pos[1]-state.cam.pos[1]*parallaxmod)*state.scaleamt,20*state.scaleamt,20*state.scaleamt))
+        if state.gamemode == "edit":
+            parallaxmod = self.parallax - state.cam.depth
+            pygame.draw.rect(state.display,(255,255,0),((self.pos[0]-state.cam.pos[0]*parallaxmod)*state.scaleamt,(self.pos[1]-state.cam.pos[1]*parallaxmod)*state.scaleamt,20*state.scaleamt,20*state.scaleamt))
         
     def update(self):
         """
         Updates the spawner, checking for spawn and delete conditions.
         """
         #super().update()
-        for item in self.spawnedobjs:
-            if item not in state.objects:
-                self.spawnedobjs.remove(item)
+        #forget anything that has been removed. Removing from the list while looping through it would skip things, so build a new one
+        self.spawnedobjs = [item for item in self.spawnedobjs if item in state.objects]
         self.spawncheck()
         self.deletecheck()
 
@@ -746,7 +907,8 @@ class spawner(gameObject):
                     item[3] = self.depth
                 if item[4] == "parent":
                     item[4] = self.parallax
-                self.spawnedobjs.append(globals()[item[0]]([item[2][0]+self.pos[0],item[2][1]+self.pos[1]],item[3],item[4],item[1],item[5]))
+                #spawned objects go on the spawner's layer, and each gets its own copy of its extras
+                self.spawnedobjs.append(globals()[item[0]]([item[2][0]+self.pos[0],item[2][1]+self.pos[1]],item[3],item[4],item[1],self.layer,dict(item[5])))
 
 class Sign(character):
     """
@@ -755,6 +917,8 @@ class Sign(character):
     Attributes:
     text: str
         The text displayed on the sign.
+    textsprite: pygame.Surface
+        The rendered text, drawn over the sign's sprite.
     """
     def __init__(self,locus,depth,parallax,name, layer, extras):
         """
@@ -765,15 +929,28 @@ class Sign(character):
             self.text = extras["text"]
         else:
             self.text = "TEST"
+        self.textsprite = None
         #self.sprite.fill((100,100,0))
 
     def update(self):
         """
-        Updates the sign, including its animation and text rendering.
+        Updates the sign, including its animation.
         """
         super().update()
         self.animationupdate()
-        self.sprite.blit(state.font.render(self.text,False,(255,255,180)),(40*state.scaleamt,40*state.scaleamt))
+
+    def render(self):
+        """
+        Renders the sign, with its text drawn over the sprite.
+        The sprite is shared with other characters, so the text can't be drawn onto it directly.
+        """
+        super().render()
+        if self.textsprite == None:
+            self.textsprite = state.font.render(self.text,False,(255,255,180))
+        parallaxmod = self.parallax - state.cam.depth
+        #line the text up with the sprite's pixels and keep it inside the sign, as if it were drawn on the sprite
+        spot = [int((self.pos[0]-state.cam.pos[0]*parallaxmod)*state.scaleamt),int((self.pos[1]-state.cam.pos[1]*parallaxmod)*state.scaleamt)]
+        state.display.blit(self.textsprite,[spot[0]+int(40*state.scaleamt),spot[1]+int(40*state.scaleamt)],(0,0,self.sprite.get_width()-int(40*state.scaleamt),self.sprite.get_height()-int(40*state.scaleamt)))
     
         
 class Platform(character):
@@ -898,6 +1075,7 @@ class Hitbox(gameObject):
         self.right = [self.pos[0]+self.size[0],int(self.pos[1]+self.size[1]/2)]
         self.top = [int(self.pos[0]+self.size[0]/2),self.pos[1]]
         self.bottom = [int(self.pos[0]+self.size[0]/2),self.pos[1]+self.size[1]]
+        state.objectgrid.move(self)
     def update(self):
         """
         Updates the hitbox, including its position and lifespan.
@@ -913,7 +1091,6 @@ class Hitbox(gameObject):
         elif self.parent.direction == -1:
             self.pos[0] = self.parent.pos[0]-(self.offset[0])
         self.getpoints()
-        self.render()
 
     def render(self):
         """
@@ -976,7 +1153,10 @@ class collectGoal(character):
         Initializes the collectible goal with the given parameters.
         """
         super().__init__(locus,depth,parallax,name, layer, extras)
+        #the goal gets its own plain sprite rather than a shared frame
+        self.sprite = pygame.Surface(self.sprite.get_size())
         self.sprite.fill((0,0,100))
+        self.spritekey = None
         self.gotten = False
     def collidefunction(self,trigger):
         """
@@ -1058,7 +1238,6 @@ class Projectile(character):
                 self.objcollide()
             self.objcollide()
             self.collide()
-            self.render()
         self.actionupdate()
         for item in self.children:
             item.pos[0] = item.pos[0]+(self.pos[0]-self.lastpos[0])
@@ -1108,6 +1287,8 @@ class Player(character):
         The health of the player.
     allegience: str
         The allegiance of the player.
+    message: str
+        Text to show on the HUD for the current frame, such as "Get Ready". Actions set it again every frame it should stay up.
     """
     def __init__(self,locus,depth,parallax,name,layer,extras):
         """
@@ -1122,6 +1303,7 @@ class Player(character):
         self.maxhealth = 100
         self.health = self.maxhealth
         self.allegience = "Hero"
+        self.message = None
         #make the camera focus on this object
         if state.gamemode != "edit":
             state.cam.focusobj = self
@@ -1130,8 +1312,9 @@ class Player(character):
     #this update is the same as the one for generic characters, but it allows the player to control it.
     def update(self):
         """
-        Updates the player, including input handling, physics, and rendering.
+        Updates the player, including input handling and physics.
         """
+        self.message = None
         if state.gamemode != "edit":
             self.lastanim = self.animname
             self.lastpos = self.pos.copy()
@@ -1166,13 +1349,21 @@ class Player(character):
         self.speed[1] += self.nextspeedadj[1]
         #print("After:",self.speed)
         self.nextspeedadj = [0,0]
-        state.HUD.blit(state.font.render(f"HP:{self.health}",False,[255,255,255],[0,0,0]),(30*state.scaleamt,30*state.scaleamt))
-        if self.health <= 0:
-            state.HUD.blit(state.font.render(f"Game Over",False,[255,0,0],[0,0,0]),(1800*state.scaleamt,1800*state.scaleamt))
         if hasattr(animHandlers,f"{self.name}animationPick"):
             getattr(animHandlers,f"{self.name}animationPick")(self)
         self.animationupdate()
-        self.render()
+
+    def render(self):
+        """
+        Renders the player, and their health and any message on the HUD.
+        """
+        super().render()
+        if state.gamemode != "edit":
+            if self.message != None:
+                state.HUD.blit(state.font.render(self.message,False,[255,255,255],[0,0,0]),(1800*state.scaleamt,1800*state.scaleamt))
+            state.HUD.blit(state.font.render(f"HP:{self.health}",False,[255,255,255],[0,0,0]),(30*state.scaleamt,30*state.scaleamt))
+            if self.health <= 0:
+                state.HUD.blit(state.font.render(f"Game Over",False,[255,0,0],[0,0,0]),(1800*state.scaleamt,1800*state.scaleamt))
 
     #perform moves from the moves library based on the status of input
     def playerControl(self):
@@ -1224,28 +1415,20 @@ class Player(character):
                 self.actionqueue.append([0,["jump",20],[None,None,True]])
                 self.actionqueue.append([0,["stun",dmg],[None,None,True]])
                 self.actionqueue.append([30,["destun",dmg],[None,None,True]])
-                #apply stun pallate after a while. Maybe we replace this with a flicker function?
-                self.actionqueue.append([35,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([40,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([45,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([50,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([55,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([60,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([65,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([70,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([75,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([80,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([85,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([90,["deTempPallate",None],[None,None,True]])
+                #flicker the stun pallate after a while
+                self.playeffect("HitFlash")
             if self.health <= 0:
                 self.kill() 
 
+#behavior for enemies that aren't given one
+idlebehavior = behaviours.program("Idle",[[0,["nothing","nothing"],[None,None,False]]])
+
 class Enemy(character):
     """
     A class to represent an enemy in the game.
 
     Attributes:
-    behavior: list
+    behavior: behaviours.program
         The behavior pattern of the enemy.
     health: int
         The health of the enemy.
@@ -1265,9 +1448,9 @@ class Enemy(character):
         super().__init__(locus,depth,parallax,name,layer,extras)
         #print(self.data.keys())
         if "Behavior" in self.data.keys():
-            self.behavior = state.aisource[self.data["Behavior"]]
+            self.behavior = behaviours.getprogram(self.data["Behavior"])
         else:
-            self.behavior = [[0,["nothing","nothing"],[None,None,False]]]
+            self.behavior = idlebehavior
         if "Pallate" in self.data.keys():
             self.pallate = self.data["Pallate"]
         else:
@@ -1289,7 +1472,7 @@ class Enemy(character):
 
     def update(self):
         """
-        Updates the enemy, including physics, behavior, and rendering.
+        Updates the enemy, including physics and behavior.
         """
         self.lastanim = self.animname
         self.lastpos = self.pos.copy()
@@ -1299,16 +1482,15 @@ class Enemy(character):
         self.lastright = self.right.copy()
         self.lastdir = self.direction
 
-        for obj in state.objects:
-            if type(obj).__name__== "Player":
-                self.target = obj
+        for obj in state.objects.oftype("Player"):
+            self.target = obj
 
         #refresh the actionqueue
         if self.iframes > 0:
             self.iframes -= state.deltatime
         if not self.stun:
-            if self.actionqueue == []:
-                self.actionqueue = deepcopy(self.behavior)
+            if self.idle():
+                self.behavior.start(self)
         #perform movement and check collisions
         self.movement = [self.speed[0]*state.deltatime,self.speed[1]*state.deltatime]
         while self.movement != [0,0]:
@@ -1331,7 +1513,6 @@ class Enemy(character):
         if hasattr(animHandlers,f"{self.name}animationPick"):
             getattr(animHandlers,f"{self.name}animationPick")(self)
         self.animationupdate()
-        self.render()
         #adjust speed for the next frame--complex deltatime stuffs 
         self.speed[0] += self.nextspeedadj[0]
         self.speed[1] += self.nextspeedadj[1]
@@ -1382,7 +1563,6 @@ class roomLock(gameObject):
             pygame.draw.rect(state.display,(200,100,50),((self.pos[0]-state.cam.pos[0]*parallaxmod)*state.scaleamt,(self.pos[1]-state.cam.pos[1]*parallaxmod)*state.scaleamt,self.size[0]*state.scaleamt,self.size[1]*state.scaleamt),int(state.tilesize*state.scaleamt/2))
         
     def update(self):
-        self.render()
         self.getpoints()
 
     def collidefunction(self,trigger):
@@ -1401,31 +1581,36 @@ class roomLock(gameObject):
             state.cam.pos = self.pos.copy()
             if self not in state.cam.locks:
                 state.cam.locks.append(self)
-            for item in state.objects:
+            for item in state.objectgrid.nearby(self,None):
                 if hasattr(item,"fightStart") and self.checkobjcollide(self,item) and not item.active:
                     item.fightStart()
     
 class Boss(Enemy):
     def __init__(self,locus,depth,parallax,name,layer,extras):
         super().__init__(locus,depth,parallax,name,layer,extras)
-        self.trueBehavior = self.behavior.copy()
-        self.behavior = state.aisource["BossWait"]
+        self.trueBehavior = self.behavior
+        self.behavior = behaviours.getprogram("BossWait")
         self.active = False
         
     def update(self):
         """
         Updates the state of the object.
 
-        This function calls the update method of the superclass. If the object's behavior matches its actual behavior,
-        it displays the boss's health on the HUD. It also decreases the invincibility frames (iframes) by the delta time
+        This function calls the update method of the superclass. It also decreases the invincibility frames (iframes) by the delta time
         if iframes are greater than zero.
         """
         super().update()
-        if self.behavior == self.trueBehavior:
-            state.HUD.blit(state.font.render(f"Boss HP:{self.health}",False,[255,0,100],[0,0,0]),(30*state.scaleamt,150*state.scaleamt))
         if self.iframes > 0:
             self.iframes -= state.deltatime
 
+    def render(self):
+        """
+        Renders the boss. Once the fight has started, the boss's health is displayed on the HUD.
+        """
+        super().render()
+        if self.behavior == self.trueBehavior and state.gamemode != "edit":
+            state.HUD.blit(state.font.render(f"Boss HP:{self.health}",False,[255,0,100],[0,0,0]),(30*state.scaleamt,150*state.scaleamt))
+
     def fightStart(self):
         """
         Initializes the fight sequence for the object.
@@ -1458,19 +1643,8 @@ class Boss(Enemy):
                 self.actionqueue.append([0,["jump",20],[None,None,True]])
                 self.actionqueue.append([0,["stun",dmg],[None,None,True]])
                 self.actionqueue.append([30,["destun",dmg],[None,None,True]])
-                #apply stun pallate after a while. Maybe we replace this with a flicker function?
-                self.actionqueue.append([35,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([40,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([45,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([50,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([55,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([60,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([65,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([70,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([75,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([80,["deTempPallate",None],[None,None,True]])
-                self.actionqueue.append([85,["tempPallate","Stun"],[None,None,True]])
-                self.actionqueue.append([90,["deTempPallate",None],[None,None,True]])
+                #flicker the stun pallate after a while
+                self.playeffect("HitFlash")
             if self.health <= 0:
                 self.kill()
 class oneWay(gameObject):
@@ -1512,7 +1686,6 @@ class oneWay(gameObject):
 
     def update(self):
         self.getpoints()
-        self.render()
         
     def collidefunction(self,trigger):
         match self.axis:
@@ -0,0 +1,78 @@
+"""
+Filename: pallates.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Pallate swapping for "MathWiz!"
+"""
+import numpy
+import pygame
+
+#remap tables that have already been worked out, keyed by pixel format and the pair of pallates
+remaptables = {}
+
+def remaptable(surface,source,target):
+    """
+    Works out which pixel values a pallate swap changes, and what it changes them to.
+    Swaps are applied one color at a time, so a color changed early on can be changed again by a later color in the pallate.
+
+    Parameters:
+    surface : pygame.Surface
+        A surface with the pixel format the table will be used on.
+    source : list
+        The colors of the pallate the graphic is drawn in.
+    target : list
+        The colors to change them to.
+
+    Returns:
+    tuple
+        The sorted pixel values to change, the values to change them to, and the mask of the color bits in a pixel.
+    """
+    key = (surface.get_bitsize(),surface.get_masks(),tuple(map(tuple,source)),tuple(map(tuple,target)))
+    if key not in remaptables:
+        #alpha is ignored when matching colors
+        colormask = surface.get_masks()[0]|surface.get_masks()[1]|surface.get_masks()[2]
+        steps = [(surface.map_rgb(old)&colormask,surface.map_rgb(new)&colormask) for old,new in zip(source,target)]
+        table = {}
+        for start,burner in steps:
+            color = start
+            for old,new in steps:
+                if color == old:
+                    color = new
+            table[start] = color
+        #colors that end up unchanged don't need to be touched at all
+        table = {old:new for old,new in table.items() if old != new}
+        keys = numpy.array(sorted(table),dtype=numpy.uint32)
+        values = numpy.array([table[old] for old in sorted(table)],dtype=numpy.uint32)
+        remaptables[key] = (keys,values,colormask)
+    return remaptables[key]
+
+def recolor(surface,source,target):
+    """
+    Swaps a surface from one pallate to another in a single pass over its pixels.
+
+    Parameters:
+    surface : pygame.Surface
+        The surface to recolor. It is changed in place.
+    source : list
+        The colors of the pallate the graphic is drawn in.
+    target : list
+        The colors to change them to.
+    """
+    keys,values,colormask = remaptable(surface,source,target)
+    if len(keys) == 0:
+        return
+    #24 bit surfaces can't be edited in place, so work on a copy of their pixels instead
+    if surface.get_bytesize() == 3:
+        pixels = pygame.surfarray.array2d(surface).astype(numpy.uint32)
+    else:
+        pixels = pygame.surfarray.pixels2d(surface)
+    colors = pixels&colormask
+    #find where each pixel's color would sit in the table, then keep only the pixels that actually match
+    index = numpy.searchsorted(keys,colors)
+    index[index == len(keys)] = 0
+    hits = keys[index] == colors
+    pixels[hits] = (pixels[hits]&~numpy.uint32(colormask))|values[index[hits]]
+    if surface.get_bytesize() == 3:
+        pygame.surfarray.blit_array(surface,pixels)
+    del pixels
@@ -5,88 +5,485 @@ Version: 1.0
 Date: 11/23/2024
 Purpose: Particle System for "MathWiz!"
 """
-import pygame
+import numpy
 
 import GameData as state
 
+#This class holds every particle on one layer, with each of their values kept together in an array so they can all be updated at once
+class particlelayer:
+    """
+    A class to hold the particles on one layer. Only the first count entries of each array are in use.
+
+    Attributes:
+    count : int
+        The number of particles.
+    pos : numpy.ndarray
+        The location of each particle.
+    last : numpy.ndarray
+        The location of each particle before the last update, to draw it partway between updates.
+    speed : numpy.ndarray
+        The current move vector of each particle.
+    accel : numpy.ndarray
+        The momentum change vector of each particle.
+    maxspeed : numpy.ndarray
+        The terminal velocity of each particle.
+    start : numpy.ndarray
+        Where each particle's frames start in the manager's frame list.
+    length : numpy.ndarray
+        How many frames each particle has.
+    frame : numpy.ndarray
+        The frame each particle is on, counted from its first.
+    timer : numpy.ndarray
+        How long each particle has been on its current frame.
+    lifespan : numpy.ndarray
+        How long each particle has left.
+    priority : numpy.ndarray
+        How important each particle is to keep when the layer is over budget.
+    owed : numpy.ndarray
+        How many frames of movement each particle is owed, from updates it was skipped for while off screen.
+    oweddt : numpy.ndarray
+        How much deltatime those frames add up to.
+    updates : int
+        How many times the layer has been updated.
+    drawn : int
+        How many particles were drawn the last time the layer was drawn.
+    culled : int
+        How many particles weren't drawn the last time the layer was drawn, for being off screen.
+    evicted : int
+        How many particles were thrown out in the last update, for going over budget.
+    """
+    def __init__(self,capacity=64):
+        """
+        Initializes an empty layer with room for some particles.
+
+        Parameters:
+        capacity : int
+            How many particles to make room for to start with.
+        """
+        self.count = 0
+        self.pos = numpy.zeros((capacity,2))
+        self.last = numpy.zeros((capacity,2))
+        self.speed = numpy.zeros((capacity,2))
+        self.accel = numpy.zeros((capacity,2))
+        self.maxspeed = numpy.zeros((capacity,2))
+        self.start = numpy.zeros(capacity,dtype=numpy.int64)
+        self.length = numpy.ones(capacity,dtype=numpy.int64)
+        self.frame = numpy.zeros(capacity,dtype=numpy.int64)
+        self.timer = numpy.zeros(capacity)
+        self.lifespan = numpy.zeros(capacity)
+        self.priority = numpy.zeros(capacity)
+        self.owed = numpy.zeros(capacity,dtype=numpy.int64)
+        self.oweddt = numpy.zeros(capacity)
+        self.updates = 0
+        self.drawn = 0
+        self.culled = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return self.count
+
+    def arrays(self):
+        """
+        Gets every per-particle array, for resizing and compacting them all together.
+        """
+        return ["pos","last","speed","accel","maxspeed","start","length","frame","timer","lifespan","priority","owed","oweddt"]
+
+    def add(self,location,start,length,speed,accel,maxspeed,lifespan,priority=0):
+        """
+        Adds a particle, making more room if the arrays are full.
+        """
+        if self.count == len(self.lifespan):
+            for name in self.arrays():
+                old = getattr(self,name)
+                new = numpy.zeros((len(old)*2,)+old.shape[1:],dtype=old.dtype)
+                new[:self.count] = old[:self.count]
+                setattr(self,name,new)
+        spot = self.count
+        self.pos[spot] = location
+        self.last[spot] = location
+        self.speed[spot] = speed
+        self.accel[spot] = accel
+        self.maxspeed[spot] = maxspeed
+        self.start[spot] = start
+        self.length[spot] = length
+        self.frame[spot] = 0
+        self.timer[spot] = 0
+        self.lifespan[spot] = lifespan
+        self.priority[spot] = priority
+        self.owed[spot] = 0
+        self.oweddt[spot] = 0
+        self.count += 1
+
+    def keep(self,alive):
+        """
+        Throws out the particles not marked to keep, keeping the rest in the order they were added.
+
+        Parameters:
+        alive : numpy.ndarray
+            Whether to keep each particle in use.
+        """
+        kept = int(alive.sum())
+        for name in self.arrays():
+            array = getattr(self,name)
+            array[:kept] = array[:self.count][alive]
+        self.count = kept
+
+def resolveframes(frames):
+    """
+    Looks up the graphics for a list of particle frames.
+
+    Parameters:
+    frames : list
+        The frames, each as [Particle Data Name, flipx, flipy, rotate, frametime].
+
+    Returns:
+    tuple
+        The frames, each as (frame x, frame y, frame len, frame width, flipx, flipy, rotate, ticktime).
+    """
+    resolved = []
+    for frame in frames:
+        if frame[0] in state.particlesource["Graphics"].keys():
+            graphic = state.particlesource["Graphics"][frame[0]]
+        else:
+            graphic = [1203,620,120,101]
+        resolved.append(tuple(graphic)+tuple(frame[1:]))
+    return tuple(resolved)
+
+#This class holds a named emitter from particles.json, with its frames already looked up, so spawning from it only has to add the particles
+class emitter:
+    """
+    A class to hold an emitter template. Emitters are never changed once worked out.
+
+    Attributes:
+    start : int
+        Where the emitter's frames start in the manager's frame list.
+    length : int
+        How many frames the emitter's particles have.
+    bursts : tuple
+        The particles to add with each spawn, as (the caller's point to take x from, the caller's point to take y from, starting move vector).
+    accel : tuple
+        The momentum change vector of each particle.
+    maxspeed : tuple
+        The terminal velocity of each particle.
+    lifespan : float
+        How long each particle lasts.
+    priority : float
+        How important the particles are to keep when their layer is over budget.
+    """
+    __slots__ = ("start","length","bursts","accel","maxspeed","lifespan","priority")
+
+    def __init__(self,start,length,source):
+        """
+        Works out an emitter.
+
+        Parameters:
+        start : int
+            Where the emitter's frames start in the manager's frame list.
+        length : int
+            How many frames the emitter's particles have.
+        source : dict
+            The emitter, as found in particles.json.
+        """
+        object.__setattr__(self,"start",start)
+        object.__setattr__(self,"length",length)
+        object.__setattr__(self,"bursts",tuple((burst["At"][0],burst["At"][1],tuple(burst["Speed"])) for burst in source["Burst"]))
+        object.__setattr__(self,"accel",tuple(source["Accel"]))
+        object.__setattr__(self,"maxspeed",tuple(source["MaxSpeed"]))
+        object.__setattr__(self,"lifespan",source["Lifespan"])
+        object.__setattr__(self,"priority",source.get("Priority",0))
+
+    def __setattr__(self,name,value):
+        raise AttributeError("emitters can't be changed")
+
 class ParticleManager:
-    def __init__(self):
-        self.particles = [[]]
-        self.storage = pygame.Surface(state.screensize).convert()
-        self.storage.set_colorkey(state.invis)
+    """
+    A class to update and draw the particles on every layer.
+
+    Attributes:
+    particles : list
+        The particlelayer for each layer of the level.
+    frames : list
+        Every particle frame in use, as [frame x, frame y, frame len, frame width, flipx, flipy, rotate, ticktime].
+        Particles with the same frames share one run of this list.
+    ticks : numpy.ndarray
+        The ticktime of each frame.
+    tables : dict
+        Where each run of frames starts in the frame list, keyed by the frames.
+    areas : list
+        The area of the spritesheet to draw for each frame, at the scale they were worked out for.
+    sizes : numpy.ndarray
+        The width and height of each of those areas, for checking what's on screen.
+    areascale : float
+        The scale the areas were worked out for.
+    emitters : dict
+        The emitters that have been worked out, keyed by name.
+    budget : int
+        The most particles a layer may hold, or None for no limit.
+    eviction : str
+        Which particles to throw out when a layer is over budget: "oldest" first, or lowest "priority" first (oldest first among equals).
+    offscreenrate : int
+        Particles off screen only move every this many updates, catching up on the movement they missed when they do.
+    """
+    def __init__(self,budget=None,eviction="oldest",offscreenrate=1):
+        """
+        Initializes the particle manager.
+
+        Parameters:
+        budget : int
+            The most particles a layer may hold, or None for no limit.
+        eviction : str
+            Which particles to throw out when a layer is over budget: "oldest" or "priority".
+        offscreenrate : int
+            How often particles off screen are moved. 1 moves them every update.
+        """
+        self.budget = budget
+        self.eviction = eviction
+        self.offscreenrate = offscreenrate
+        self.particles = [particlelayer()]
+        self.frames = []
+        self.ticks = numpy.zeros(0)
+        self.tables = {}
+        self.areas = []
+        self.sizes = numpy.zeros((0,2))
+        self.areascale = None
+        self.emitters = {}
+
+    def frametable(self,frames):
+        """
+        Finds where a run of frames sits in the frame list, adding it if it isn't there yet.
+
+        Parameters:
+        frames : list
+            The frames, each as [frame x, frame y, frame len, frame width, flipx, flipy, rotate, ticktime].
+
+        Returns:
+        int
+            Where the frames start in the frame list.
+        """
+        key = tuple(tuple(frame) for frame in frames)
+        if key not in self.tables:
+            self.tables[key] = len(self.frames)
+            self.frames.extend(key)
+            self.ticks = numpy.array([frame[7] for frame in self.frames],dtype=float)
+            self.areascale = None
+        return self.tables[key]
+
+    def spawn(self,layer,location,frames,speed,accel,maxspeed,lifespan,priority=0):
+        """
+        Adds a particle to a layer.
+
+        Parameters:
+        layer : int
+            The layer to add the particle to.
+        location : list
+            Where the particle starts.
+        frames : list
+            The particle's frames, each as [frame x, frame y, frame len, frame width, flipx, flipy, rotate, ticktime].
+        speed : list
+            The starting move vector.
+        accel : list
+            The momentum change vector.
+        maxspeed : list
+            The terminal velocity.
+        lifespan : float
+            How long the particle lasts.
+        priority : float
+            How important the particle is to keep when the layer is over budget.
+        """
+        self.particles[layer].add(location,self.frametable(frames),len(frames),speed,accel,maxspeed,lifespan,priority)
+
+    def emitter(self,name):
+        """
+        Gets a named emitter from particles.json, working it out the first time it's used.
+
+        Parameters:
+        name : str
+            The name of the emitter.
+
+        Returns:
+        emitter
+            The emitter.
+        """
+        if name not in self.emitters:
+            source = state.particlesource["Emitters"][name]
+            frames = resolveframes(source["Frames"])
+            self.emitters[name] = emitter(self.frametable(frames),len(frames),source)
+        return self.emitters[name]
+
+    def emit(self,name,caller):
+        """
+        Spawns a burst of particles from a named emitter, placed around an object.
+
+        Parameters:
+        name : str
+            The name of the emitter.
+        caller : gameObject
+            The object to place the particles around, on its layer.
+        """
+        template = self.emitter(name)
+        particles = self.particles[caller.layer]
+        for xpoint,ypoint,speed in template.bursts:
+            particles.add([getattr(caller,xpoint)[0],getattr(caller,ypoint)[1]],template.start,template.length,speed,template.accel,template.maxspeed,template.lifespan,template.priority)
+
+    def evict(self,particles):
+        """
+        Throws out particles from a layer until it's back within budget.
+
+        Parameters:
+        particles : particlelayer
+            The layer to trim.
+        """
+        excess = particles.count-self.budget
+        if self.eviction == "priority":
+            drop = numpy.argsort(particles.priority[:particles.count],kind = "stable")[:excess]
+        else:
+            drop = numpy.arange(excess)
+        alive = numpy.ones(particles.count,dtype=bool)
+        alive[drop] = False
+        particles.keep(alive)
+        particles.evicted = excess
+
+    def move(self,particles,which,steps,deltatime):
+        """
+        Moves some of the particles on a layer along.
+
+        Parameters:
+        particles : particlelayer
+            The layer.
+        which : slice or numpy.ndarray
+            The particles to move.
+        steps : int or numpy.ndarray
+            How many frames of movement to make up for each particle.
+        deltatime : float or numpy.ndarray
+            How much deltatime those frames add up to.
+        """
+        speed = particles.speed[which]
+        maxspeed = particles.maxspeed[which]
+        #update the movement speed. Don't let them break TV, tho
+        forward = speed >= 0
+        within = numpy.where(forward,speed <= maxspeed,speed >= -maxspeed)
+        speed = numpy.where(within,speed+particles.accel[which]*deltatime,numpy.where(forward,maxspeed,-maxspeed))
+        particles.speed[which] = speed
+        #update location
+        particles.pos[which] += speed*steps
+
+    def screenspots(self,layer,particles,offset):
+        """
+        Works out where the particles on a layer are on screen, and which of them are on it at all.
+
+        Parameters:
+        layer : int
+            The layer the particles are on.
+        particles : particlelayer
+            The particles.
+        offset : numpy.ndarray
+            How far from its position each particle is to be placed.
+
+        Returns:
+        tuple
+            The screen spot of each particle, the frame each one is on in the manager's frame list, and whether each one is on screen.
+        """
+        count = particles.count
+        current = particles.start[:count]+particles.frame[:count]
+        if self.areascale != state.scaleamt:
+            self.areas = [[frame[0]*state.scaleamt,frame[1]*state.scaleamt,frame[2]*state.scaleamt,frame[3]*state.scaleamt] for frame in self.frames]
+            self.sizes = numpy.array([area[2:] for area in self.areas])
+            self.areascale = state.scaleamt
+        parallaxmod = state.level.parallaxes[layer]-state.cam.depth
+        spots = (particles.pos[:count]+offset-numpy.array(state.cam.pos)*parallaxmod)*state.scaleamt
+        sizes = self.sizes[current]
+        screen = state.display.get_size()
+        visible = (spots[:,0] < screen[0]+1)&(spots[:,1] < screen[1]+1)&(spots[:,0]+sizes[:,0] > -1)&(spots[:,1]+sizes[:,1] > -1)
+        return spots,current,visible
+
     def updateLayer(self,layer):
-        self.storage.fill(state.invis)
-        index = 0
-        #iterate through all particles on the current layer
-        while index < len(self.particles[layer]):
-            particle = self.particles[layer][index]
-            #when inserted, particles are to be formatted thusly:
-            """[
-                [Location],
-                [
-                    [frame x, frame y, frame len, frame width, flipx, flipy, rotate, ticktime]
-                ],
-                [Current move vector],
-                [Momentum change vector],
-                [Terminal velocity],
-                frame,
-                timer,
-                lifespan
-            ]"""
-            #draw graphics
-            parallaxmod = state.level.parallaxes[layer]-state.cam.depth
-            
-            state.display.blit(state.spritesheet,
-                               ((particle[0][0]+particle[2][0] - state.cam.pos[0]*parallaxmod)*state.scaleamt,
-                                (particle[0][1]+particle[2][1] - state.cam.pos[1]*parallaxmod)*state.scaleamt),
-                               [particle[1][particle[5]][0]*state.scaleamt,
-                                particle[1][particle[5]][1]*state.scaleamt,
-                                particle[1][particle[5]][2]*state.scaleamt,
-                                particle[1][particle[5]][3]*state.scaleamt])
-            #update the movement speed. Don't let them break TV, tho
-            if particle[2][0] >= 0:
-                if particle[2][0] <= particle[4][0]:
-                    particle[2][0] += particle[3][0]*state.deltatime
-                else:
-                    particle[2][0] = particle[4][0]
-            else:
-                if particle[2][0] >= -particle[4][0]:
-                    particle[2][0] += particle[3][0]*state.deltatime
-                else:
-                    particle[2][0] = -particle[4][0]
-                    
-            if particle[2][1] >= 0:
-                if particle[2][1] <= particle[4][1]:
-                    particle[2][1] += particle[3][1]*state.deltatime
-                else:
-                    particle[2][1] = particle[4][1]
-            else:
-                if particle[2][1] >= -particle[4][1]:
-                    particle[2][1] += particle[3][1]*state.deltatime
-                else:
-                    particle[2][1] = -particle[4][1]
-                    
-            #update location
-            particle[0][0] += particle[2][0]
-            particle[0][1] += particle[2][1]
-            #update timers
-            particle[6]+=state.deltatime
-            particle[7]-=state.deltatime
-            #update frame if the current one's run it's course
-            if particle[6] >= particle[1][particle[5]][7]:
-                particle[6] = 0#particle[1][particle[5]][7]
-                particle[5] += 1
-            if particle[5] >= len(particle[1]):
-                particle[5] = 0
-            #delete the object if it's lifespan is up
-            #print(particle)
-            if particle[7] <= 0:
-                self.particles[layer].remove(particle)
+        """
+        Moves the particles on a layer along, moves their animations along and throws out the ones whose lifespan is up.
+        If the layer is over budget, particles are thrown out first. Nothing is drawn; that's left to drawLayer.
+
+        Parameters:
+        layer : int
+            The layer to update.
+        """
+        particles = self.particles[layer]
+        particles.evicted = 0
+        if self.budget != None and particles.count > self.budget:
+            self.evict(particles)
+        count = particles.count
+        particles.updates += 1
+        if count == 0:
+            return
+        current = particles.start[:count]+particles.frame[:count]
+        #remember where everything was, to draw it partway between this update and the last, the same as objects are
+        particles.last[:count] = particles.pos[:count]
+        #move everything along, or if off screen particles are being moved less often, just the ones due to move
+        if self.offscreenrate > 1:
+            particles.owed[:count] += 1
+            particles.oweddt[:count] += state.deltatime
+            if particles.updates%self.offscreenrate == 0:
+                which = numpy.arange(count)
             else:
-                index += 1
-        #state.display.blit(self.storage,(0,0))
-                
+                which = numpy.flatnonzero(self.screenspots(layer,particles,particles.speed[:count])[2])
+            self.move(particles,which,particles.owed[which][:,None],particles.oweddt[which][:,None])
+            particles.owed[which] = 0
+            particles.oweddt[which] = 0
+        else:
+            self.move(particles,slice(0,count),1,state.deltatime)
+        #update timers
+        timer = particles.timer[:count]
+        frame = particles.frame[:count]
+        timer += state.deltatime
+        particles.lifespan[:count] -= state.deltatime
+        #update frame if the current one's run it's course
+        done = timer >= self.ticks[current]
+        timer[done] = 0
+        frame[done] += 1
+        frame[frame >= particles.length[:count]] = 0
+        #delete the particles whose lifespan is up
+        alive = particles.lifespan[:count] > 0
+        if not alive.all():
+            particles.keep(alive)
+
+    def drawLayer(self,layer,alpha=1):
+        """
+        Draws the particles on a layer that are on screen, all in one go.
+
+        Parameters:
+        layer : int
+            The layer to draw.
+        alpha : float
+            How far between the last two updates to draw the particles, from 0 (where they were before the last update) to 1 (where they are now).
+        """
+        particles = self.particles[layer]
+        count = particles.count
+        if count == 0:
+            particles.drawn = 0
+            particles.culled = 0
+            return
+        spots,current,visible = self.screenspots(layer,particles,(particles.last[:count]-particles.pos[:count])*(1-alpha))
+        sheet = state.spritesheet
+        areas = self.areas
+        if visible.all():
+            state.display.blits([(sheet,spot,areas[frame]) for spot,frame in zip(spots.tolist(),current.tolist())],doreturn = False)
+        else:
+            state.display.blits([(sheet,spot,areas[frame]) for spot,frame in zip(spots[visible].tolist(),current[visible].tolist())],doreturn = False)
+        particles.drawn = int(visible.sum())
+        particles.culled = count-particles.drawn
+
+    def stats(self):
+        """
+        Totals up the particle counters from the last update and draw of every layer.
+
+        Returns:
+        dict
+            How many particles there are, and how many were drawn, culled and evicted.
+        """
+        return {"particles":sum(particles.count for particles in self.particles),
+                "drawn":sum(particles.drawn for particles in self.particles),
+                "culled":sum(particles.culled for particles in self.particles),
+                "evicted":sum(particles.evicted for particles in self.particles)}
+
     def reset(self):
         self.particles = []
         for layer in state.level.loops:
-            self.particles.append([])
+            self.particles.append(particlelayer())
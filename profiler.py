@@ -0,0 +1,220 @@
+"""
+Filename: profiler.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Per-frame timing of the parts of "MathWiz!"'s main loop, with an overlay to show it on screen
+"""
+from collections import deque
+from time import perf_counter
+import pygame
+import GameData as state
+import gameloop
+import objects
+
+#the counters kept every frame, whether or not anything added to them
+counters = ("Steps","Updated","Pointcollide","Particles drawn","Blits")
+
+#This class stands in for the display while profiling, so that everything drawn onto it can be counted
+class countingsurface(pygame.Surface):
+    """
+    A surface that counts how many times it is blitted onto.
+
+    Attributes:
+    profiler : profiler
+        The profiler to count the blits for.
+    """
+    def blit(self,*args,**kwargs):
+        self.profiler.counts["Blits"] += 1
+        return super().blit(*args,**kwargs)
+
+    def blits(self,blit_sequence,*args,**kwargs):
+        blit_sequence = list(blit_sequence)
+        self.profiler.counts["Blits"] += len(blit_sequence)
+        return super().blits(blit_sequence,*args,**kwargs)
+
+#This class times named zones of each frame, and keeps a rolling window of how long they took
+class profiler:
+    """
+    A class to time the parts of each frame and count the work done in them.
+    Zones are timed back to back: each one runs from the end of the last to when it's named.
+    While it's disabled, the game loop skips it altogether, so it costs next to nothing.
+
+    Attributes:
+    enabled : bool
+        Whether frames are being profiled and the overlay drawn.
+    pertype : bool
+        Whether each type of object gets its own zone, or they are all timed together as "Objects".
+    window : int
+        How many frames the statistics are worked out over.
+    frame : dict
+        The seconds spent in each zone so far this frame.
+    counts : dict
+        The counters for this frame.
+    history : dict
+        The milliseconds spent in each zone, for each of the last few frames.
+    counthistory : dict
+        The counters for each of the last few frames.
+    start : float
+        When this frame started, from perf_counter.
+    since : float
+        When the zone being timed started, from perf_counter.
+    font : pygame.font.Font
+        The font the overlay is drawn in. It's only loaded the first time the overlay is drawn.
+    original : tuple
+        The pointcollide method and display that were swapped out while profiling, to put back afterward.
+    """
+    def __init__(self,window=120,pertype=False):
+        """
+        Sets up a profiler. It starts disabled.
+
+        Parameters:
+        window : int
+            How many frames the statistics are worked out over.
+        pertype : bool
+            Whether each type of object gets its own zone.
+        """
+        self.enabled = False
+        self.pertype = pertype
+        self.window = window
+        self.history = {}
+        self.counthistory = {}
+        self.frame = {}
+        self.counts = dict.fromkeys(counters,0)
+        self.start = self.since = perf_counter()
+        self.font = None
+        self.original = None
+
+    def begin(self):
+        """
+        Starts timing a frame.
+        """
+        self.frame = {}
+        self.counts = dict.fromkeys(counters,0)
+        self.start = self.since = perf_counter()
+
+    def zone(self,name):
+        """
+        Ends a zone, putting the time since the last one ended down to it.
+
+        Parameters:
+        name : str
+            The zone's name.
+        """
+        self.since = gameloop.tally(self.frame,name,self.since)
+
+    def mark(self):
+        """
+        Starts the next zone from now, without putting the time since the last one down to anything.
+        """
+        self.since = perf_counter()
+
+    def count(self,name,amount=1):
+        """
+        Adds to one of this frame's counters.
+
+        Parameters:
+        name : str
+            The counter's name.
+        amount : int
+            How much to add.
+        """
+        self.counts[name] = self.counts.get(name,0)+amount
+
+    def end(self):
+        """
+        Finishes timing a frame, and adds it to the history. Zones that have been seen before but didn't come up this frame count as 0.
+        """
+        self.frame["Frame"] = perf_counter()-self.start
+        for name in self.frame:
+            if name not in self.history:
+                self.history[name] = deque(maxlen = self.window)
+        for name,times in self.history.items():
+            times.append(self.frame.get(name,0)*1000)
+        for name in self.counts:
+            if name not in self.counthistory:
+                self.counthistory[name] = deque(maxlen = self.window)
+        for name,amounts in self.counthistory.items():
+            amounts.append(self.counts.get(name,0))
+
+    def stats(self,name):
+        """
+        Works out the statistics for a zone or counter over the window.
+
+        Parameters:
+        name : str
+            The zone or counter.
+
+        Returns:
+        tuple
+            The minimum, average and 99th percentile, in milliseconds for zones. All 0 if it has never come up.
+        """
+        values = self.history.get(name) or self.counthistory.get(name)
+        if not values:
+            return (0,0,0)
+        ordered = sorted(values)
+        return (ordered[0],sum(ordered)/len(ordered),ordered[min(len(ordered)-1,int(len(ordered)*0.99))])
+
+    def draw(self):
+        """
+        Draws the statistics onto the HUD, slowest zones first, with the counters underneath.
+        """
+        if self.font == None:
+            self.font = pygame.font.SysFont("Lucida Console",max(int(36*state.scaleamt),8))
+        lines = ["zone            min     avg     p99"]
+        for name in sorted(self.history,key = lambda name: self.stats(name)[1],reverse = True):
+            low,average,high = self.stats(name)
+            lines.append(f"{name[:14]:<14}{low:>6.2f}  {average:>6.2f}  {high:>6.2f}")
+        for name in self.counthistory:
+            low,average,high = self.stats(name)
+            lines.append(f"{name[:14]:<14}{low:>6.0f}  {average:>6.0f}  {high:>6.0f}")
+        height = self.font.get_linesize()
+        width = max(self.font.size(line)[0] for line in lines)
+        pygame.draw.rect(state.HUD,(0,0,0),(0,0,width+height,height*(len(lines)+1)))
+        for spot,line in enumerate(lines):
+            state.HUD.blit(self.font.render(line,False,(255,255,255),(0,0,0)),(height//2,height//2+spot*height))
+
+    def enable(self):
+        """
+        Starts profiling: pointcollide calls are counted, and the display is swapped for one that counts blits.
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        #it may be turned on partway through a frame, so that frame is timed from here
+        self.begin()
+        self.history = {}
+        self.counthistory = {}
+        self.original = (objects.character.pointcollide,state.display)
+        pointcollide = self.original[0]
+        owner = self
+        def countedcollide(item,point):
+            owner.counts["Pointcollide"] += 1
+            return pointcollide(item,point)
+        objects.character.pointcollide = countedcollide
+        display = countingsurface(state.display.get_size(),0,state.display)
+        display.profiler = self
+        display.blit(state.display,(0,0))
+        state.display = display
+
+    def disable(self):
+        """
+        Stops profiling, and puts pointcollide and the display back the way they were.
+        """
+        if not self.enabled:
+            return
+        self.enabled = False
+        pointcollide,display = self.original
+        objects.character.pointcollide = pointcollide
+        display.blit(state.display,(0,0))
+        state.display = display
+        self.original = None
+
+    def toggle(self):
+        """
+        Turns profiling on if it's off, and off if it's on.
+        """
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
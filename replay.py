@@ -0,0 +1,255 @@
+"""
+Filename: replay.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Recording and replaying input for "MathWiz!", so that runs can be repeated exactly
+"""
+import random
+import struct
+import pygame
+import GameData as state
+
+#recordings start with this, then the version of the format
+MAGIC = b"MWRP"
+VERSION = 2
+#which parts of the input changed on a step, as bits of the byte each step starts with
+HELD = 1
+NEWKEYS = 2
+EVENTS = 4
+MOUSE = 8
+CLICK = 16
+DELTATIME = 32
+
+#the keys the game reads the state of. Other keys are only recorded when they are newly pressed
+watchedkeys = (pygame.K_UP,pygame.K_DOWN,pygame.K_LEFT,pygame.K_RIGHT,pygame.K_w,pygame.K_a,pygame.K_s,pygame.K_d,
+               pygame.K_f,pygame.K_SPACE,pygame.K_LSHIFT,pygame.K_RSHIFT)
+
+#This class stands in for pygame.key.get_pressed, so recorded or scripted input can be read the same way as the keyboard
+class keystate:
+    """
+    A class to hold which keys are down.
+
+    Attributes:
+    held : frozenset
+        The key codes of the keys that are down.
+    """
+    def __init__(self,held):
+        self.held = frozenset(held)
+
+    def __getitem__(self,key):
+        return key in self.held
+
+    def __iter__(self):
+        #going through it the way the keyboard's can be gone through only ever finds keys that are up
+        return iter(())
+
+def keystowatch():
+    """
+    Works out which keys to record the state of: the ones the game always reads, and any that behaviours wait on.
+    """
+    keys = list(watchedkeys)
+    for source in getattr(state,"aisource",{}).values():
+        for delay,action,(popsource,popkey,popval) in source:
+            if popsource == "keys" and popkey not in keys:
+                keys.append(popkey)
+    return keys
+
+def masksize(count):
+    """
+    Works out how many bytes it takes to hold a bit for each of some number of keys.
+    """
+    return (count+7)//8
+
+#This class writes the input the game sees on each step to a file, along with what's needed to play it back the same way
+class recorder:
+    """
+    A class to record input to a compact binary file.
+    The file starts with a header holding the random seed, the level, and the keys being watched.
+    Each step after that is a byte saying what changed since the step before, followed by only the parts that did.
+
+    Attributes:
+    file : file
+        The file being written.
+    seed : int
+        The seed the random module was given when recording started.
+    level : str
+        The level the recording starts on.
+    watched : list
+        The keys whose state is recorded, in the order of their bits.
+    maskbytes : int
+        How many bytes the held keys take, at a bit for each watched key.
+    steps : int
+        How many steps have been recorded.
+    last : tuple
+        The held keys, mouse position, mouse buttons and deltatime on the last step recorded.
+    """
+    def __init__(self,path,level,seed=None):
+        """
+        Starts a recording and seeds the random module, so that it is the same when played back.
+        This should be done just before the level is loaded.
+
+        Parameters:
+        path : str
+            The file to record to.
+        level : str
+            The level the recording starts on.
+        seed : int
+            The seed to use. If not given, one is picked at random.
+        """
+        self.seed = seed if seed != None else random.randrange(2**32)
+        self.level = level
+        self.watched = keystowatch()
+        #held keys are stored as a bit for each watched key, in as many bytes as that takes
+        self.maskbytes = masksize(len(self.watched))
+        self.steps = 0
+        self.last = (None,None,None,None)
+        name = level.encode()
+        self.file = open(path,"wb")
+        self.file.write(MAGIC+struct.pack("<BIB",VERSION,self.seed,len(name))+name)
+        self.file.write(struct.pack(f"<H{len(self.watched)}I",len(self.watched),*self.watched))
+        random.seed(self.seed)
+
+    def capture(self):
+        """
+        Records the input for the step about to be run.
+        """
+        held = 0
+        for bit,key in enumerate(self.watched):
+            if state.keys[key]:
+                held |= 1<<bit
+        click = (1 if state.click[0] else 0)|(2 if state.click[1] else 0)|(4 if state.click[2] else 0)
+        mouse = (float(state.mouse[0]),float(state.mouse[1]))
+        lastheld,lastmouse,lastclick,lastdeltatime = self.last
+        flags = 0
+        data = b""
+        if held != lastheld:
+            flags |= HELD
+            data += held.to_bytes(self.maskbytes,"little")
+        if state.newkeys:
+            flags |= NEWKEYS
+            data += struct.pack(f"<B{len(state.newkeys)}I",len(state.newkeys),*state.newkeys)
+        if state.event_types:
+            #the game only checks whether an event type came up, so each is kept once
+            types = sorted(set(state.event_types))
+            flags |= EVENTS
+            data += struct.pack(f"<B{len(types)}I",len(types),*types)
+        if mouse != lastmouse:
+            flags |= MOUSE
+            data += struct.pack("<2d",*mouse)
+        if click != lastclick:
+            flags |= CLICK
+            data += struct.pack("<B",click)
+        if state.deltatime != lastdeltatime:
+            flags |= DELTATIME
+            data += struct.pack("<d",state.deltatime)
+        self.file.write(bytes([flags])+data)
+        self.last = (held,mouse,click,state.deltatime)
+        self.steps += 1
+
+    def close(self):
+        """
+        Finishes the recording.
+        """
+        self.file.close()
+
+#This class feeds a recording back into the game, one step at a time
+class playback:
+    """
+    A class to play back a recording made by recorder.
+
+    Attributes:
+    seed : int
+        The seed the random module was given when recording started.
+    level : str
+        The level the recording starts on.
+    steps : list
+        The input for each step, as (held keys, new keys, event types, mouse position, mouse buttons, deltatime).
+    spot : int
+        The next step to play.
+    """
+    def __init__(self,path):
+        """
+        Reads a recording.
+
+        Parameters:
+        path : str
+            The file to read.
+        """
+        data = open(path,"rb").read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a recording")
+        version,self.seed,namelength = struct.unpack_from("<BIB",data,4)
+        if version != VERSION:
+            raise ValueError(f"{path} is recorded in version {version} of the format, not {VERSION}")
+        spot = 10
+        self.level = data[spot:spot+namelength].decode()
+        spot += namelength
+        count = struct.unpack_from("<H",data,spot)[0]
+        watched = struct.unpack_from(f"<{count}I",data,spot+2)
+        spot += 2+4*count
+        maskbytes = masksize(count)
+        self.steps = []
+        held = frozenset()
+        mouse = (0,0)
+        click = (False,False,False)
+        deltatime = 1
+        while spot < len(data):
+            flags = data[spot]
+            spot += 1
+            newkeys = ()
+            types = ()
+            if flags & HELD:
+                bits = int.from_bytes(data[spot:spot+maskbytes],"little")
+                held = frozenset(key for bit,key in enumerate(watched) if bits & (1<<bit))
+                spot += maskbytes
+            if flags & NEWKEYS:
+                count = data[spot]
+                newkeys = struct.unpack_from(f"<{count}I",data,spot+1)
+                spot += 1+4*count
+            if flags & EVENTS:
+                count = data[spot]
+                types = struct.unpack_from(f"<{count}I",data,spot+1)
+                spot += 1+4*count
+            if flags & MOUSE:
+                mouse = struct.unpack_from("<2d",data,spot)
+                spot += 16
+            if flags & CLICK:
+                click = (bool(data[spot] & 1),bool(data[spot] & 2),bool(data[spot] & 4))
+                spot += 1
+            if flags & DELTATIME:
+                deltatime = struct.unpack_from("<d",data,spot)[0]
+                spot += 8
+            self.steps.append((held,newkeys,types,mouse,click,deltatime))
+        self.spot = 0
+
+    def __len__(self):
+        return len(self.steps)
+
+    def start(self):
+        """
+        Seeds the random module the way it was when recording started. This should be done just before the level is loaded.
+        """
+        random.seed(self.seed)
+        self.spot = 0
+
+    def apply(self):
+        """
+        Sets the input for the next step, in place of the keyboard and mouse.
+
+        Returns:
+        bool
+            False if the recording has run out.
+        """
+        if self.spot >= len(self.steps):
+            return False
+        held,newkeys,types,mouse,click,deltatime = self.steps[self.spot]
+        self.spot += 1
+        state.keys = keystate(held)
+        state.newkeys = list(newkeys)
+        state.event_types = list(types)
+        state.events = []
+        state.mouse = mouse
+        state.click = click
+        state.deltatime = deltatime
+        return True
@@ -0,0 +1,227 @@
+"""
+Filename: scene.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: The list of objects in play for "MathWiz!"
+"""
+from bisect import bisect_right
+
+#This class holds every object being updated and drawn, in the order they are drawn
+class scene:
+    """
+    A class to hold the objects in play, kept in depth order, with indexes to find objects by type, layer and allegience without looking through all of them.
+    Removed objects are only marked as removed, and are cleared out in one go by flush. While staging, added objects are held back until the flush too,
+    though they count as members and can be found through the indexes straight away.
+
+    Attributes:
+    descending : bool
+        Whether deeper objects come first.
+    items : list
+        Every object in order, including removed ones that haven't been flushed yet.
+    keys : list
+        The sort key of each entry in items.
+    members : set
+        The objects that haven't been removed.
+    staging : bool
+        Whether added objects are held back until the next flush.
+    pending : list
+        The objects held back, in the order they were added.
+    removed : set
+        The objects removed since the last flush, whose entries may still be in items or pending.
+    types : dict
+        The objects of each type, keyed by type name.
+    layers : dict
+        The objects on each layer, keyed by layer.
+    allegiences : dict
+        The objects of each allegience, keyed by allegience.
+    """
+    def __init__(self,descending=True):
+        """
+        Initializes an empty scene.
+
+        Parameters:
+        descending : bool
+            Whether deeper objects come first.
+        """
+        self.descending = descending
+        self.items = []
+        self.keys = []
+        self.members = set()
+        self.staging = False
+        self.pending = []
+        self.removed = set()
+        self.types = {}
+        self.layers = {}
+        self.allegiences = {}
+
+    def sortkey(self,item):
+        """
+        Gets the key an object is sorted by. Things without a depth go at depth 0.
+        """
+        if self.descending:
+            return -getattr(item,"depth",0)
+        return getattr(item,"depth",0)
+
+    def append(self,item):
+        """
+        Adds an object after everything at the same depth, as re-sorting the whole list after adding it would.
+        While staging, it is only put in place on the next flush.
+
+        Parameters:
+        item : any
+            The object to add.
+        """
+        if item in self.removed:
+            self.unlist(item)
+        if self.staging:
+            self.pending.append(item)
+        else:
+            self.insert(item)
+        self.members.add(item)
+        self.types.setdefault(type(item).__name__,{})[item] = None
+        if hasattr(item,"layer"):
+            self.layers.setdefault(item.layer,{})[item] = None
+        if hasattr(item,"allegience"):
+            self.allegiences.setdefault(item.allegience,{})[item] = None
+
+    def insert(self,item):
+        """
+        Puts an object in its place in the list.
+
+        Parameters:
+        item : any
+            The object to put in place.
+        """
+        key = self.sortkey(item)
+        spot = bisect_right(self.keys,key)
+        self.items.insert(spot,item)
+        self.keys.insert(spot,key)
+
+    def unlist(self,item):
+        """
+        Blanks out the entry a removed object left behind, so adding it back before the next flush doesn't put it in the list twice.
+        The entry is blanked rather than taken out, so loops going through the list don't skip anything.
+
+        Parameters:
+        item : any
+            The removed object.
+        """
+        self.removed.discard(item)
+        for entries in (self.items,self.pending):
+            for spot in range(len(entries)):
+                if entries[spot] is item:
+                    entries[spot] = None
+                    return
+
+    def remove(self,item):
+        """
+        Removes an object. It stays in items until the next flush, but is skipped over from now on.
+
+        Parameters:
+        item : any
+            The object to remove.
+        """
+        if item not in self.members:
+            raise ValueError("scene.remove(x): x not in scene")
+        self.members.remove(item)
+        self.removed.add(item)
+        del self.types[type(item).__name__][item]
+        if hasattr(item,"layer"):
+            del self.layers[item.layer][item]
+        if hasattr(item,"allegience"):
+            del self.allegiences[item.allegience][item]
+
+    def flush(self):
+        """
+        Clears removed objects out of the list, and puts held back objects in place. This shouldn't be done while the scene is being looped through.
+        """
+        if len(self.items)+len(self.pending) != len(self.members):
+            keep = [spot for spot in range(len(self.items)) if self.items[spot] in self.members]
+            self.items = [self.items[spot] for spot in keep]
+            self.keys = [self.keys[spot] for spot in keep]
+        for item in self.pending:
+            if item in self.members:
+                self.insert(item)
+        self.pending = []
+        self.removed = set()
+
+    def snapshot(self):
+        """
+        Gets a copy of the objects in the list, leaving out anything removed or held back.
+
+        Returns:
+        list
+            The objects, in order.
+        """
+        return [item for item in self.items if item in self.members]
+
+    def reindex(self,item,index,old,new):
+        """
+        Moves an object in one of the indexes after the value it is indexed by changes.
+
+        Parameters:
+        item : any
+            The object that changed.
+        index : dict
+            The index to update: layers or allegiences.
+        old : any
+            The value the object was indexed under.
+        new : any
+            The value to index it under now.
+        """
+        if item in self.members:
+            if item in index.get(old,{}):
+                del index[old][item]
+            index.setdefault(new,{})[item] = None
+
+    def ordered(self,items):
+        """
+        Puts some objects from the scene in the same order they sit in the scene.
+        """
+        return sorted(items,key = self.sortkey)
+
+    def oftype(self,name):
+        """
+        Gets every object of a type, in scene order.
+
+        Parameters:
+        name : str
+            The name of the type.
+        """
+        return self.ordered(self.types.get(name,{}))
+
+    def onlayer(self,layer):
+        """
+        Gets every object on a layer, in scene order.
+
+        Parameters:
+        layer : int
+            The layer.
+        """
+        return self.ordered(self.layers.get(layer,{}))
+
+    def ofallegience(self,allegience):
+        """
+        Gets every object with an allegience, in scene order.
+
+        Parameters:
+        allegience : str
+            The allegience.
+        """
+        return self.ordered(self.allegiences.get(allegience,{}))
+
+    def __contains__(self,item):
+        return item in self.members
+
+    def __len__(self):
+        return len(self.members)
+
+    def __iter__(self):
+        #objects added while looping are picked up if they land ahead of the loop, like with a list
+        spot = 0
+        while spot < len(self.items):
+            item = self.items[spot]
+            spot += 1
+            if item in self.members:
+                yield item
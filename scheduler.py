@@ -0,0 +1,107 @@
+"""
+Filename: scheduler.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Delayed actions for "MathWiz!"
+"""
+from heapq import heappush, heappop
+from itertools import count
+
+#This class holds the actions an object has been told to do later, so they don't need looking at every frame until they are due
+class scheduler:
+    """
+    A class to hold an object's delayed actions in a heap, keyed on when they are due by the object's own clock.
+    The clock only moves on when the object's actions are updated, so delays don't run down while the object is out of update range,
+    the same as when every action's delay was counted down in the queue.
+
+    Attributes:
+    time : float
+        How much time the object's actions have been updated for.
+    heap : list
+        The delayed actions, each as (time due, order added, action).
+    counter : itertools.count
+        Numbers the actions as they are added, so ones due at the same time come out in the order they went in.
+    """
+    def __init__(self):
+        """
+        Initializes an empty scheduler.
+        """
+        self.time = 0
+        self.heap = []
+        self.counter = count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self,action):
+        """
+        Holds an action back until its delay has passed.
+
+        Parameters:
+        action : list
+            The action, in the same form as the action queue uses: [delay, [function name, argument], pop condition].
+        """
+        heappush(self.heap,(self.time+action[0],next(self.counter),action))
+
+    def advance(self,amount):
+        """
+        Moves the clock on, at the end of an update of the object's actions.
+
+        Parameters:
+        amount : float
+            The time passed.
+        """
+        self.time += amount
+
+    def due(self):
+        """
+        Takes out every action whose delay has passed.
+
+        Returns:
+        list
+            The actions, in the order they came due.
+        """
+        fired = []
+        while self.heap and self.heap[0][0] <= self.time:
+            action = heappop(self.heap)[2]
+            action[0] = 0
+            fired.append(action)
+        return fired
+
+    def clear(self):
+        """
+        Drops every delayed action.
+        """
+        self.heap = []
+
+#This class is the action queue itself. Actions with a delay are handed off to the scheduler instead of sitting in the queue
+class actionlist(list):
+    """
+    A list of the actions an object is currently doing. Appending an action with a delay above zero schedules it instead,
+    and it is added to the end of the list once it comes due.
+
+    Attributes:
+    scheduler : scheduler
+        Where delayed actions are sent.
+    """
+    def __init__(self,actions,scheduler):
+        """
+        Initializes the queue with some actions, scheduling any with a delay.
+
+        Parameters:
+        actions : list
+            The actions to start with.
+        scheduler : scheduler
+            Where delayed actions are sent.
+        """
+        super().__init__()
+        self.scheduler = scheduler
+        for action in actions:
+            self.append(action)
+
+    def append(self,action):
+        if action[0] > 0:
+            self.scheduler.schedule(action)
+        else:
+            super().append(action)
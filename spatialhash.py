@@ -0,0 +1,150 @@
+"""
+Filename: spatialhash.py
+Author(s): Taliesin Reese
+Version: 1.0
+Date: 10/18/2026
+Purpose: Spatial hashing for object collisions in "MathWiz!"
+"""
+import math
+from itertools import count
+
+#This class splits each layer into a grid of cells, so that collision checks only have to look at the objects in the cells around them
+class spatialhash:
+    """
+    A class to hold where every object is, by grid cell on each layer.
+
+    Attributes:
+    cellsize : int
+        The width and height of a cell.
+    layers : dict
+        The cells of each layer, keyed by layer, each a dict of sets of objects keyed by (column, row).
+    spans : dict
+        The layer and range of cells each object covers, keyed by object.
+    serials : dict
+        The order objects were added in, keyed by object.
+    """
+    def __init__(self,cellsize=480):
+        """
+        Initializes the spatial hash with the given cell size.
+
+        Parameters:
+        cellsize : int
+            The width and height of a cell.
+        """
+        self.cellsize = cellsize
+        self.counter = count()
+        self.clear()
+
+    def clear(self):
+        """
+        Removes every object.
+        """
+        self.layers = {}
+        self.spans = {}
+        self.serials = {}
+
+    def __contains__(self,obj):
+        return obj in self.spans
+
+    def add(self,obj):
+        """
+        Adds an object. It won't take up any cells until it's moved.
+
+        Parameters:
+        obj : gameObject
+            The object to add.
+        """
+        self.spans[obj] = None
+        self.serials[obj] = next(self.counter)
+
+    def remove(self,obj):
+        """
+        Removes an object, if it was added.
+
+        Parameters:
+        obj : gameObject
+            The object to remove.
+        """
+        if obj in self.spans:
+            self.takeout(obj,self.spans.pop(obj))
+            del self.serials[obj]
+
+    def move(self,obj):
+        """
+        Puts an object in the cells covered by its collision points. Objects that haven't been added are ignored.
+
+        Parameters:
+        obj : gameObject
+            The object that moved.
+        """
+        if obj not in self.spans:
+            return
+        span = (obj.layer,)+self.span(obj.left[0],obj.right[0],obj.top[1],obj.bottom[1])
+        if span == self.spans[obj]:
+            return
+        self.takeout(obj,self.spans[obj])
+        self.spans[obj] = span
+        cells = self.layers.setdefault(span[0],{})
+        for col in range(span[1],span[3]+1):
+            for row in range(span[2],span[4]+1):
+                cells.setdefault((col,row),set()).add(obj)
+
+    def takeout(self,obj,span):
+        """
+        Takes an object out of the cells it was in.
+
+        Parameters:
+        obj : gameObject
+            The object to take out.
+        span : tuple
+            The layer and range of cells the object was in.
+        """
+        if span == None:
+            return
+        cells = self.layers[span[0]]
+        for col in range(span[1],span[3]+1):
+            for row in range(span[2],span[4]+1):
+                cells[(col,row)].discard(obj)
+                if not cells[(col,row)]:
+                    del cells[(col,row)]
+
+    def span(self,left,right,top,bottom):
+        """
+        Works out the range of cells covered by an area. The sides can be either way round.
+
+        Returns:
+        tuple
+            The first column, first row, last column and last row.
+        """
+        return (math.floor(min(left,right)/self.cellsize),math.floor(min(top,bottom)/self.cellsize),
+                math.floor(max(left,right)/self.cellsize),math.floor(max(top,bottom)/self.cellsize))
+
+    def nearby(self,obj,layer):
+        """
+        Finds the objects sharing a cell with an object's collision points.
+
+        Parameters:
+        obj : gameObject
+            The object to look around.
+        layer : int
+            The layer to look on, or None to look on every layer.
+
+        Returns:
+        list
+            The objects found, in the same order as they sit in the object list.
+        """
+        span = self.span(obj.left[0],obj.right[0],obj.top[1],obj.bottom[1])
+        if layer == None:
+            layers = self.layers.values()
+        elif layer in self.layers:
+            layers = [self.layers[layer]]
+        else:
+            layers = []
+        found = set()
+        for cells in layers:
+            for col in range(span[0],span[2]+1):
+                for row in range(span[1],span[3]+1):
+                    if (col,row) in cells:
+                        found.update(cells[(col,row)])
+        #the object list is sorted by depth, and then by when things were added
+        return sorted(found,key = lambda item: (-item.depth,self.serials[item]))
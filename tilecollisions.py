@@ -29,3 +29,79 @@ def hightwentytwo(pos):
         return True
     else:
         return False
+
+#the collision equation for each shape number used in tiles.json
+shapes = {1:solid,2:fortyfive,3:lowtwentytwo,4:hightwentytwo,5:slab}
+#layers store a single code per tile. 0 never collides, 1 always collides, and everything else is a (shape, flip, rotation) combination listed here
+codeshapes = [None,None]
+shapecodes = {}
+
+def tilecode(tiletype,tileflip,tilerotate):
+    """
+    Gets the collision code for a tile, with its flip and rotation folded in.
+
+    Parameters:
+    tiletype : int
+        The number of the tile.
+    tileflip : int
+        The flip value of the tile (0 for none, 1 for horizontal, 2 for both, 3 for vertical).
+    tilerotate : int
+        The number of quarter turns the tile is rotated by.
+
+    Returns:
+    int
+        The collision code of the tile.
+    """
+    if str(tiletype) not in state.tilesource["tiles"]:
+        return 0
+    shape = state.tilesource["tiles"][str(tiletype)][5]
+    if shape not in shapes:
+        return 0
+    if shape == 1:
+        return 1
+    key = (shape,tileflip,tilerotate)
+    if key not in shapecodes:
+        shapecodes[key] = len(codeshapes)
+        codeshapes.append(key)
+    return shapecodes[key]
+
+def codecollide(code,x,y):
+    """
+    Checks if a point within a tile collides with it.
+
+    Parameters:
+    code : int
+        The collision code of the tile.
+    x : float
+        The x position of the point within the tile.
+    y : float
+        The y position of the point within the tile.
+
+    Returns:
+    bool
+        True if the point is inside the solid part of the tile.
+    """
+    if code < 2:
+        return code == 1
+    shape,tileflip,tilerotate = codeshapes[code]
+    #treat the coordinates differently if the tile is flipped and/or rotated
+    if tileflip == 1:
+        x = state.tilesize - x
+    elif tileflip == 2:
+        x = state.tilesize - x
+        y = state.tilesize - y
+    elif tileflip == 3:
+        y = state.tilesize - y
+
+    if tilerotate == 1:
+        burner = y
+        y = x
+        x = state.tilesize - burner
+    elif tilerotate == 2:
+        x = state.tilesize - x
+        y = state.tilesize - y
+    elif tilerotate == 3:
+        burner = x
+        x = y
+        y = state.tilesize - burner
+    return shapes[shape]((x,y))
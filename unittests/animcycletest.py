@@ -11,6 +11,7 @@ import pygame
 import level
 import objects
 import GameData as state
+import scene
 import maker
 import Cam
 
@@ -41,7 +42,7 @@ state.maker = maker.maker()
 state.invis = (255,0,255)
 state.deltatime = 1
 state.fpsTarget = 60
-state.objects = []
+state.objects = scene.scene()
 state.cam = Cam.cam()
 state.currentlevel = level.level("Test")
 
@@ -0,0 +1,85 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import json
+import pygame
+import level
+import objects
+import GameData as state
+import scene
+import behaviours
+import maker
+import Cam
+
+import os
+os.chdir('../')
+
+pygame.init()
+state.window = pygame.display.set_mode((1,1))
+state.display = pygame.Surface((800,800))
+state.tilesize = 120
+state.screensize = (state.tilesize*30,state.tilesize*30)
+state.scaleamt = 800/state.screensize[0]
+state.movetickamount = 110
+state.tilesheet = pygame.image.load("Assets/images/tiles.png").convert()
+state.spritesheet = pygame.image.load("Assets/images/CharSprites.png").convert()
+state.objectsource = json.load(open("objects.json"))
+state.aisource = json.load(open("behaviours.json"))
+state.infosource = json.load(open("entityinfo.json"))
+state.tilesource = json.load(open("tiles.json"))
+state.gamemode = "play"
+state.maker = maker.maker()
+state.invis = (255,0,255)
+state.deltatime = 1
+state.objects = scene.scene()
+state.cam = Cam.cam()
+state.chunkcache = level.chunkcache()
+state.currentlevel = level.level("test")
+
+#unittest stuff
+import unittest
+from copy import deepcopy
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.enemy = objects.Enemy([1200,1200],0,1,"test-enemy",1,{})
+        self.other = objects.Enemy([1200,1200],0,1,"test-enemy",1,{})
+    def tearDown(self):
+        self.enemy.delete()
+        self.other.delete()
+    #behaviours should be compiled once, and shared
+    def testShared(self):
+        self.assertIs(self.enemy.behavior,self.other.behavior)
+        self.assertIs(self.enemy.behavior,behaviours.getprogram("PatrolPacifist"))
+        with self.assertRaises(AttributeError):
+            self.enemy.behavior.steps = ()
+    #running the program should do what running a copy of the behaviour through the action queue did
+    def testMatchesQueue(self):
+        self.enemy.behavior.start(self.enemy)
+        self.other.actionqueue = deepcopy(state.aisource["PatrolPacifist"])
+        for frame in range(100):
+            self.enemy.actionupdate()
+            self.other.actionupdate()
+            self.assertEqual(self.enemy.speed,self.other.speed)
+            self.assertEqual(len(self.enemy.live),len(self.other.actionqueue)+len(self.other.delayed))
+        self.assertEqual(self.enemy.running,None)
+    #setting the action queue should drop the running program
+    def testCancel(self):
+        self.enemy.behavior.start(self.enemy)
+        self.enemy.actionupdate()
+        self.enemy.actionqueue = [[0,["nothing",None],["time",10,None]]]
+        self.assertEqual(self.enemy.running,None)
+        speed = self.enemy.speed.copy()
+        self.enemy.actionupdate()
+        self.assertEqual(self.enemy.speed,speed)
+    #"spawner" placeholders should be filled in on a fresh copy each time, leaving the program as it was
+    def testSpawner(self):
+        program = behaviours.program("spawnertest",[[0,["hitboxon",[[0,0],"spawner","spawner","spawner",{"size":[10,10],"type":"dmg","amt":0,"lifespan":1,"parent":"spawner"}]],[None,None,True]]])
+        self.assertTrue(program.steps[0][3])
+        program.start(self.enemy)
+        self.enemy.actionupdate()
+        self.assertEqual(program.steps[0][2][1],"spawner")
+        self.assertEqual(program.steps[0][2][4]["parent"],"spawner")
+
+unittest.main(verbosity = 3)
+pygame.quit()
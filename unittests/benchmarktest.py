@@ -0,0 +1,40 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import pygame
+import benchmark
+import headless
+
+os.chdir('../')
+
+headless.setup(True)
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    #each level should get its timings, memory and objects, and a level that won't load shouldn't stop the rest
+    def testSuite(self):
+        report = benchmark.suite(["expo2","test"],10)
+        self.assertIn("error",report["scenarios"]["expo2"])
+        results = report["scenarios"]["test"]
+        self.assertEqual((results["frames"],len(results["frametimes"])),(10,10))
+        self.assertLessEqual(results["min"],results["avg"])
+        self.assertLessEqual(results["avg"],results["max"])
+        self.assertLessEqual(results["p50"],results["p99"])
+        self.assertGreater(results["peakmemory"],0)
+        self.assertEqual(results["objects"]["Player"],1)
+        self.assertGreaterEqual(results["peakobjects"],2)
+    #only measurements that got worse by more than the threshold, and scenarios that now fail, should be flagged
+    def testCompare(self):
+        def scenario(load,avg,p99,peakmemory):
+            return {"load":load,"avg":avg,"p99":p99,"peakmemory":peakmemory}
+        old = {"scenarios":{"a":scenario(1,10,20,100),"b":scenario(1,10,20,100),"c":{"error":"IndexError"}}}
+        new = {"scenarios":{"a":scenario(1.05,12,20,100),"b":{"error":"KeyError"},"c":scenario(1,10,20,100)}}
+        self.assertEqual(benchmark.compare(old,new),[("a","avg",10,12),("b","error",None,None)])
+        self.assertEqual(benchmark.compare(old,new,0.5),[("b","error",None,None)])
+        self.assertEqual(benchmark.compare(old,old),[])
+
+unittest.main(verbosity = 3)
+pygame.quit()
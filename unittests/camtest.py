@@ -4,6 +4,7 @@ sys.path.append("../MathWiz-ATWM")
 #create objects
 from unittest.mock import MagicMock
 import GameData as state
+import scene
 from Cam import cam 
 
 class TestCam(unittest.TestCase):
@@ -28,7 +29,7 @@ class TestCam(unittest.TestCase):
         #put it in play gamemode instead of edit
         state.gamemode = "play" 
         #no objects 
-        state.objects = []
+        state.objects = scene.scene()
         camera = cam()
         #update settings
         camera.update()
@@ -41,7 +42,7 @@ class TestCam(unittest.TestCase):
         #screen size random nums to test
         state.screensize = [600, 600]
         state.gamemode = "play"
-        state.objects = []
+        state.objects = scene.scene()
 
         #create mock object like earlier
         mock_focus_object = MagicMock()
@@ -67,7 +68,7 @@ class TestCam(unittest.TestCase):
         #same nums as above
         state.screensize = [600, 600]
         state.gamemode = "play"
-        state.objects = []
+        state.objects = scene.scene()
 
         #create mock object like earlier
         mock_focus_object = MagicMock()
@@ -94,7 +95,7 @@ class TestCam(unittest.TestCase):
         state.screensize = [600, 600]
         #set gamemode to edit
         state.gamemode = "edit"
-        state.objects = []
+        state.objects = scene.scene()
 
         camera = cam()
         camera.focus = [400, 500]
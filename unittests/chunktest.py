@@ -0,0 +1,124 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import json
+import pygame
+import level
+import objects
+import GameData as state
+import scene
+import maker
+import Cam
+
+import os
+os.chdir('../')
+
+pygame.init()
+state.window = pygame.display.set_mode((1,1))
+state.display = pygame.Surface((800,800))
+state.tilesize = 120
+state.screensize = (state.tilesize*30,state.tilesize*30)
+state.scaleamt = 800/state.screensize[0]
+state.movetickamount = 110
+state.tilesheet = pygame.image.load("Assets/images/tiles.png").convert()
+state.spritesheet = pygame.image.load("Assets/images/CharSprites.png").convert()
+state.objectsource = json.load(open("objects.json"))
+state.aisource = json.load(open("behaviours.json"))
+state.infosource = json.load(open("entityinfo.json"))
+state.tilesource = json.load(open("tiles.json"))
+state.gamemode = "play"
+state.maker = maker.maker()
+state.invis = (255,0,255)
+state.deltatime = 1
+state.objects = scene.scene()
+state.cam = Cam.cam()
+state.chunkcache = level.chunkcache()
+state.currentlevel = level.level("test")
+
+for obj in state.objects:
+    if type(obj).__name__ == "drawlayer":
+        state.Layer = obj
+        break
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        state.chunkcache = level.chunkcache()
+        state.Layer.redraw()
+        state.cam.pos = (0,0)
+        state.cam.depth = 0
+    #nothing should be drawn until the layer is seen
+    def testLazyRender(self):
+        self.assertEqual(len(state.chunkcache.chunks),0)
+        state.Layer.update()
+        self.assertEqual(len(state.chunkcache.chunks),0)
+        state.Layer.render()
+        self.assertGreater(len(state.chunkcache.chunks),0)
+        for key in state.chunkcache.chunks:
+            self.assertIs(key[0],state.Layer)
+    #only the chunks overlapping the screen should be drawn
+    def testVisibleOnly(self):
+        state.Layer.blitchunks((0,0))
+        self.assertEqual(set(state.chunkcache.chunks),{(state.Layer,0,0),(state.Layer,1,0),(state.Layer,0,1),(state.Layer,1,1)})
+        state.chunkcache = level.chunkcache()
+        state.Layer.blitchunks((-state.tilesize*20,-state.tilesize*20))
+        self.assertEqual(set(state.chunkcache.chunks),{(state.Layer,1,1)})
+    #chunks past the budget should be thrown out, oldest first
+    def testBudget(self):
+        chunk = state.Layer.getchunk(0,0)
+        state.chunkcache = level.chunkcache(state.chunkcache.chunksize(chunk)*2)
+        state.Layer.getchunk(0,0)
+        state.Layer.getchunk(1,0)
+        state.Layer.getchunk(0,0)
+        state.Layer.getchunk(0,1)
+        self.assertEqual(list(state.chunkcache.chunks),[(state.Layer,0,0),(state.Layer,0,1)])
+        self.assertLessEqual(state.chunkcache.used,state.chunkcache.budget)
+    #re-rendering the layer should throw out its chunks
+    def testRedraw(self):
+        state.Layer.render()
+        state.Layer.redraw()
+        self.assertEqual(len(state.chunkcache.chunks),0)
+        self.assertEqual(state.chunkcache.used,0)
+    #a layer made smaller, the way the editor cuts rows and columns, should draw at its new size
+    def testShrink(self):
+        #the editor always has maps as lists of rows
+        state.gamemode = "edit"
+        state.editobjs = []
+        shrunk = level.level("test")
+        state.gamemode = "play"
+        layer = shrunk.layers[0]
+        for grid in (shrunk.tilemap,shrunk.pallatemap,shrunk.spinmap,shrunk.flipmap):
+            del grid[0][layer.tallest-3:]
+            for row in grid[0]:
+                del row[2:7]
+        layer.calcsize()
+        layer.redraw()
+        self.assertEqual((layer.tallest,layer.longest),(len(shrunk.tilemap[0]),max(len(row) for row in shrunk.tilemap[0])))
+        self.assertEqual(len(layer.collisionmap),layer.tallest)
+        for chunkcol in range(layer.chunkcols):
+            for chunkrow in range(layer.chunkrows):
+                layer.getchunk(chunkcol,chunkrow)
+        state.cam.pos = (layer.width-state.screensize[0],layer.height-state.screensize[1])
+        layer.render()
+    #redrawing a layer whose maps have changed size should work its size out again, rather than draw from the old one
+    def testRedrawResized(self):
+        state.gamemode = "edit"
+        state.editobjs = []
+        resized = level.level("test")
+        state.gamemode = "play"
+        layer = resized.layers[0]
+        for grid in (resized.tilemap,resized.pallatemap,resized.spinmap,resized.flipmap):
+            del grid[0][1:4]
+            for row in grid[0]:
+                del row[-6:]
+        layer.redraw()
+        self.assertEqual(layer.rowlengths,[len(row) for row in resized.tilemap[0]])
+        self.assertEqual(len(layer.collisionmap),layer.tallest)
+        for chunkcol in range(layer.chunkcols):
+            for chunkrow in range(layer.chunkrows):
+                layer.getchunk(chunkcol,chunkrow)
+
+unittest.main(verbosity = 3)
+pygame.quit()
@@ -0,0 +1,101 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import json
+import pygame
+import level
+import objects
+import GameData as state
+import scene
+import maker
+import Cam
+import random
+import tilecollisions
+
+import os
+os.chdir('../')
+
+pygame.init()
+state.window = pygame.display.set_mode((1,1))
+state.display = pygame.Surface((800,800))
+state.tilesize = 120
+state.screensize = (state.tilesize*30,state.tilesize*30)
+state.scaleamt = 800/state.screensize[0]
+state.movetickamount = 110
+state.tilesheet = pygame.image.load("Assets/images/tiles.png").convert()
+state.spritesheet = pygame.image.load("Assets/images/CharSprites.png").convert()
+state.objectsource = json.load(open("objects.json"))
+state.aisource = json.load(open("behaviours.json"))
+state.infosource = json.load(open("entityinfo.json"))
+state.tilesource = json.load(open("tiles.json"))
+state.gamemode = "play"
+state.maker = maker.maker()
+state.invis = (255,0,255)
+state.deltatime = 1
+state.objects = scene.scene()
+state.cam = Cam.cam()
+state.chunkcache = level.chunkcache()
+state.currentlevel = level.level("test")
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        state.Layer = state.currentlevel.layers[0]
+        state.Layer.bakecollision()
+    #every tile should get the code for its shape, flip and rotation
+    def testBaked(self):
+        tilemap = state.currentlevel.tilemap[0]
+        for row in range(len(tilemap)):
+            for tile in range(len(tilemap[row])):
+                code = state.Layer.collisionmap[row][tile]
+                shape = state.tilesource["tiles"][str(tilemap[row][tile])][5]
+                if shape in (0,1):
+                    self.assertEqual(code,shape)
+                else:
+                    self.assertEqual(tilecollisions.codeshapes[code],(shape,state.currentlevel.flipmap[0][row][tile],state.currentlevel.spinmap[0][row][tile]))
+    #flips should be folded into the code
+    def testFlipped(self):
+        upright = tilecollisions.tilecode(2,0,0)
+        flipped = tilecollisions.tilecode(2,1,0)
+        self.assertNotEqual(upright,flipped)
+        self.assertTrue(tilecollisions.codecollide(upright,state.tilesize-1,state.tilesize-1))
+        self.assertFalse(tilecollisions.codecollide(flipped,state.tilesize-1,1))
+        self.assertTrue(tilecollisions.codecollide(flipped,1,state.tilesize-1))
+    #changing a tile should only need that tile worked out again
+    def testUpdate(self):
+        tilemap = state.currentlevel.tilemap[0]
+        old = tilemap[0][0]
+        tilemap[0][0] = 1
+        state.Layer.collisionupdate(0,0)
+        self.assertEqual(state.Layer.collisionmap[0][0],1)
+        tilemap[0][0] = 0
+        state.Layer.collisionupdate(0,0)
+        self.assertEqual(state.Layer.collisionmap[0][0],0)
+        tilemap[0][0] = old
+        state.Layer.collisionupdate(0,0)
+    #going a tile at a time should give the same distances as testing every pixel
+    def testProbe(self):
+        character = [obj for obj in state.objects if isinstance(obj,objects.character)][0]
+        random.seed(0)
+        for test in range(300):
+            point = [random.randint(-200,state.Layer.width+200),random.randint(-200,state.Layer.height+200)]
+            axis = random.randint(0,1)
+            step = random.choice([1,-1])
+            collides = random.choice([True,False])
+            expected = None
+            for dist in range(1,601):
+                moved = point.copy()
+                moved[axis] += step*dist
+                if (character.pointcollide(moved) == True) == collides:
+                    expected = dist
+                    break
+            self.assertEqual(character.probe(point,axis,step,600,collides),expected)
+    #short rows should be padded out as solid
+    def testPadding(self):
+        for row in state.Layer.collisionmap:
+            self.assertEqual(len(row),state.Layer.longest)
+
+unittest.main(verbosity = 3)
+pygame.quit()
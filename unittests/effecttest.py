@@ -0,0 +1,65 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import json
+import pygame
+import level
+import objects
+import GameData as state
+import scene
+import maker
+import Cam
+
+import os
+os.chdir('../')
+
+pygame.init()
+state.window = pygame.display.set_mode((1,1))
+state.display = pygame.Surface((800,800))
+state.tilesize = 120
+state.screensize = (state.tilesize*30,state.tilesize*30)
+state.scaleamt = 800/state.screensize[0]
+state.movetickamount = 110
+state.tilesheet = pygame.image.load("Assets/images/tiles.png").convert()
+state.spritesheet = pygame.image.load("Assets/images/CharSprites.png").convert()
+state.objectsource = json.load(open("objects.json"))
+state.aisource = json.load(open("behaviours.json"))
+state.infosource = json.load(open("entityinfo.json"))
+state.tilesource = json.load(open("tiles.json"))
+state.gamemode = "play"
+state.maker = maker.maker()
+state.invis = (255,0,255)
+state.deltatime = 1
+state.objects = scene.scene()
+state.cam = Cam.cam()
+state.chunkcache = level.chunkcache()
+state.currentlevel = level.level("test")
+
+#unittest stuff
+import unittest
+import effects
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.enemy = objects.Enemy([1200,1200],0,1,"test-enemy",1,{})
+    def tearDown(self):
+        self.enemy.delete()
+    #a blink should start on, toggle every so often, and stop after its length
+    def testBlink(self):
+        timeline = effects.timeline("blinktest",[{"Blink":"Stun","Start":2,"Every":3,"For":9}])
+        self.assertEqual(timeline.length,11)
+        self.assertEqual([timeline.pallate(time) for time in range(12)],[None,None,"Stun","Stun","Stun",None,None,None,"Stun","Stun","Stun",None])
+    #the character's pallate should follow the effect, and go back once it's over, without anything being queued
+    def testPlay(self):
+        timeline = effects.gettimeline("HitFlash")
+        pallate = self.enemy.pallate
+        self.enemy.playeffect("HitFlash")
+        for frame in range(int(timeline.length)+2):
+            self.enemy.actionupdate()
+            self.assertEqual(self.enemy.pallate,timeline.pallate(frame) or pallate)
+            self.assertEqual(self.enemy.actionqueue,[])
+        self.assertEqual(self.enemy.effects,{})
+        self.assertEqual(self.enemy.storepal,None)
+
+unittest.main(verbosity = 3)
+pygame.quit()
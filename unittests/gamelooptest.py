@@ -0,0 +1,70 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import GameData as state
+import scene
+import gameloop
+
+#stand-ins for the camera and objects, with just the things the game loop looks at
+class camera:
+    def __init__(self):
+        self.pos = (0,0)
+        self.lastpos = (0,0)
+        self.depth = 0
+    def update(self):
+        self.lastpos = self.pos
+        self.pos = (self.pos[0]+10,self.pos[1])
+class mover:
+    def __init__(self):
+        self.depth = 0
+        self.pos = [0,0]
+        self.updates = 0
+        self.drawn = []
+    def update(self):
+        self.updates += 1
+        self.pos[0] += 4
+    def render(self):
+        self.drawn.append((list(self.pos),state.cam.pos))
+class display:
+    def fill(self,color):
+        pass
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        state.objects = scene.scene()
+        state.cam = camera()
+        state.display = display()
+        self.mover = mover()
+        state.objects.append(self.mover)
+    #time should build up until there's a whole step to run, and leftovers should carry over
+    def testAccumulate(self):
+        stepper = gameloop.fixedstep(50,5)
+        self.assertEqual([stepper.advance(time) for time in [10,15,20,40,5]],[0,1,1,2,0])
+        self.assertAlmostEqual(stepper.alpha(),0.5)
+    #no more than maxsteps should be run in a frame, and the rest of the time dropped
+    def testMaxSteps(self):
+        stepper = gameloop.fixedstep(50,3)
+        self.assertEqual(stepper.advance(210),3)
+        self.assertAlmostEqual(stepper.accumulator,10)
+        self.assertAlmostEqual(stepper.dropped,140)
+        self.assertEqual(stepper.advance(10),1)
+    #stepping should update things without drawing them, and drawing shouldn't update them
+    def testSeparate(self):
+        gameloop.step()
+        self.assertEqual((self.mover.updates,self.mover.drawn),(1,[]))
+        gameloop.render()
+        gameloop.render()
+        self.assertEqual(self.mover.updates,1)
+        self.assertEqual(self.mover.drawn,[([4,0],(10,0)),([4,0],(10,0))])
+    #drawing between steps should place things and the camera partway, then put them back
+    def testInterpolate(self):
+        gameloop.step()
+        gameloop.step()
+        gameloop.render(0.25)
+        self.assertEqual(self.mover.drawn,[([5,0],(12.5,0))])
+        self.assertEqual((self.mover.pos,state.cam.pos),([8,0],(20,0)))
+
+unittest.main(verbosity = 3)
@@ -0,0 +1,46 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import pygame
+import GameData as state
+import audio
+import headless
+
+import os
+os.chdir('../')
+
+headless.setup()
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    #a headless run shouldn't draw anything or play any sound, and should say where the time went
+    def testRun(self):
+        state.display.fill((1,2,3))
+        results = headless.run("test",30)
+        self.assertFalse(audio.enabled)
+        self.assertEqual(results["frames"],30)
+        self.assertGreater(results["fps"],0)
+        self.assertIn("Player",results["timings"])
+        self.assertIn("Camera",results["timings"])
+        self.assertEqual(pygame.transform.average_color(state.display)[:3],(1,2,3))
+    #keys should stay down until the script says otherwise, and only count as new on the frame they go down
+    def testScript(self):
+        script = headless.inputscript([[0,["d"]],[2,["d","space"]],[4,[]]])
+        seen = []
+        for frame in range(5):
+            script.apply()
+            seen.append((state.keys[pygame.K_d],state.keys[pygame.K_SPACE],state.newkeys))
+        self.assertEqual(seen,[(True,False,[pygame.K_d]),(True,False,[]),(True,True,[pygame.K_SPACE]),(True,True,[]),(False,False,[])])
+    #scripted input should move the player
+    def testInput(self):
+        headless.run("test",1)
+        player = next(iter(state.objects.oftype("Player")))
+        start = player.pos[0]
+        headless.run("test",200,[[0,["d"]]])
+        player = next(iter(state.objects.oftype("Player")))
+        self.assertGreater(player.pos[0],start)
+
+unittest.main(verbosity = 3)
+pygame.quit()
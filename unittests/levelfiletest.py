@@ -0,0 +1,94 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import json
+import numpy
+import pygame
+import GameData as state
+import headless
+import level
+import levelfile
+import menufuncs
+
+os.chdir('../')
+
+headless.setup(True)
+
+#a small level with rows of different lengths
+ragged = {"layerdepths":[1],"layerparallaxes":[1],"layerloops":[[False,False]],"animations":[[["tilemap",0,0,[[0,60],[2,60]]]]],
+          "tiles":[[[1,2,3],[4],[5,1,1,1]]],"flips":[[[0,1,0],[0],[3,0,0,0]]],"rotates":[[[0,0,2],[1],[0,0,0,0]]],"pallates":[[[0,1,0],[0],[0,0,0,1]]],
+          "objects":[["Player","MathWiz",[50,50],0,1,0,{}]]}
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def tearDown(self):
+        for extension in ("json","mwl"):
+            if os.path.exists(f"Leveldata/levelfiletest.{extension}"):
+                os.remove(f"Leveldata/levelfiletest.{extension}")
+    #a level should come back out of the binary form as it went in, rows of different lengths and all
+    def testRoundTrip(self):
+        json.dump(ragged,open("Leveldata/levelfiletest.json","w"))
+        levelfile.tobinary("levelfiletest")
+        data = levelfile.read("Leveldata/levelfiletest.mwl")
+        self.assertEqual(data["tiles"][0].shape,(3,4))
+        #plain arrays, as numpy's memmap type is slow to index
+        self.assertIs(type(data["tiles"][0]),numpy.ndarray)
+        self.assertEqual(data["rowlengths"],[[3,1,4]])
+        self.assertEqual(levelfile.unpack(data),ragged)
+        os.remove("Leveldata/levelfiletest.json")
+        levelfile.tojson("levelfiletest")
+        self.assertEqual(json.load(open("Leveldata/levelfiletest.json")),ragged)
+    #the binary form should only be used while it matches the JSON file, and never by the editor
+    def testStale(self):
+        json.dump(ragged,open("Leveldata/levelfiletest.json","w"))
+        levelfile.tobinary("levelfiletest")
+        self.assertIsInstance(levelfile.load("levelfiletest")["tiles"][0],numpy.ndarray)
+        self.assertIsInstance(levelfile.load("levelfiletest",False)["tiles"][0],list)
+        changed = dict(ragged,objects = [])
+        json.dump(changed,open("Leveldata/levelfiletest.json","w"))
+        self.assertEqual(levelfile.load("levelfiletest"),changed)
+    #the JSON file should only be hashed again once its size or time change
+    def testStamp(self):
+        json.dump(ragged,open("Leveldata/levelfiletest.json","w"))
+        levelfile.tobinary("levelfiletest")
+        before = os.stat("Leveldata/levelfiletest.json")
+        #the same size, and put back to the same time, so only a hash would notice
+        changed = json.dumps(ragged).replace('"MathWiz"','"MathWaz"')
+        open("Leveldata/levelfiletest.json","w").write(changed)
+        os.utime("Leveldata/levelfiletest.json",ns = (before.st_atime_ns,before.st_mtime_ns))
+        self.assertEqual(levelfile.load("levelfiletest")["objects"][0][1],"MathWiz")
+        os.utime("Leveldata/levelfiletest.json",ns = (before.st_atime_ns,before.st_mtime_ns+1000))
+        self.assertEqual(levelfile.load("levelfiletest")["objects"][0][1],"MathWaz")
+    #numbers too big for their map should be caught rather than wrapped around
+    def testRange(self):
+        self.assertRaises(ValueError,levelfile.pack,dict(ragged,flips = [[[0,256,0],[0],[0,0,0,0]]]))
+    #a level read from the binary form should collide, draw and animate the same as one read from JSON
+    def testSame(self):
+        json.dump(ragged,open("Leveldata/levelfiletest.json","w"))
+        results = []
+        for packed in (False,True):
+            if packed:
+                levelfile.tobinary("levelfiletest")
+            menufuncs.loadlevel("levelfiletest")
+            layer = state.level.layers[0]
+            chunk = pygame.image.tobytes(layer.getchunk(0,0),"RGBA")
+            state.deltatime = 60
+            layer.update()
+            results.append((layer.longest,layer.tallest,[bytes(row) for row in layer.collisionmap],chunk,int(state.level.tilemap[0][0][0])))
+        self.assertIsInstance(state.level.tilemap[0],numpy.ndarray)
+        self.assertEqual(results[0],results[1])
+        self.assertEqual(results[1][4],2)
+        #changes are only made in memory, never to the file
+        self.assertEqual(levelfile.read("Leveldata/levelfiletest.mwl")["tiles"][0][0,0],1)
+        state.deltatime = 1
+    #packed maps should take five bytes a tile
+    def testSize(self):
+        data = levelfile.read("Leveldata/expofinal.mwl")
+        tiles = sum(array.size for array in data["tiles"])
+        self.assertEqual(sum(data[key][layer].nbytes for key,kind in levelfile.maps for layer in range(len(data["tiles"]))),tiles*5)
+
+unittest.main(verbosity = 3)
+pygame.quit()
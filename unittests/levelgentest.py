@@ -0,0 +1,64 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import json
+import pygame
+import GameData as state
+import headless
+import levelgen
+
+os.chdir('../')
+
+headless.setup()
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.level = levelgen.generate(width = 120,height = 30,layers = 3,animations = 10,enemies = 8,spawners = 2,platforms = 4,recolor = 0.1,seed = 5)
+    def tearDown(self):
+        if os.path.exists("Leveldata/levelgentest.json"):
+            os.remove("Leveldata/levelgentest.json")
+    #every layer should have a tile, flip, rotation and pallate for each spot, and only use real tiles and objects
+    def testShape(self):
+        tiles = json.load(open("tiles.json"))
+        objectsource = json.load(open("objects.json"))
+        for key in ("layerdepths","layerparallaxes","layerloops","animations","tiles","flips","rotates","pallates"):
+            self.assertEqual(len(self.level[key]),3,key)
+        self.assertEqual((len(self.level["tiles"][2]),len(self.level["tiles"][2][0])),(30,120))
+        for layer in range(3):
+            for key in ("flips","rotates","pallates"):
+                self.assertEqual([len(row) for row in self.level[key][layer]],[len(row) for row in self.level["tiles"][layer]])
+            self.assertTrue(all(str(tilenum) in tiles["tiles"] for row in self.level["tiles"][layer] for tilenum in row))
+        self.assertEqual(len(self.level["animations"][2]),10)
+        counts = {}
+        for item in self.level["objects"]:
+            self.assertEqual(objectsource[item[1]]["Type"],item[0])
+            counts[item[0]] = counts.get(item[0],0)+1
+        self.assertEqual((counts["Player"],counts["Enemy"],counts["spawner"],counts.get("Platform",0)+counts.get("CollapsingPlatform",0)),(1,8,2,4))
+    #the same settings and seed should always make the same level
+    def testSeed(self):
+        self.assertEqual(levelgen.generate(width = 120,height = 30,layers = 3,animations = 10,enemies = 8,spawners = 2,platforms = 4,recolor = 0.1,seed = 5),self.level)
+        self.assertNotEqual(levelgen.generate(width = 120,height = 30,seed = 6)["tiles"],self.level["tiles"])
+    #levels too narrow to place objects in should be turned down clearly
+    def testWidth(self):
+        self.assertRaises(ValueError,levelgen.generate,width = levelgen.minwidth-1)
+        made = levelgen.generate(width = levelgen.minwidth,height = 20)
+        self.assertEqual(len(made["tiles"][-1][0]),levelgen.minwidth)
+    #a generated level should load and play, spawners and all
+    def testLoad(self):
+        #a spawner just off screen ahead of the player, so it spawns once the player runs toward it
+        player = self.level["objects"][0]
+        self.level["objects"].append(["spawner","ExponentQuestionSpawner",[player[2][0]+35*120,player[2][1]],0,1.0,player[5],{}])
+        levelgen.write("levelgentest",self.level)
+        results = headless.run("levelgentest",300,[[0,["d"]]])
+        self.assertEqual(results["frames"],300)
+        self.assertEqual(len(state.level.layers),3)
+        player = next(iter(state.objects.oftype("Player")))
+        self.assertTrue(player.grounded)
+        self.assertTrue(any(type(item).__name__ == "Sign" for item in state.objects))
+
+unittest.main(verbosity = 3)
+pygame.quit()
@@ -0,0 +1,89 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import json
+import pygame
+import GameData as state
+import gameloop
+import headless
+import level
+import menufuncs
+
+os.chdir('../')
+
+headless.setup(True)
+
+def snapshot():
+    #everything a restart has to put back: the maps, collision, what the layers have drawn, and the objects
+    layers = []
+    for layer in state.level.layers:
+        maps = [[[int(value) for value in row] for row in getattr(state.level,name)[layer.layernum]] for name in ("tilemap","flipmap","spinmap","pallatemap")]
+        chunks = [pygame.image.tobytes(layer.getchunk(col,row),"RGBA") for col in range(min(layer.chunkcols,4)) for row in range(min(layer.chunkrows,4))]
+        layers.append((maps,[bytes(row) for row in layer.collisionmap],chunks,layer.animtimers,layer.animframes))
+    objects = [(type(item).__name__,list(item.pos)) for item in state.objects if hasattr(item,"actionqueue")]
+    return layers,objects
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        level.templates.clear()
+    def tearDown(self):
+        level.templatelimit = 4
+        if os.path.exists("Leveldata/leveltemplatetest.json"):
+            os.remove("Leveldata/leveltemplatetest.json")
+    #playing a level again should reuse it and its rendered chunks, and leave it just as a fresh load would
+    def testRestart(self):
+        headless.run("expofinal",300,[[0,["d"]],[120,["a","w"]]],True)
+        played = state.level
+        animated = [layer for layer in played.layers if layer.animationlist]
+        self.assertTrue(any(int(getattr(played,sequence[0])[layer.layernum][sequence[2]][sequence[1]]) != start
+                            for layer in animated for sequence,start in zip(layer.animationlist,layer.animstarts)))
+        chunks = set(state.chunkcache.chunks)
+        menufuncs.loadlevel("expofinal")
+        self.assertIs(state.level,played)
+        self.assertEqual({layer for layer in state.objects if isinstance(layer,level.drawlayer)},set(played.layers))
+        self.assertTrue(chunks and chunks <= set(state.chunkcache.chunks))
+        restarted = snapshot()
+        level.templates.clear()
+        menufuncs.loadlevel("expofinal")
+        self.assertIsNot(state.level,played)
+        self.assertEqual(restarted,snapshot())
+    #restarting partway through a step shouldn't let the rest of the step update the reused layers
+    def testRestartMidStep(self):
+        headless.run("expofinal",60)
+        class restarter:
+            #deeper than everything, so it's updated first
+            depth = 1000
+            def update(self):
+                menufuncs.loadlevel("expofinal")
+        state.objects.append(restarter())
+        gameloop.step()
+        self.assertEqual([layer.animtimers for layer in state.level.layers],[[0]*len(layer.animationlist) for layer in state.level.layers])
+    #a level whose file has changed should be loaded again
+    def testChanged(self):
+        made = json.load(open("Leveldata/test.json"))
+        json.dump(made,open("Leveldata/leveltemplatetest.json","w"))
+        menufuncs.loadlevel("leveltemplatetest")
+        first = state.level
+        menufuncs.loadlevel("leveltemplatetest")
+        self.assertIs(state.level,first)
+        made["objects"] = made["objects"]*2
+        json.dump(made,open("Leveldata/leveltemplatetest.json","w"))
+        menufuncs.loadlevel("leveltemplatetest")
+        self.assertIsNot(state.level,first)
+        self.assertEqual(len(state.level.objs),len(first.objs)*2)
+    #only so many levels should be kept, and the chunks of those dropped should go with them
+    def testLimit(self):
+        level.templatelimit = 1
+        menufuncs.loadlevel("test")
+        first = state.level
+        first.layers[0].getchunk(0,0)
+        menufuncs.loadlevel("divtest")
+        self.assertEqual(list(level.templates),["divtest"])
+        self.assertFalse(any(key[0] in first.layers for key in state.chunkcache.chunks))
+
+unittest.main(verbosity = 3)
+pygame.quit()
@@ -0,0 +1,42 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import random
+import pygame
+import GameData as state
+import headless
+import microbench
+
+os.chdir('../')
+
+headless.setup(True)
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    #every benchmark should set up and run
+    def testAll(self):
+        for name,(setup,args) in microbench.benchmarks.items():
+            random.seed(0)
+            run,size = setup(*args)
+            run()
+            self.assertGreater(size,0,name)
+    #points on sloped ground should land on both sides of the slope, so the slope's equation is what gets measured
+    def testSlopes(self):
+        for kind in microbench.grounds:
+            top = microbench.ground(microbench.grounds[kind])
+            mover = microbench.makecharacter((0,0))
+            hits = {bool(mover.pointcollide((x*7.3,top+y*11.1))) for x in range(100) for y in range(10)}
+            self.assertEqual(hits,{True} if kind == "flat" else {True,False},kind)
+    #results should come back per operation
+    def testMeasure(self):
+        results = microbench.measure("checkobjcollide 100",0.01,2)
+        self.assertEqual(results["name"],"checkobjcollide 100")
+        self.assertGreater(results["ops"],0)
+        self.assertAlmostEqual(results["us"],1000000/results["ops"])
+        self.assertGreaterEqual(results["peakbytes"],0)
+
+unittest.main(verbosity = 3)
+pygame.quit()
@@ -3,6 +3,7 @@ import unittest
 import objects
 import moves
 import GameData as state
+import scene
 import pygame
 from unittest.mock import patch
 
@@ -28,7 +29,7 @@ state.explosion_sound = pygame.mixer.Sound("Assets/sounds/sfx/Explosion.mp3")
 state.hit_sound = pygame.mixer.Sound("Assets/sounds/sfx/Magic Hit.mp3")
 state.enemy_defeat_sound = pygame.mixer.Sound("Assets/sounds/sfx/EnemyDeath.mp3")
 
-state.objects = []
+state.objects = scene.scene()
 
 class movesTests(unittest.TestCase):
 
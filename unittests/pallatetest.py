@@ -0,0 +1,43 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import pygame
+import pallates
+
+pygame.init()
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        pallates.remaptables.clear()
+        self.surface = pygame.Surface((3,1))
+        self.surface.set_at((0,0),(255,0,0))
+        self.surface.set_at((1,0),(0,255,0))
+        self.surface.set_at((2,0),(0,0,255))
+    #each color in the source pallate should become the matching color in the target
+    def testSwap(self):
+        pallates.recolor(self.surface,[(255,0,0),(0,0,255)],[(10,10,10),(20,20,20)])
+        self.assertEqual(self.surface.get_at((0,0))[:3],(10,10,10))
+        self.assertEqual(self.surface.get_at((1,0))[:3],(0,255,0))
+        self.assertEqual(self.surface.get_at((2,0))[:3],(20,20,20))
+    #a color changed into a later source color should be changed again, like the old one-at-a-time swap
+    def testChain(self):
+        pallates.recolor(self.surface,[(255,0,0),(0,255,0)],[(0,255,0),(1,1,1)])
+        self.assertEqual(self.surface.get_at((0,0))[:3],(1,1,1))
+        self.assertEqual(self.surface.get_at((1,0))[:3],(1,1,1))
+    #the table for a pair of pallates should only be worked out once
+    def testCached(self):
+        pallates.recolor(self.surface,[(255,0,0)],[(1,1,1)])
+        pallates.recolor(self.surface.copy(),[(255,0,0)],[(1,1,1)])
+        self.assertEqual(len(pallates.remaptables),1)
+    #alpha should be left alone
+    def testAlpha(self):
+        surface = pygame.Surface((1,1),pygame.SRCALPHA)
+        surface.fill((255,0,0,100))
+        pallates.recolor(surface,[(255,0,0)],[(1,2,3)])
+        self.assertEqual(tuple(surface.get_at((0,0))),(1,2,3,100))
+
+unittest.main(verbosity = 3)
+pygame.quit()
@@ -0,0 +1,165 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import json
+import pygame
+import level
+import objects
+import GameData as state
+import scene
+import maker
+import Cam
+import particles
+
+import os
+os.chdir('../')
+
+pygame.init()
+state.window = pygame.display.set_mode((1,1))
+state.display = pygame.Surface((800,800))
+state.tilesize = 120
+state.screensize = (state.tilesize*30,state.tilesize*30)
+state.scaleamt = 800/state.screensize[0]
+state.movetickamount = 110
+state.tilesheet = pygame.image.load("Assets/images/tiles.png").convert()
+state.spritesheet = pygame.image.load("Assets/images/CharSprites.png").convert()
+state.objectsource = json.load(open("objects.json"))
+state.aisource = json.load(open("behaviours.json"))
+state.infosource = json.load(open("entityinfo.json"))
+state.tilesource = json.load(open("tiles.json"))
+state.particlesource = json.load(open("particles.json"))
+state.gamemode = "play"
+state.maker = maker.maker()
+state.invis = (255,0,255)
+state.deltatime = 1
+state.objects = scene.scene()
+state.cam = Cam.cam()
+state.chunkcache = level.chunkcache()
+state.currentlevel = level.level("test")
+state.level = state.currentlevel
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        state.particleManager = particles.ParticleManager()
+        state.particleManager.reset()
+        self.frames = [[0,0,10,10,0,0,0,2],[10,0,10,10,0,0,0,1]]
+    #speed should build up, and be pulled back to the terminal velocity once it's gone past
+    def testMovement(self):
+        state.particleManager.spawn(0,[0,0],self.frames,[0,-4],[3,1],[5,5],100)
+        layer = state.particleManager.particles[0]
+        speeds = []
+        for frame in range(4):
+            state.particleManager.updateLayer(0)
+            speeds.append(layer.speed[0].tolist())
+        self.assertEqual(speeds,[[3,-3],[6,-2],[5,-1],[8,0]])
+        self.assertEqual(layer.pos[0].tolist(),[22,-6])
+    #frames should move along by their ticktime, and loop
+    def testFrames(self):
+        state.particleManager.spawn(0,[0,0],self.frames,[0,0],[0,0],[0,0],100)
+        layer = state.particleManager.particles[0]
+        seen = []
+        for frame in range(6):
+            state.particleManager.updateLayer(0)
+            seen.append(int(layer.frame[0]))
+        self.assertEqual(seen,[0,1,0,0,1,0])
+    #particles should be thrown out when their lifespan is up, leaving the rest in order
+    def testLifespan(self):
+        for lifespan in [3,1,5,1,2]:
+            state.particleManager.spawn(0,[lifespan,0],self.frames,[0,0],[0,0],[0,0],lifespan)
+        layer = state.particleManager.particles[0]
+        state.particleManager.updateLayer(0)
+        self.assertEqual(layer.pos[:len(layer),0].tolist(),[3,5,2])
+        for frame in range(2):
+            state.particleManager.updateLayer(0)
+        self.assertEqual(layer.pos[:len(layer),0].tolist(),[5])
+    #the arrays should grow to fit any number of particles
+    def testGrow(self):
+        for spot in range(200):
+            state.particleManager.spawn(0,[spot,0],self.frames,[0,0],[0,0],[0,0],10)
+        layer = state.particleManager.particles[0]
+        self.assertEqual(len(layer),200)
+        self.assertEqual(layer.pos[:200,0].tolist(),list(range(200)))
+    #emitters should be worked out once, and each spawn should only add the burst's particles
+    def testEmitter(self):
+        caller = objects.gameObject([600,600],0,1,0,{})
+        caller.size = [120,60]
+        caller.getpoints()
+        state.particleManager.emit("WoodPlank",caller)
+        frames = len(state.particleManager.frames)
+        state.particleManager.emit("WoodPlank",caller)
+        layer = state.particleManager.particles[0]
+        self.assertEqual(len(layer),8)
+        self.assertEqual(len(state.particleManager.frames),frames)
+        self.assertEqual(layer.pos[:4].tolist(),[caller.left[:1]+caller.top[1:],caller.left[:1]+caller.bottom[1:],caller.right[:1]+caller.top[1:],caller.right[:1]+caller.bottom[1:]])
+        self.assertEqual(set(layer.start[:8].tolist()),{state.particleManager.emitter("WoodPlank").start})
+        with self.assertRaises(AttributeError):
+            state.particleManager.emitter("WoodPlank").lifespan = 1
+        caller.delete()
+    #particles off screen shouldn't be drawn, but should still be moved
+    def testCull(self):
+        state.cam.pos = [0,0]
+        state.particleManager.spawn(0,[100,100],self.frames,[1,0],[0,0],[5,5],10)
+        state.particleManager.spawn(0,[-5000,100],self.frames,[1,0],[0,0],[5,5],10)
+        state.particleManager.updateLayer(0)
+        state.particleManager.drawLayer(0)
+        layer = state.particleManager.particles[0]
+        self.assertEqual((layer.drawn,layer.culled),(1,1))
+        self.assertEqual(layer.pos[:2,0].tolist(),[101,-4999])
+    #going over budget should throw out the oldest particles, or the least important ones
+    def testBudget(self):
+        state.particleManager.budget = 3
+        for spot in range(5):
+            state.particleManager.spawn(0,[spot,0],self.frames,[0,0],[0,0],[0,0],10,[1,0,2,0,1][spot])
+        layer = state.particleManager.particles[0]
+        state.particleManager.updateLayer(0)
+        self.assertEqual(layer.pos[:len(layer),0].tolist(),[2,3,4])
+        self.assertEqual(state.particleManager.stats()["evicted"],2)
+        state.particleManager.reset()
+        state.particleManager.eviction = "priority"
+        for spot in range(5):
+            state.particleManager.spawn(0,[spot,0],self.frames,[0,0],[0,0],[0,0],10,[1,0,2,0,1][spot])
+        layer = state.particleManager.particles[0]
+        state.particleManager.updateLayer(0)
+        self.assertEqual(layer.pos[:len(layer),0].tolist(),[0,2,4])
+        state.particleManager.updateLayer(0)
+        self.assertEqual(state.particleManager.stats()["evicted"],0)
+    #particles should be drawn partway between where they were before the last update and where they are now
+    def testInterpolation(self):
+        state.cam.pos = [0,0]
+        class recording(pygame.Surface):
+            def blits(self,sequence,doreturn = True):
+                self.spots = [spot for sheet,spot,area in sequence]
+        display = state.display
+        state.display = recording((800,800))
+        state.particleManager.spawn(0,[100,100],self.frames,[3,0],[1,0],[10,10],100)
+        spots = []
+        #a particle that hasn't been updated yet hasn't moved, so it should be drawn where it was made
+        for alpha in (1,0,None,0,0.5,1):
+            if alpha == None:
+                state.particleManager.updateLayer(0)
+                continue
+            state.particleManager.drawLayer(0,alpha)
+            spots.append(state.display.spots[0])
+        state.display = display
+        self.assertEqual(spots[1],spots[0])
+        self.assertEqual(spots[2],spots[0])
+        self.assertNotEqual(spots[4],spots[0])
+        self.assertAlmostEqual(spots[3][0],(spots[2][0]+spots[4][0])/2)
+        self.assertEqual(spots[3][1],spots[2][1])
+    #particles off screen should only move every so often, catching up when they do
+    def testOffscreenRate(self):
+        state.cam.pos = [0,0]
+        state.particleManager.offscreenrate = 3
+        state.particleManager.spawn(0,[-5000,100],self.frames,[2,0],[0,0],[5,5],100)
+        layer = state.particleManager.particles[0]
+        seen = []
+        for frame in range(6):
+            state.particleManager.updateLayer(0)
+            seen.append(layer.pos[0,0])
+        self.assertEqual(seen,[-5000,-5000,-4994,-4994,-4994,-4988])
+
+unittest.main(verbosity = 3)
+pygame.quit()
@@ -0,0 +1,76 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import pygame
+import GameData as state
+import headless
+import objects
+import profiler
+
+os.chdir('../')
+
+headless.setup(True)
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.profiler = profiler.profiler(window = 10)
+    def tearDown(self):
+        self.profiler.disable()
+    #statistics should only cover the frames in the window, and zones that don't come up count as 0
+    def testStats(self):
+        for frame in range(15):
+            self.profiler.begin()
+            self.profiler.frame["Update"] = frame/1000
+            if frame == 14:
+                self.profiler.frame["Load"] = 0.5
+            self.profiler.end()
+        self.assertEqual(len(self.profiler.history["Update"]),10)
+        low,average,high = self.profiler.stats("Update")
+        self.assertAlmostEqual(low,5)
+        self.assertAlmostEqual(average,9.5)
+        self.assertAlmostEqual(high,14)
+        self.assertEqual(self.profiler.stats("Load"),(500,500,500))
+        self.assertEqual(self.profiler.stats("Nothing"),(0,0,0))
+    #zones should be timed back to back, skipping anything before a mark
+    def testZones(self):
+        self.profiler.begin()
+        self.profiler.zone("Input")
+        self.profiler.mark()
+        self.profiler.zone("Render")
+        self.profiler.count("Updated",3)
+        self.profiler.count("Updated",2)
+        self.profiler.end()
+        self.assertEqual(set(self.profiler.frame),{"Input","Render","Frame"})
+        self.assertGreaterEqual(self.profiler.frame["Frame"],self.profiler.frame["Input"]+self.profiler.frame["Render"])
+        self.assertEqual(self.profiler.stats("Updated"),(5,5,5))
+        self.assertEqual(self.profiler.stats("Blits"),(0,0,0))
+    #turning it on should count pointcollide calls and blits, and turning it off should put everything back
+    def testCounting(self):
+        collide = objects.character.pointcollide
+        display = state.display
+        display.fill((1,2,3))
+        self.profiler.enable()
+        self.assertIsNot(state.display,display)
+        self.assertEqual(pygame.transform.average_color(state.display)[:3],(1,2,3))
+        self.profiler.begin()
+        headless.run("test",5,render = True)
+        self.assertGreater(self.profiler.counts["Pointcollide"],0)
+        self.assertGreater(self.profiler.counts["Blits"],0)
+        self.profiler.disable()
+        self.assertIs(objects.character.pointcollide,collide)
+        self.assertIs(state.display,display)
+    #the overlay should go on the HUD
+    def testDraw(self):
+        self.profiler.enable()
+        self.profiler.zone("Input")
+        self.profiler.end()
+        state.HUD.fill(state.invis)
+        self.profiler.draw()
+        self.assertEqual(state.HUD.get_at((2,2))[:3],(0,0,0))
+
+unittest.main(verbosity = 3)
+pygame.quit()
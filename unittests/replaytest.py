@@ -0,0 +1,91 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import random
+import tempfile
+import pygame
+import GameData as state
+import headless
+import replay
+
+os.chdir('../')
+
+headless.setup()
+
+def snapshot():
+    return [(type(item).__name__,list(item.pos)) for item in state.objects if hasattr(item,"pos")]
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(),"run.mwr")
+    #what goes in should come back out, step by step
+    def testRoundTrip(self):
+        state.aisource = {}
+        recorder = replay.recorder(self.path,"test",1234)
+        steps = [({pygame.K_d},[pygame.K_d],[pygame.KEYDOWN],(10.5,20),(True,False,False),1),
+                 ({pygame.K_d},[],[],(10.5,20),(True,False,False),1),
+                 ({pygame.K_d,pygame.K_SPACE},[pygame.K_SPACE,pygame.K_q],[pygame.KEYDOWN,pygame.MOUSEMOTION],(30,40.25),(False,False,True),0.5)]
+        for held,newkeys,types,mouse,click,deltatime in steps:
+            state.keys = replay.keystate(held)
+            state.newkeys = newkeys
+            state.event_types = types
+            state.mouse = mouse
+            state.click = click
+            state.deltatime = deltatime
+            recorder.capture()
+        recorder.close()
+        player = replay.playback(self.path)
+        self.assertEqual((player.seed,player.level,len(player)),(1234,"test",3))
+        for held,newkeys,types,mouse,click,deltatime in steps:
+            self.assertTrue(player.apply())
+            self.assertEqual(state.keys.held,held)
+            self.assertEqual(state.newkeys,newkeys)
+            self.assertEqual(state.event_types,sorted(types))
+            self.assertEqual((tuple(state.mouse),state.click,state.deltatime),(mouse,click,deltatime))
+        self.assertFalse(player.apply())
+    #held keys should still come back right with more keys watched than fit in 32 bits
+    def testManyKeys(self):
+        extra = list(range(1000,1040))
+        aisource = state.aisource
+        state.aisource = {"waits":[[0,["stun",None],["keys",key,None]] for key in extra]}
+        recorder = replay.recorder(self.path,"test",1)
+        state.aisource = aisource
+        self.assertGreater(len(recorder.watched),32)
+        steps = [{extra[-1],pygame.K_d},{extra[0]},set()]
+        state.newkeys = []
+        state.event_types = []
+        for held in steps:
+            state.keys = replay.keystate(held)
+            recorder.capture()
+        recorder.close()
+        player = replay.playback(self.path)
+        for held in steps:
+            player.apply()
+            self.assertEqual(state.keys.held,held)
+    #steps where nothing changes should take a single byte
+    def testCompact(self):
+        headless.run("test",500,[[0,["d"]]],record = self.path)
+        self.assertLess(os.path.getsize(self.path),600)
+    #playing a run back should end up exactly where the run did
+    def testReplay(self):
+        script = [[0,["d"]],[100,["d","space"]],[110,["d"]],[200,["a","f"]],[210,["d"]]]
+        headless.run("bosstest",400,script,record = self.path)
+        recorded = snapshot()
+        headless.run("test",50)
+        results = headless.run(None,None,replay.playback(self.path))
+        self.assertEqual((results["level"],results["frames"]),("bosstest",400))
+        self.assertEqual(snapshot(),recorded)
+    #the random module should be seeded the same way on playback as it was when recording
+    def testSeed(self):
+        replay.recorder(self.path,"test").close()
+        rolls = [random.random() for roll in range(3)]
+        random.seed(99)
+        replay.playback(self.path).start()
+        self.assertEqual([random.random() for roll in range(3)],rolls)
+
+unittest.main(verbosity = 3)
+pygame.quit()
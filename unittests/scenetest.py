@@ -0,0 +1,150 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import os
+import pygame
+import GameData as state
+import headless
+import menufuncs
+import scene
+
+os.chdir('../')
+
+headless.setup()
+
+#stand-ins for objects, with just the things the scene looks at
+class thing:
+    def __init__(self,depth,layer=0,allegience="Enemy"):
+        self.depth = depth
+        self.layer = layer
+        self.allegience = allegience
+class other:
+    def __init__(self,depth):
+        self.depth = depth
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.scene = scene.scene()
+    #objects should come out deepest first, and in the order they were added at the same depth, like the old sorted list
+    def testOrder(self):
+        items = [thing(0),thing(2),thing(0),thing(1),other(2)]
+        for item in items:
+            self.scene.append(item)
+        expected = sorted(items,key = lambda item: item.depth,reverse = True)
+        self.assertEqual(list(self.scene),expected)
+    #menus go the other way round
+    def testAscending(self):
+        self.scene = scene.scene(descending=False)
+        items = [other(3),other(1),other(2)]
+        for item in items:
+            self.scene.append(item)
+        self.assertEqual(list(self.scene),[items[1],items[2],items[0]])
+    #removed objects should be skipped straight away, and cleared out on flush
+    def testRemove(self):
+        items = [thing(0),thing(0),thing(0)]
+        for item in items:
+            self.scene.append(item)
+        self.scene.remove(items[1])
+        self.assertNotIn(items[1],self.scene)
+        self.assertEqual(list(self.scene),[items[0],items[2]])
+        self.assertEqual(len(self.scene),2)
+        self.scene.flush()
+        self.assertEqual(self.scene.items,[items[0],items[2]])
+        with self.assertRaises(ValueError):
+            self.scene.remove(items[1])
+    #removing during a loop shouldn't skip anything
+    def testRemoveWhileLooping(self):
+        items = [thing(0),thing(0),thing(0)]
+        for item in items:
+            self.scene.append(item)
+        seen = []
+        for item in self.scene:
+            seen.append(item)
+            if item == items[1]:
+                self.scene.remove(items[0])
+        self.assertEqual(seen,items)
+    #while staging, new objects should be held back from loops until the flush, but still count as members
+    def testStaging(self):
+        first = thing(0)
+        self.scene.append(first)
+        self.scene.staging = True
+        seen = []
+        for item in self.scene.snapshot():
+            seen.append(item)
+            added = thing(1)
+            self.scene.append(added)
+        self.assertEqual(seen,[first])
+        self.assertIn(added,self.scene)
+        self.assertEqual(self.scene.oftype("thing"),[added,first])
+        self.assertEqual(list(self.scene),[first])
+        self.scene.staging = False
+        self.scene.flush()
+        self.assertEqual(list(self.scene),[added,first])
+    #objects added and removed in the same frame should never show up
+    def testStagedRemove(self):
+        self.scene.staging = True
+        gone = thing(0)
+        self.scene.append(gone)
+        self.scene.remove(gone)
+        self.scene.staging = False
+        self.scene.flush()
+        self.assertEqual(list(self.scene),[])
+        self.assertEqual(self.scene.items,[])
+    #removing an object and adding it back before a flush should leave one copy of it, where adding it fresh would put it
+    def testReadd(self):
+        items = [thing(0),thing(0),thing(0)]
+        for item in items:
+            self.scene.append(item)
+        self.scene.remove(items[0])
+        self.scene.append(items[0])
+        self.assertEqual(list(self.scene),[items[1],items[2],items[0]])
+        self.assertEqual(self.scene.snapshot(),[items[1],items[2],items[0]])
+        self.scene.flush()
+        self.assertEqual(self.scene.items,[items[1],items[2],items[0]])
+        #the same while staging, and when it happens twice over
+        self.scene.staging = True
+        for repeat in range(2):
+            self.scene.remove(items[1])
+            self.scene.append(items[1])
+        self.assertEqual(list(self.scene),[items[2],items[0]])
+        self.scene.staging = False
+        self.scene.flush()
+        self.assertEqual(list(self.scene),[items[2],items[0],items[1]])
+        self.assertEqual(len(self.scene.items),3)
+    #objects should be found by type, layer and allegience
+    def testIndexes(self):
+        first = thing(0,layer=1,allegience="Player")
+        second = thing(1,layer=2)
+        third = other(0)
+        for item in (first,second,third):
+            self.scene.append(item)
+        self.assertEqual(self.scene.oftype("thing"),[second,first])
+        self.assertEqual(self.scene.oftype("other"),[third])
+        self.assertEqual(self.scene.onlayer(1),[first])
+        self.assertEqual(self.scene.ofallegience("Enemy"),[second])
+        self.scene.reindex(second,self.scene.layers,2,1)
+        self.assertEqual(self.scene.onlayer(1),[second,first])
+        self.scene.remove(first)
+        self.assertEqual(self.scene.oftype("thing"),[second])
+        self.assertEqual(self.scene.ofallegience("Player"),[])
+    #real objects, which are given their allegience after joining the scene, should still be found by it
+    def testRealAllegiences(self):
+        menufuncs.loadlevel("bosstest")
+        enemy = state.maker.make_obj("Enemy",([0,0],0,1,"test-enemy",0,{}))
+        boss = state.objects.oftype("Boss")[0]
+        self.assertIn(boss,state.objects.ofallegience("Enemy"))
+        self.assertIn(enemy,state.objects.ofallegience("Enemy"))
+        self.assertEqual(state.objects.ofallegience("Hero"),state.objects.oftype("Player"))
+        for item in state.objects:
+            if hasattr(item,"allegience"):
+                self.assertIn(item,state.objects.ofallegience(item.allegience))
+        #and moved when it changes
+        enemy.allegience = "Hero"
+        self.assertNotIn(enemy,state.objects.ofallegience("Enemy"))
+        self.assertIn(enemy,state.objects.ofallegience("Hero"))
+
+unittest.main(verbosity = 3)
+pygame.quit()
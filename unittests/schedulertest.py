@@ -0,0 +1,80 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import json
+import pygame
+import level
+import objects
+import GameData as state
+import scene
+import maker
+import Cam
+
+import os
+os.chdir('../')
+
+pygame.init()
+state.window = pygame.display.set_mode((1,1))
+state.display = pygame.Surface((800,800))
+state.tilesize = 120
+state.screensize = (state.tilesize*30,state.tilesize*30)
+state.scaleamt = 800/state.screensize[0]
+state.movetickamount = 110
+state.tilesheet = pygame.image.load("Assets/images/tiles.png").convert()
+state.spritesheet = pygame.image.load("Assets/images/CharSprites.png").convert()
+state.objectsource = json.load(open("objects.json"))
+state.aisource = json.load(open("behaviours.json"))
+state.infosource = json.load(open("entityinfo.json"))
+state.tilesource = json.load(open("tiles.json"))
+state.gamemode = "play"
+state.maker = maker.maker()
+state.invis = (255,0,255)
+state.deltatime = 1
+state.objects = scene.scene()
+state.cam = Cam.cam()
+state.chunkcache = level.chunkcache()
+state.currentlevel = level.level("test")
+
+#unittest stuff
+import unittest
+import scheduler
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.enemy = objects.Enemy([1200,1200],0,1,"test-enemy",1,{})
+        self.enemy.stun = True
+    def tearDown(self):
+        self.enemy.delete()
+    #actions due at the same time should come out in the order they went in
+    def testOrder(self):
+        timers = scheduler.scheduler()
+        timers.schedule([5,["b",None],[None,None,True]])
+        timers.schedule([3,["a",None],[None,None,True]])
+        timers.schedule([5,["c",None],[None,None,True]])
+        timers.advance(4)
+        self.assertEqual([action[1][0] for action in timers.due()],["a"])
+        timers.advance(1)
+        self.assertEqual([action[1][0] for action in timers.due()],["b","c"])
+        self.assertEqual(len(timers),0)
+    #delayed actions should stay out of the queue until they're due, and run on the same frame they would have before
+    def testDelay(self):
+        self.enemy.actionqueue.append([3,["destun",None],[None,None,True]])
+        self.assertEqual(self.enemy.actionqueue,[])
+        self.assertFalse(self.enemy.idle())
+        for frame in range(3):
+            self.enemy.actionupdate()
+            self.assertTrue(self.enemy.stun)
+        self.enemy.actionupdate()
+        self.assertFalse(self.enemy.stun)
+        self.assertTrue(self.enemy.idle())
+    #setting the queue should drop delayed actions
+    def testCancel(self):
+        self.enemy.actionqueue.append([3,["destun",None],[None,None,True]])
+        self.enemy.actionqueue = [[0,["nothing",None],[None,None,True]]]
+        for frame in range(5):
+            self.enemy.actionupdate()
+        self.assertTrue(self.enemy.stun)
+        self.assertEqual(len(self.enemy.delayed),0)
+
+unittest.main(verbosity = 3)
+pygame.quit()
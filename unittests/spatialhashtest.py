@@ -0,0 +1,79 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import spatialhash
+
+#stand-in for an object, with just the things the grid looks at
+class box:
+    def __init__(self,left,top,size,layer=0,depth=0):
+        self.layer = layer
+        self.depth = depth
+        self.place(left,top,size)
+    def place(self,left,top,size):
+        self.left = [left,top+size/2]
+        self.right = [left+size,top+size/2]
+        self.top = [left+size/2,top]
+        self.bottom = [left+size/2,top+size]
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.grid = spatialhash.spatialhash(100)
+    #objects should only be found by things near them, on the same layer
+    def testNearby(self):
+        first = box(0,0,50)
+        near = box(60,0,50)
+        far = box(1000,0,50)
+        other = box(0,0,50,layer=1)
+        for item in (first,near,far,other):
+            self.grid.add(item)
+            self.grid.move(item)
+        found = self.grid.nearby(first,0)
+        self.assertIn(near,found)
+        self.assertNotIn(far,found)
+        self.assertNotIn(other,found)
+        self.assertIn(other,self.grid.nearby(first,None))
+    #moving should take an object out of its old cells
+    def testMove(self):
+        first = box(0,0,50)
+        mover = box(60,0,50)
+        self.grid.add(first)
+        self.grid.add(mover)
+        self.grid.move(first)
+        self.grid.move(mover)
+        mover.place(1000,1000,50)
+        self.grid.move(mover)
+        self.assertNotIn(mover,self.grid.nearby(first,0))
+    #touching edges should still count, like checkobjcollide
+    def testEdges(self):
+        first = box(0,0,100)
+        touching = box(100,0,50)
+        self.grid.add(first)
+        self.grid.add(touching)
+        self.grid.move(first)
+        self.grid.move(touching)
+        self.assertIn(touching,self.grid.nearby(first,0))
+    #removed objects shouldn't be found, and objects that were never added shouldn't be put in
+    def testRemove(self):
+        first = box(0,0,50)
+        gone = box(0,0,50)
+        stray = box(0,0,50)
+        self.grid.add(first)
+        self.grid.add(gone)
+        self.grid.move(first)
+        self.grid.move(gone)
+        self.grid.move(stray)
+        self.grid.remove(gone)
+        self.assertEqual(self.grid.nearby(first,0),[first])
+        self.assertNotIn(gone,self.grid)
+    #results should come out in the same order as the object list: deepest first, then oldest first
+    def testOrder(self):
+        items = [box(0,0,50,depth=0),box(0,0,50,depth=2),box(0,0,50,depth=0),box(0,0,50,depth=1)]
+        for item in items:
+            self.grid.add(item)
+            self.grid.move(item)
+        self.assertEqual(self.grid.nearby(items[0],0),[items[1],items[3],items[0],items[2]])
+
+unittest.main(verbosity = 3)
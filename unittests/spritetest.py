@@ -0,0 +1,70 @@
+import sys
+sys.path.append("../")
+
+#MathWiz stuff
+import json
+import pygame
+import level
+import objects
+import GameData as state
+import scene
+import maker
+import Cam
+
+import os
+os.chdir('../')
+
+pygame.init()
+state.window = pygame.display.set_mode((1,1))
+state.display = pygame.Surface((800,800))
+state.tilesize = 120
+state.screensize = (state.tilesize*30,state.tilesize*30)
+state.scaleamt = 800/state.screensize[0]
+state.movetickamount = 110
+state.tilesheet = pygame.image.load("Assets/images/tiles.png").convert()
+state.spritesheet = pygame.image.load("Assets/images/CharSprites.png").convert()
+state.objectsource = json.load(open("objects.json"))
+state.aisource = json.load(open("behaviours.json"))
+state.infosource = json.load(open("entityinfo.json"))
+state.tilesource = json.load(open("tiles.json"))
+state.gamemode = "play"
+state.maker = maker.maker()
+state.invis = (255,0,255)
+state.deltatime = 1
+state.objects = scene.scene()
+state.cam = Cam.cam()
+state.chunkcache = level.chunkcache()
+state.currentlevel = level.level("test")
+
+#unittest stuff
+import unittest
+class manager(unittest.TestCase):
+    def setUp(self):
+        self.characters = [obj for obj in state.objects if isinstance(obj,objects.character) and obj.spritekey != None]
+    #characters showing the same frame should share one surface
+    def testShared(self):
+        first = self.characters[0]
+        other = objects.getsprite(*first.spritekey)
+        self.assertIs(first.sprite,other)
+    #the same frame shouldn't be drawn again
+    def testReused(self):
+        first = self.characters[0]
+        sprite = first.sprite
+        first.animtime = -1000
+        first.animationupdate()
+        self.assertIs(first.sprite,sprite)
+    #a different pallate should get its own surface
+    def testPallate(self):
+        first = self.characters[0]
+        key = first.spritekey
+        pallates = [name for name in state.infosource[key[0]]["Pallates"] if name != key[5]]
+        if pallates != []:
+            self.assertIsNot(objects.getsprite(*key[:5],pallates[0]),first.sprite)
+    #mirrored frames should be cached too
+    def testMirror(self):
+        first = self.characters[0]
+        self.assertIs(objects.getsprite(*first.spritekey,True),objects.getsprite(*first.spritekey,True))
+        self.assertIsNot(objects.getsprite(*first.spritekey,True),first.sprite)
+
+unittest.main(verbosity = 3)
+pygame.quit()